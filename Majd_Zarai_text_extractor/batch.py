@@ -0,0 +1,209 @@
+import os
+import json
+import signal
+import logging
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# ─────────────────────────────────────────────────────────────
+#  BATCH DRIVER — Parallel extraction over many files
+# ─────────────────────────────────────────────────────────────
+
+logger = logging.getLogger(__name__)
+
+# Files of these types are the usual stragglers, so they are scheduled first
+HEAVY_EXTENSIONS = (".pdf",)
+
+
+def resolve_worker_count(max_workers):
+    """
+    Turns the user-facing worker setting into a concrete pool size.
+
+    Args:
+        max_workers (int | None): Requested workers. 0 or None means "one per CPU".
+
+    Returns:
+        int: Number of worker processes to start (at least 1).
+    """
+    if not max_workers:
+        return os.cpu_count() or 1
+    return max(1, int(max_workers))
+
+
+def ocr_threads_per_worker(workers):
+    """
+    Shares the CPUs out between worker processes for their OCR thread pools, so
+    that N processes do not each OCR one page per CPU (N x N Tesseract runs).
+
+    Args:
+        workers (int): Worker processes running at the same time.
+
+    Returns:
+        int: Pages each worker may OCR at once (at least 1).
+    """
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def init_ocr_worker(ocr_threads):
+    """
+    Process pool initializer: sets the worker's OCR thread budget before its
+    first document (see ocr_engine.set_ocr_thread_count).
+    """
+    # Imported here so the parent (and the CLI's start-up) does not load PIL
+    from Majd_Zarai_text_extractor.ocr_engine import set_ocr_thread_count
+    set_ocr_thread_count(ocr_threads)
+
+
+def order_files_for_batch(file_paths):
+    """
+    Orders files so the longest jobs start first (largest PDFs, then everything
+    else by size). Starting stragglers early keeps one big scanned PDF from
+    stretching the tail of the batch.
+
+    Args:
+        file_paths (list[str]): Paths to schedule.
+
+    Returns:
+        list[str]: The same paths, heaviest first.
+    """
+    def sort_key(path):
+        ext = os.path.splitext(path)[1].lower()
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        return (ext not in HEAVY_EXTENSIONS, -size)
+
+    return sorted(file_paths, key=sort_key)
+
+
+def _raise_timeout(signum, frame):
+    raise TimeoutError("per-file time limit exceeded")
+
+
+def run_with_timeout(extract_fn, file_path, timeout=None):
+    """
+    Runs `extract_fn(file_path)` under a wall-clock limit.
+
+    The limit is enforced with SIGALRM inside the process doing the work, so it
+    is only available on POSIX systems; elsewhere the call simply runs to completion.
+
+    Python only runs the signal handler between bytecodes, on the main thread:
+    a call stuck inside C code on that thread (a MuPDF parse or render, an
+    in-process tesserocr recognition) is not interrupted and the TimeoutError
+    is raised once it returns. Waits on the OCR pool and on `tesseract`
+    subprocesses are interrupted. Extractors must let TimeoutError through
+    (`except TimeoutError: raise` ahead of any `except Exception`), or the file
+    is reported as processed with the rest of its text missing.
+
+    Args:
+        extract_fn (callable): Function taking a file path and returning text.
+        file_path (str): File to process.
+        timeout (float | None): Seconds allowed for this file, or None for no limit.
+
+    Returns:
+        str: Whatever `extract_fn` returned.
+
+    Raises:
+        TimeoutError: If the file took longer than `timeout` seconds.
+    """
+    if not timeout or not hasattr(signal, "SIGALRM"):
+        return extract_fn(file_path)
+
+    previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return extract_fn(file_path)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def run_batch(file_paths, extract_fn, on_result, max_workers=1, timeout=None):
+    """
+    Extracts many files, optionally on a process pool, and hands each result to
+    `on_result` as soon as it is ready (completion order, not input order).
+
+    Args:
+        file_paths (list[str]): Files to process.
+        extract_fn (callable): Module-level function `extract_fn(file_path) -> str`.
+            It must be picklable so it can be sent to worker processes.
+        on_result (callable): Called in the parent as `on_result(file_path, text, error)`;
+            `error` is None on success.
+        max_workers (int | None): Pool size. 1 runs inline, 0/None uses all CPUs.
+            Each worker process OCRs `ocr_threads_per_worker(pool size)` pages at once.
+        timeout (float | None): Per-file wall-clock limit in seconds.
+
+    Returns:
+        dict: Counters with keys 'processed', 'failed' and 'timed_out'.
+    """
+    summary = {"processed": 0, "failed": 0, "timed_out": 0}
+    ordered = order_files_for_batch(file_paths)
+    workers = min(resolve_worker_count(max_workers), max(1, len(ordered)))
+
+    if timeout and not hasattr(signal, "SIGALRM"):
+        logger.warning("[!] Per-file timeouts are not supported on this platform and will be ignored.")
+
+    def record(file_path, text, error):
+        if error is None:
+            summary["processed"] += 1
+        elif isinstance(error, TimeoutError):
+            summary["timed_out"] += 1
+        else:
+            summary["failed"] += 1
+        on_result(file_path, text, error)
+
+    # Single worker: no pool, same behaviour as the original sequential loop
+    if workers == 1:
+        for file_path in ordered:
+            try:
+                text = run_with_timeout(extract_fn, file_path, timeout)
+            except Exception as e:
+                record(file_path, None, e)
+            else:
+                record(file_path, text, None)
+        return summary
+
+    ocr_threads = ocr_threads_per_worker(workers)
+    logger.info(f"[~] Dispatching {len(ordered)} file(s) to {workers} worker process(es), "
+                f"{ocr_threads} OCR thread(s) each.")
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_ocr_worker, initargs=(ocr_threads,)) as pool:
+        futures = {
+            pool.submit(run_with_timeout, extract_fn, file_path, timeout): file_path
+            for file_path in ordered
+        }
+        for future in as_completed(futures):
+            file_path = futures[future]
+            try:
+                text = future.result()
+            except Exception as e:
+                record(file_path, None, e)
+            else:
+                record(file_path, text, None)
+
+    return summary
+
+
+def write_batch_report(report_path, files, summary, metrics=None):
+    """
+    Saves a JSON report of a batch run: the counters, one record per file
+    (status, reason, detected format...) and optionally the run's stage
+    timings per format (see metrics.RunMetrics). Written atomically, so a reader never
+    sees a half-written report.
+
+    Args:
+        report_path (str): Destination .json file.
+        files (list[dict]): Per-file records, each with at least 'file' and 'status'.
+        summary (dict): Batch counters (processed, failed, timed_out, rejected...).
+        metrics (dict | None): `RunMetrics.report()` of the run.
+    """
+    report_dir = os.path.dirname(report_path) or "."
+    os.makedirs(report_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=report_dir, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        report = {"summary": summary, "files": files}
+        if metrics is not None:
+            report["metrics"] = metrics
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, report_path)
+    logger.info(f"[~] Batch report written to: {report_path}")
@@ -0,0 +1,269 @@
+import zipfile
+import logging
+import itertools
+import posixpath
+import xml.etree.ElementTree as ET
+
+# ─────────────────────────────────────────────────────────────
+#  FAST PATH — Stream DOCX parts straight from their XML
+# ─────────────────────────────────────────────────────────────
+
+logger = logging.getLogger(__name__)
+
+NS_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+NS_MC = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+NS_DC = "{http://purl.org/dc/elements/1.1/}"
+NS_DCTERMS = "{http://purl.org/dc/terms/}"
+
+MAIN_PART = "word/document.xml"
+CORE_PART = "docProps/core.xml"
+
+# Relationship types (last segment of the type URI) of the parts read besides the body
+SECTION_PARTS = ("header", "footer", "footnotes", "endnotes")
+
+# Footnotes/endnotes of these types are the separator lines Word draws, not notes
+NOTE_SEPARATORS = ("separator", "continuationSeparator", "continuationNotice")
+
+# Tags the parser reacts to
+W_P, W_R, W_T = f"{NS_W}p", f"{NS_W}r", f"{NS_W}t"
+W_TBL, W_TR, W_TC = f"{NS_W}tbl", f"{NS_W}tr", f"{NS_W}tc"
+W_GRID_SPAN, W_V_MERGE, W_GRID_BEFORE = f"{NS_W}gridSpan", f"{NS_W}vMerge", f"{NS_W}gridBefore"
+W_TEXT_BOX = f"{NS_W}txbxContent"
+W_NOTES = (f"{NS_W}footnote", f"{NS_W}endnote")
+MC_FALLBACK = f"{NS_MC}Fallback"
+
+# Run content that stands for a character
+RUN_CHARACTERS = {f"{NS_W}tab": "\t", f"{NS_W}br": "\n", f"{NS_W}cr": "\n", f"{NS_W}noBreakHyphen": "-"}
+
+# Every other element is only pruned
+HANDLED_TAGS = frozenset([W_P, W_T, W_TBL, W_TR, W_TC, W_GRID_SPAN, W_V_MERGE, W_GRID_BEFORE, W_TEXT_BOX,
+                          MC_FALLBACK, *W_NOTES, *RUN_CHARACTERS])
+
+
+def _part_path(source_part, target):
+    """
+    Resolves a relationship target against the part that declares it.
+    """
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source_part), target))
+
+
+def _read_rels(archive, part):
+    """
+    Returns [(relationship type, part name), ...] for the internal
+    relationships of `part` ('' for the package itself), in declaration order.
+    """
+    directory, name = posixpath.split(part)
+    try:
+        root = ET.fromstring(archive.read(posixpath.join(directory, "_rels", f"{name}.rels")))
+    except KeyError:
+        return []
+    return [(rel.get("Type", "").rsplit("/", 1)[-1], _part_path(part, rel.get("Target", "")))
+            for rel in root.iter(f"{NS_PKG_REL}Relationship") if rel.get("TargetMode") != "External"]
+
+
+def _cell_values(cell):
+    """
+    A table cell as the row values it covers: its text once, then blanks for
+    the extra grid columns it spans; a vertically merged continuation is all
+    blanks (python-docx repeats the merged cell's text in every one).
+    """
+    text = "" if cell["continued"] else " ".join(" ".join(cell["parts"]).split())
+    return [text] + [""] * (cell["span"] - 1)
+
+
+def iter_blocks(stream, table_numbers=None):
+    """
+    Parses one WordprocessingML part (document, header, footer, footnotes...)
+    incrementally and yields its content in document order. Each element is
+    detached from the tree as soon as it is parsed, so memory stays flat
+    however long the document or its tables are.
+
+    - Paragraph text comes from the runs' <w:t>, tabs and breaks; deleted
+      text, field codes and the VML fallback copy of every text box are left out.
+    - Text boxes are read after the paragraph they are anchored in.
+    - Merged cells are given once (see `_cell_values`); nested tables are
+      yielded in full after the row-by-row output of their outer table.
+    - A footnote or endnote is one paragraph, prefixed with `[<id>]`.
+
+    Args:
+        stream (file-like): The part's XML.
+        table_numbers (Iterator[int] | None): Numbers given to the tables, shared
+            across parts so a document's tables are numbered once (default: from 1).
+
+    Yields:
+        tuple: ('paragraph', text), ('table', number), ('row', [cell text, ...])
+        or ('end_table', number).
+    """
+    table_numbers = table_numbers if table_numbers is not None else itertools.count(1)
+    out = []            # events ready to be yielded
+    path = []           # open elements, outermost first
+    containers = [out]  # where finished paragraphs go: an event list (body, text box) or a cell/note
+    paragraphs = []     # open paragraphs (text box paragraphs nest in their anchor paragraph)
+    tables = []         # open tables, outermost first
+    skip = 0            # depth inside content that is not read (VML fallbacks, note separators)
+
+    def table_event_sink():
+        for container in reversed(containers):
+            if isinstance(container, list):
+                return container
+
+    for event, element in ET.iterparse(stream, events=("start", "end")):
+        tag = element.tag
+        if event == "start":
+            path.append(element)
+            if tag not in HANDLED_TAGS:
+                continue
+            if skip or tag == MC_FALLBACK:
+                skip += 1
+                continue
+
+            if tag == W_P:
+                paragraphs.append({"parts": [], "after": []})
+            elif tag in RUN_CHARACTERS:
+                if paragraphs and path[-2].tag == W_R:
+                    paragraphs[-1]["parts"].append(RUN_CHARACTERS[tag])
+            elif tag == W_TEXT_BOX:
+                containers.append(paragraphs[-1]["after"] if paragraphs else [])
+            elif tag == W_TC and tables:
+                containers.append({"parts": [], "span": 1, "continued": False})
+            elif tag == W_GRID_SPAN and isinstance(containers[-1], dict):
+                containers[-1]["span"] = max(1, int(element.get(f"{NS_W}val", 1)))
+            elif tag == W_V_MERGE and isinstance(containers[-1], dict):
+                containers[-1]["continued"] = element.get(f"{NS_W}val", "continue") != "restart"
+            elif tag == W_TR and tables:
+                tables[-1]["row"] = []
+            elif tag == W_GRID_BEFORE and tables and tables[-1]["row"] is not None:
+                tables[-1]["row"].extend([""] * int(element.get(f"{NS_W}val", 0)))
+            elif tag == W_TBL:
+                number = next(table_numbers)
+                # A table inside a cell is buffered and given after its outer table
+                sink = [] if tables else table_event_sink()
+                sink.append(("table", number))
+                tables.append({"number": number, "sink": sink, "row": None, "nested": []})
+            elif tag in W_NOTES:
+                if element.get(f"{NS_W}type") in NOTE_SEPARATORS:
+                    skip += 1
+                else:
+                    containers.append({"parts": [], "note": element.get(f"{NS_W}id")})
+            continue
+
+        # End of an element: detach it (every earlier sibling is already gone)
+        path.pop()
+        if path:
+            path[-1].remove(element)
+        if tag not in HANDLED_TAGS:
+            continue
+        if skip:
+            skip -= 1
+            continue
+
+        if tag == W_T:
+            if paragraphs:
+                paragraphs[-1]["parts"].append(element.text or "")
+        elif tag == W_P and paragraphs:
+            paragraph = paragraphs.pop()
+            text = "".join(paragraph["parts"]).strip()
+            container = containers[-1]
+            if isinstance(container, list):
+                if text:
+                    container.append(("paragraph", text))
+                container.extend(paragraph["after"])
+            else:
+                if text:
+                    container["parts"].append(text)
+                container["parts"].extend(value for kind, value in paragraph["after"] if kind == "paragraph")
+        elif tag == W_TEXT_BOX:
+            containers.pop()
+        elif tag == W_TC and tables and isinstance(containers[-1], dict):
+            cell = containers.pop()
+            if tables[-1]["row"] is not None:
+                tables[-1]["row"].extend(_cell_values(cell))
+        elif tag == W_TR and tables:
+            row = tables[-1]["row"] or []
+            if any(row):
+                tables[-1]["sink"].append(("row", row))
+            tables[-1]["row"] = None
+        elif tag == W_TBL and tables:
+            table = tables.pop()
+            table["sink"].append(("end_table", table["number"]))
+            if tables:
+                tables[0]["nested"].append((table["number"], table["sink"]))
+            for _, events in sorted(table["nested"]):
+                table["sink"].extend(events)
+        elif tag in W_NOTES and isinstance(containers[-1], dict):
+            note = containers.pop()
+            text = " ".join(note["parts"])
+            if text:
+                out.append(("paragraph", f"[{note['note']}] {text}"))
+
+        if out:
+            yield from out
+            out.clear()
+
+
+class DocxPackage:
+    """
+    Opens a .docx archive and finds its parts without going through
+    python-docx's object model: the main document, its headers and footers
+    (in part-name order), footnotes and endnotes, and the core properties.
+
+    Use it as a context manager; `iter_part` streams one part at a time.
+    """
+
+    def __init__(self, file_path):
+        self.archive = zipfile.ZipFile(file_path)
+        try:
+            main = [part for kind, part in _read_rels(self.archive, "") if kind == "officeDocument"]
+            self.main_part = main[0] if main else MAIN_PART
+            self.parts = {"body": [self.main_part]}
+            for kind, part in _read_rels(self.archive, self.main_part):
+                if kind in SECTION_PARTS:
+                    self.parts.setdefault(kind, []).append(part)
+            for parts in self.parts.values():
+                # header2.xml before header10.xml
+                parts.sort(key=lambda part: (len(part), part))
+        except Exception:
+            self.archive.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.archive.close()
+
+    def core_properties(self):
+        """
+        Returns {'title', 'author', 'created'} from docProps/core.xml ('' when
+        missing); 'created' is the date part (YYYY-MM-DD) of the timestamp.
+        """
+        try:
+            root = ET.fromstring(self.archive.read(CORE_PART))
+        except KeyError:
+            return {"title": "", "author": "", "created": ""}
+
+        def text(tag):
+            element = root.find(tag)
+            return (element.text or "").strip() if element is not None else ""
+
+        return {"title": text(f"{NS_DC}title"), "author": text(f"{NS_DC}creator"),
+                "created": text(f"{NS_DCTERMS}created")[:10]}
+
+    def iter_part(self, part, table_numbers=None):
+        """
+        Streams the content of one part (see `iter_blocks`). Parts missing
+        from the archive (a dangling relationship) are skipped with a warning.
+        """
+        try:
+            stream = self.archive.open(part)
+        except KeyError:
+            logger.warning(f"[!] DOCX part listed but missing from the archive: {part}")
+            return
+        with stream:
+            yield from iter_blocks(stream, table_numbers)
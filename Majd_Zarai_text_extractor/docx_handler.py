@@ -1,5 +1,3 @@
-from docx import Document
-
 # ─────────────────────────────────────────────────────────────
 #  ORIGINAL FUNCTION — Base DOCX handler
 # ─────────────────────────────────────────────────────────────
@@ -17,6 +15,8 @@ def extract_text_from_docx(file_path):
     Returns:
         str: Clean, readable, and structured text.
     """
+    from docx import Document
+
     try:
         doc = Document(file_path)
         extracted = []
@@ -47,7 +47,7 @@ def extract_text_from_docx(file_path):
         return "\n".join(extracted).strip()
 
     except Exception as e:
-        print(f"[ERROR] Failed to extract DOCX: {file_path} – {e}")
+        logger.error(f"Failed to extract DOCX: {file_path} – {e}")
         return ""
 
 # ─────────────────────────────────────────────────────────────
@@ -55,15 +55,117 @@ def extract_text_from_docx(file_path):
 # ─────────────────────────────────────────────────────────────
 
 import logging
+import itertools
+
+from Majd_Zarai_text_extractor.docx_fast_reader import DocxPackage
+from Majd_Zarai_text_extractor.metrics import stage, timed_generator
 
 # Logger setup
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
+
+# Sections of the output after the metadata, with the parts they are read from.
+# Headers and footers come from every section of the document; repeats are dropped.
+DOCX_SECTIONS = (
+    ("header", "### Headers ###"),
+    ("body", "### Document Body ###"),
+    ("footer", "### Footers ###"),
+    ("footnotes", "### Footnotes ###"),
+    ("endnotes", "### Endnotes ###"),
+)
+
+
+def _iter_block_lines(blocks, table_writer=None):
+    """
+    Turns the (kind, value) blocks of docx_fast_reader into output lines:
+    paragraphs as they are, tables as `[Table N]` followed by one
+    tab-separated line per row and a blank line.
+    """
+    for kind, value in blocks:
+        if kind == "paragraph":
+            yield value
+        elif kind == "row":
+            if table_writer is not None:
+                table_writer.write_row(value)
+            yield "\t".join(value)
+        elif kind == "table":
+            if table_writer is not None:
+                table_writer.start_table(f"Table {value}", "docx")
+            yield f"[Table {value}]"
+        else:  # end_table
+            if table_writer is not None:
+                table_writer.end_table()
+            yield ""
+
+
+@timed_generator("native_text")
+def iter_text_from_docx(file_path, include_metadata=True, table_writer=None):
+    """
+    Streaming version of `extract_text_from_docx_enhanced`: yields the metadata
+    lines, then the headers, body, footers, footnotes and endnotes, each in
+    document order (paragraphs, tables row by row, text boxes after the
+    paragraph they are anchored in). Errors are raised, not logged.
+
+    The parts are parsed incrementally from the archive (see docx_fast_reader)
+    instead of loading python-docx's object model, so memory stays flat on
+    very long documents, and merged table cells are given once.
+
+    Args:
+        file_path (str): Path to the .docx file.
+        include_metadata (bool): If True, include metadata like author/title.
+        table_writer (TableWriter | None): If given, every table of the body and
+            notes is also written as a table of columns (see structured_output).
+
+    Yields:
+        str: One line (or section header) of output.
+    """
+    with stage("open"):
+        package = DocxPackage(file_path)
+
+    with package:
+        # Optional metadata block
+        if include_metadata:
+            props = package.core_properties()
+            yield "### Document Metadata ###"
+            yield f"Title: {props['title'] or 'N/A'}"
+            yield f"Author: {props['author'] or 'N/A'}"
+            yield f"Created: {props['created'] or 'N/A'}"
+            yield ""
+
+        table_numbers = itertools.count(1)
+        for section, title in DOCX_SECTIONS:
+            if section == "body":
+                yield title
+                for part in package.parts["body"]:
+                    yield from _iter_block_lines(package.iter_part(part, table_numbers), table_writer)
+                continue
+
+            # Headers, footers and notes are small: each part is read whole, and
+            # a header or footer identical to one already given is left out
+            seen = set()
+            for part in package.parts.get(section, ()):
+                writer = table_writer if section in ("footnotes", "endnotes") else None
+                lines = list(_iter_block_lines(package.iter_part(part, table_numbers), writer))
+                key = "\n".join(lines)
+                if not lines or key in seen:
+                    continue
+                if not seen:
+                    if section != "header":
+                        yield ""
+                    yield title
+                seen.add(key)
+                yield from lines
+            if seen and section == "header":
+                yield ""
+
+        logger.info(f"DOCX read: {next(table_numbers) - 1} table(s), "
+                    f"{sum(len(parts) for parts in package.parts.values()) - 1} header/footer/note part(s).")
+
 
 def extract_text_from_docx_enhanced(file_path, include_metadata=True):
     """
     Enhanced version of .docx text extraction:
-    - Extracts paragraphs and tables
+    - Extracts paragraphs, tables (nested ones included) and text boxes in
+      document order, plus headers, footers, footnotes and endnotes
     - Optionally includes core document metadata
     - Uses structured logging
 
@@ -75,38 +177,10 @@ def extract_text_from_docx_enhanced(file_path, include_metadata=True):
         str: Structured document content with optional metadata.
     """
     try:
-        doc = Document(file_path)
-        extracted = []
-
-        # Optional metadata block
-        if include_metadata:
-            props = doc.core_properties
-            extracted.append("### Document Metadata ###")
-            extracted.append(f"Title: {props.title or 'N/A'}")
-            extracted.append(f"Author: {props.author or 'N/A'}")
-            extracted.append(f"Created: {props.created.strftime('%Y-%m-%d') if props.created else 'N/A'}")
-            extracted.append("")
-
-        # Extract body text
-        extracted.append("### Document Body ###")
-        for para in doc.paragraphs:
-            text = para.text.strip()
-            if text:
-                extracted.append(text)
-
-        # Extract tables, if any
-        if doc.tables:
-            extracted.append("\n### Tables ###")
-            for i, table in enumerate(doc.tables):
-                extracted.append(f"[Table {i+1}]")
-                for row in table.rows:
-                    row_data = [cell.text.strip() for cell in row.cells]
-                    if any(row_data):
-                        extracted.append("\t".join(row_data))
-                extracted.append("")
-
-        return "\n".join(extracted).strip()
+        return "\n".join(iter_text_from_docx(file_path, include_metadata)).strip()
 
+    except TimeoutError:
+        raise  # the batch's per-file limit, not an extraction failure
     except Exception as e:
         logger.error(f"Enhanced DOCX extraction failed for {file_path}: {e}")
         return ""
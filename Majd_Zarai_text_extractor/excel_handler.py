@@ -9,7 +9,7 @@ def extract_text_from_excel(file_path):
     Extracts readable text from an Excel (.xlsx) file.
 
     - Iterates through all worksheets
-    - Reads all rows and cells
+    - Reads all rows and cells (streamed in read-only mode)
     - Handles empty cells gracefully
     - Formats output with tabs for clarity
 
@@ -20,26 +20,28 @@ def extract_text_from_excel(file_path):
         str: Cleaned, structured text from all sheets.
     """
     try:
-        workbook = openpyxl.load_workbook(file_path, data_only=True)
         extracted = []
 
-        for sheet in workbook.worksheets:
-            extracted.append(f"### Sheet: {sheet.title} ###")
+        for title, rows in _iter_sheets_openpyxl(file_path, read_only=True):
+            extracted.append(f"### Sheet: {title} ###")
 
-            for row in sheet.iter_rows():
-                # Convert all cell values to strings (empty -> "")
-                row_text = [str(cell.value).strip() if cell.value is not None else "" for cell in row]
+            # Convert all cell values to strings (empty -> "")
+            sheet_rows = [[str(value).strip() if value is not None else "" for value in row] for row in rows]
 
+            # Rows of a sheet without a <dimension> record come back at their own
+            # width; pad them to the sheet's so the tab columns line up as before
+            width = max(map(len, sheet_rows), default=0)
+            for row_text in sheet_rows:
                 # Skip empty rows
                 if any(cell for cell in row_text):
-                    extracted.append("\t".join(row_text))
+                    extracted.append("\t".join(row_text + [""] * (width - len(row_text))))
 
             extracted.append("")  # Add a line break between sheets
 
         return "\n".join(extracted).strip()
 
     except Exception as e:
-        print(f"[ERROR] Failed to extract XLSX: {file_path} – {e}")
+        logger.error(f"Failed to extract XLSX: {file_path} – {e}")
         return ""
 
 # ─────────────────────────────────────────────────────────────
@@ -48,47 +50,110 @@ def extract_text_from_excel(file_path):
 
 import logging
 
+from Majd_Zarai_text_extractor.metrics import stage, timed_generator
+
 # Logger setup
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-def extract_text_from_excel_enhanced(file_path, include_empty=False):
+def _iter_sheets_openpyxl(file_path, read_only=True):
     """
-    Enhanced extraction from Excel (.xlsx) files with optional control over
-    empty rows and structured logging of sheet/cell statistics.
+    Yields (sheet title, row iterator) pairs using openpyxl.
+
+    In read-only mode rows are parsed lazily from the sheet XML as they are
+    iterated instead of building the whole workbook object model in memory.
+    """
+    # Given a file object rather than a path, openpyxl does not insist on an
+    # Excel extension (a mis-named workbook can be routed here by the preflight check)
+    with open(file_path, "rb") as f:
+        with stage("open"):
+            workbook = openpyxl.load_workbook(f, read_only=read_only, data_only=True)
+        try:
+            logger.info(f"Workbook opened: {len(workbook.worksheets)} sheet(s) found.")
+            for sheet in workbook.worksheets:
+                if read_only and sheet.max_column is None:
+                    # No usable <dimension> record: let rows come back at their real width
+                    sheet.reset_dimensions()
+                yield sheet.title, sheet.iter_rows(values_only=True)
+        finally:
+            if read_only:
+                workbook.close()  # read-only workbooks keep the archive open
+
+
+@timed_generator("native_text")
+def iter_text_from_excel(file_path, include_empty=False, read_only=True, fast=False, table_writer=None):
+    """
+    Streaming version of `extract_text_from_excel_enhanced`: yields each sheet
+    header and each row as it is read. Errors are raised, not logged.
+
+    Trailing empty cells are trimmed from every row, so sheets whose declared
+    dimensions are wider than their data do not produce runs of empty columns.
 
     Args:
         file_path (str): Path to the .xlsx file.
         include_empty (bool): If True, include empty rows; otherwise, skip them.
-
-    Returns:
-        str: Tabular, cleanly formatted text from all sheets.
+        read_only (bool): Use openpyxl's streaming read-only mode (default).
+            False loads the full workbook object model.
+        fast (bool): Skip openpyxl entirely and parse the sheet XML and
+            shared-strings table directly (see xlsx_fast_reader).
+        table_writer (TableWriter | None): If given, every sheet is also written
+            as a typed table (see structured_output).
+
+    Yields:
+        str: One line (sheet header or tab-separated row) of output.
     """
-    try:
-        workbook = openpyxl.load_workbook(file_path, data_only=True)
-        sheet_count = len(workbook.worksheets)
-        extracted = []
+    if fast:
+        from Majd_Zarai_text_extractor.xlsx_fast_reader import iter_sheets_fast
+        sheets = iter_sheets_fast(file_path)
+    else:
+        sheets = _iter_sheets_openpyxl(file_path, read_only=read_only)
 
-        logger.info(f"Workbook opened: {sheet_count} sheet(s) found.")
+    for sheet_index, (title, rows) in enumerate(sheets, start=1):
+        yield f"### Sheet {sheet_index}: {title} ###"
+        row_counter = 0
+        if table_writer is not None:
+            table_writer.start_table(title, "xlsx")
 
-        for sheet_index, sheet in enumerate(workbook.worksheets, start=1):
-            extracted.append(f"### Sheet {sheet_index}: {sheet.title} ###")
-            row_counter = 0
+        for row in rows:
+            row_text = [str(value).strip() if value is not None else "" for value in row]
 
-            for row in sheet.iter_rows():
-                row_text = [str(cell.value).strip() if cell.value is not None else "" for cell in row]
+            # Trim trailing empty cells
+            while row_text and not row_text[-1]:
+                row_text.pop()
 
-                if not any(row_text) and not include_empty:
-                    continue  # Skip empty rows if not requested
+            if not row_text and not include_empty:
+                continue  # Skip empty rows if not requested
 
-                extracted.append("\t".join(row_text))
-                row_counter += 1
+            if table_writer is not None and row_text:
+                table_writer.write_row(list(row[:len(row_text)]))
 
-            logger.info(f"Processed Sheet {sheet_index} – Rows extracted: {row_counter}")
-            extracted.append("")  # Line break between sheets
+            yield "\t".join(row_text)
+            row_counter += 1
 
-        return "\n".join(extracted).strip()
+        if table_writer is not None:
+            table_writer.end_table()
+        logger.info(f"Processed Sheet {sheet_index} – Rows extracted: {row_counter}")
+        yield ""  # Line break between sheets
+
+
+def extract_text_from_excel_enhanced(file_path, include_empty=False, read_only=True, fast=False):
+    """
+    Enhanced extraction from Excel (.xlsx) files with optional control over
+    empty rows and structured logging of sheet/cell statistics.
+
+    Args:
+        file_path (str): Path to the .xlsx file.
+        include_empty (bool): If True, include empty rows; otherwise, skip them.
+        read_only (bool): Stream rows with openpyxl's read-only mode (default).
+        fast (bool): Parse the sheet XML directly instead of going through openpyxl.
+
+    Returns:
+        str: Tabular, cleanly formatted text from all sheets.
+    """
+    try:
+        return "\n".join(iter_text_from_excel(file_path, include_empty, read_only, fast)).strip()
 
+    except TimeoutError:
+        raise  # the batch's per-file limit, not an extraction failure
     except Exception as e:
         logger.error(f"Enhanced Excel extraction failed for {file_path}: {e}")
         return ""
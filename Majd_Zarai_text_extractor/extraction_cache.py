@@ -0,0 +1,311 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+
+from Majd_Zarai_text_extractor.metrics import stage
+from Majd_Zarai_text_extractor.text_writer import atomic_open, write_text_stream
+
+# ─────────────────────────────────────────────────────────────
+#  EXTRACTION CACHE — Content-addressed, size-bounded, on disk
+# ─────────────────────────────────────────────────────────────
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a handler's output changes, so stale cache entries stop matching
+EXTRACTOR_VERSION = "4"
+
+DEFAULT_CACHE_DIR = os.path.join("extracted_texts", ".cache")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+
+# The per-page OCR cache lives in <cache_dir>/pages and gets this share of the size limit
+PAGE_CACHE_DIR = "pages"
+PAGE_CACHE_SHARE = 0.5
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Settings the CLI and the front end pass to each handler; they are part of the cache key
+HANDLER_SETTINGS = {
+    ".pdf": {"handler": "pdf", "lang": "auto", "dpi": 300, "adaptive_dpi": False,
+             "preprocess": False, "layout": False},
+    ".docx": {"handler": "docx", "include_metadata": True},
+    ".xlsx": {"handler": "xlsx", "include_empty": False},
+}
+
+
+def hash_file(file_path):
+    """
+    Computes the SHA-256 of a file's contents, reading it in 1 MB chunks.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        str: Hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    On-disk cache of extracted text keyed by input content + extractor settings.
+
+    Entries live in `<cache_dir>/<key[:2]>/<key>.txt`. A hit refreshes the entry's
+    mtime, and once the cache grows beyond `max_bytes` the least recently used
+    entries are deleted first.
+
+    The size of the cache is found by scanning it on the first write and then
+    kept up to date, so an instance should live as long as its process (see
+    `get_caches`); it can be shared by threads.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._total_bytes = None  # computed lazily on the first write
+        self._lock = threading.Lock()
+
+    def make_key(self, content_hash, settings):
+        """
+        Builds the cache key for one file under one set of extractor settings.
+
+        Args:
+            content_hash (str): Output of `hash_file` for the input.
+            settings (dict): Everything that changes the output (handler, lang, dpi, flags...).
+
+        Returns:
+            str: Hex key.
+        """
+        payload = json.dumps(
+            {"version": EXTRACTOR_VERSION, "content": content_hash, "settings": settings},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.txt")
+
+    def get_path(self, key):
+        """
+        Returns the path of the cached entry for `key`, or None on a miss.
+        A hit marks the entry as recently used for LRU eviction.
+        """
+        path = self._entry_path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except OSError:
+            pass
+        return path
+
+    def get(self, key):
+        """
+        Returns the cached text for `key`, or None on a miss.
+        """
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None  # evicted by another worker meanwhile
+
+    def put(self, key, text):
+        """
+        Stores `text` under `key` (atomically) and evicts old entries if needed.
+        """
+        def write(f):
+            f.write(text.encode("utf-8"))
+        self._store(key, write)
+
+    def put_file(self, key, source_path):
+        """
+        Stores a copy of an already written text file under `key`.
+        """
+        def write(f):
+            with open(source_path, "rb") as src:
+                shutil.copyfileobj(src, f)
+        self._store(key, write)
+
+    def _store(self, key, write):
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            written = f.tell()
+        try:
+            replaced = os.path.getsize(path)  # an entry rewritten under the same key
+        except FileNotFoundError:
+            replaced = 0
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, _, size in self._entries())
+            else:
+                self._total_bytes += written - replaced
+            over_limit = self._total_bytes > self.max_bytes
+
+        if over_limit:
+            self.evict()
+
+    def _entries(self):
+        """
+        Yields (path, mtime, size) for every cache entry.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return
+        for bucket in os.scandir(self.cache_dir):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                if not entry.name.endswith(".txt"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # removed by another worker meanwhile
+                yield entry.path, stat.st_mtime, stat.st_size
+
+    def evict(self):
+        """
+        Deletes least recently used entries until the cache fits in `max_bytes`.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        entries = sorted(self._entries(), key=lambda e: e[1])
+        total = sum(size for _, _, size in entries)
+        removed = 0
+
+        for path, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+
+        with self._lock:
+            self._total_bytes = total
+        if removed:
+            logger.info(f"[~] Cache eviction: removed {removed} entr{'y' if removed == 1 else 'ies'}.")
+        return removed
+
+    def purge(self):
+        """
+        Removes the whole cache directory.
+        """
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        with self._lock:
+            self._total_bytes = 0
+        logger.info(f"[~] Cache purged: {self.cache_dir}")
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_caches(cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Returns this process's document cache and per-page OCR cache for
+    `cache_dir`, created on first use and shared by every later document, so
+    the cache is scanned for its size once per process and not once per file.
+
+    `max_bytes` is the budget of the whole directory: PAGE_CACHE_SHARE of it
+    goes to the page cache (in `<cache_dir>/pages`), the rest to the documents.
+
+    Args:
+        cache_dir (str): Cache directory.
+        max_bytes (int): Size limit of both caches together.
+
+    Returns:
+        tuple[ExtractionCache, ExtractionCache]: (document cache, page cache).
+    """
+    key = (os.path.abspath(cache_dir), max_bytes)
+    with _caches_lock:
+        caches = _caches.get(key)
+        if caches is None:
+            page_bytes = int(max_bytes * PAGE_CACHE_SHARE)
+            caches = _caches[key] = (ExtractionCache(cache_dir, max_bytes - page_bytes),
+                                     ExtractionCache(os.path.join(cache_dir, PAGE_CACHE_DIR), page_bytes))
+    return caches
+
+
+def cached_extract(file_path, extract_fn, settings, cache=None, content_hash=None):
+    """
+    Returns the text for `file_path`, from the cache when possible.
+
+    Args:
+        file_path (str): Input file.
+        extract_fn (callable): Zero-argument function that performs the real extraction.
+        settings (dict): Extractor settings that influence the output (part of the key).
+        cache (ExtractionCache | None): Cache to use; None disables caching.
+        content_hash (str | None): Precomputed `hash_file(file_path)`, if already known.
+
+    Returns:
+        tuple[str, bool]: The extracted text and whether it came from the cache.
+    """
+    if cache is None:
+        return extract_fn(), False
+
+    key = cache.make_key(content_hash or hash_file(file_path), settings)
+    text = cache.get(key)
+    if text is not None:
+        logger.info(f"[✓] Cache hit for: {os.path.basename(file_path)}")
+        return text, True
+
+    text = extract_fn()
+    if text:  # empty output means the handler failed, so it is not cached
+        cache.put(key, text)
+    return text, False
+
+
+def cached_extract_to_file(file_path, iter_fn, settings, output_path, cache=None, content_hash=None):
+    """
+    Streaming counterpart of `cached_extract`: the text goes straight to
+    `output_path`, either copied from the cache or written chunk by chunk
+    from the handler's generator (and then copied into the cache).
+
+    Args:
+        file_path (str): Input file.
+        iter_fn (callable): Zero-argument function returning the handler's chunk iterator.
+        settings (dict): Extractor settings that influence the output (part of the key).
+        output_path (str): Text file to write.
+        cache (ExtractionCache | None): Cache to use; None disables caching.
+        content_hash (str | None): Precomputed `hash_file(file_path)`, if already known.
+
+    Returns:
+        tuple[bool, bool]: Whether any text was written, and whether it came from the cache.
+        When nothing was extracted, no output file is left behind.
+    """
+    key = None
+    if cache is not None:
+        key = cache.make_key(content_hash or hash_file(file_path), settings)
+        cached_path = cache.get_path(key)
+        if cached_path is not None:
+            with stage("write"), open(cached_path, "rb") as src, atomic_open(output_path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            logger.info(f"[✓] Cache hit for: {os.path.basename(file_path)}")
+            return True, True
+
+    if not write_text_stream(output_path, iter_fn()):
+        os.remove(output_path)
+        return False, False
+
+    if cache is not None:
+        cache.put_file(key, output_path)
+    return True, False
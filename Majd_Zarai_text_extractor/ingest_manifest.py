@@ -0,0 +1,265 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+from collections import Counter, namedtuple
+
+from Majd_Zarai_text_extractor.extraction_cache import EXTRACTOR_VERSION, hash_file
+
+# ─────────────────────────────────────────────────────────────
+#  INGEST MANIFEST — What has been extracted, for incremental runs
+# ─────────────────────────────────────────────────────────────
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_PATH = os.path.join("extracted_texts", "majd_zarai_ingest.sqlite3")
+
+MAX_ATTEMPTS = 5             # failures before a file is left alone until it changes
+RETRY_BASE_SECONDS = 60      # first retry delay; doubles with every failure...
+RETRY_MAX_SECONDS = 6 * 3600  # ...up to this cap
+
+DONE_STATES = ("processed", "empty", "rejected")   # final until the file or the settings change
+RETRY_STATES = ("failed", "timed_out")             # retried with exponential backoff
+
+FileState = namedtuple("FileState", "path size mtime_ns")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path              TEXT PRIMARY KEY,
+    size              INTEGER NOT NULL,
+    mtime_ns          INTEGER NOT NULL,
+    content_hash      TEXT,
+    extractor_version TEXT NOT NULL,
+    settings          TEXT NOT NULL,
+    status            TEXT NOT NULL,
+    format            TEXT,
+    output            TEXT,
+    error             TEXT,
+    attempts          INTEGER NOT NULL DEFAULT 0,
+    next_attempt      REAL NOT NULL DEFAULT 0,
+    finished          REAL,
+    elapsed_ms        REAL
+)
+"""
+
+
+def scan_directory(directory):
+    """
+    Lists the regular files of a folder with their size and mtime, sorted by
+    path so runs are reproducible. Uses os.scandir, whose entries carry the
+    stat data, so a folder of 200k files is listed without opening any of them.
+
+    Args:
+        directory (str): Folder to scan (not recursive, like the batch run).
+
+    Returns:
+        list[FileState]: One (path, size, mtime_ns) tuple per file.
+    """
+    files = []
+    for entry in os.scandir(directory):
+        try:
+            if not entry.is_file():
+                continue
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue  # deleted while scanning
+        files.append(FileState(entry.path, stat.st_size, stat.st_mtime_ns))
+    files.sort(key=lambda f: f.path)
+    return files
+
+
+class IngestManifest:
+    """
+    SQLite record of every file seen in the uploads folder: its size, mtime
+    and content hash, the extractor version and settings it was processed
+    with, and the outcome (status, error, output, attempts, timing).
+
+    Each result is committed as soon as it is known, so an interrupted run
+    loses at most the files that were in flight; they are left as 'pending'
+    and picked up first by the next run.
+    """
+
+    def __init__(self, db_path=MANIFEST_PATH, max_attempts=MAX_ATTEMPTS,
+                 retry_base=RETRY_BASE_SECONDS, retry_max=RETRY_MAX_SECONDS):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        # WAL + NORMAL: one fsync per checkpoint rather than per result
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(SCHEMA)
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def plan(self, files, settings, min_age=0, now=None):
+        """
+        Decides which files need (re-)extraction:
+
+        - new files, and files whose size or mtime changed (unless their
+          content hash shows only the mtime moved);
+        - files processed with another extractor version or other settings;
+        - files left 'pending' by an interrupted run, which counts as an attempt
+          (a file that brings the whole run down is not retried forever);
+        - failed files whose backoff delay has passed, up to `max_attempts`.
+
+        Rows of files that disappeared from the folder are dropped.
+
+        Args:
+            files (list[FileState]): Output of `scan_directory`.
+            settings (dict): Run settings that change the output (part of the match).
+            min_age (float): Skip files modified less than this many seconds ago
+                (still being copied in).
+            now (float | None): Current time, for tests.
+
+        Returns:
+            tuple[list[FileState], Counter]: Files to extract, in scan order, and
+            counts of the skipped ones by reason ('unchanged', 'backoff', 'gave_up',
+            'settling') plus 'resumed' for pending files taken up again.
+        """
+        now = time.time() if now is None else now
+        settings_json = json.dumps(settings, sort_keys=True)
+        known = {row[0]: row for row in self.conn.execute(
+            "SELECT path, size, mtime_ns, content_hash, extractor_version, settings, status, attempts, "
+            "next_attempt FROM files")}
+
+        todo, counts = [], Counter()
+        touched = []      # (size, mtime_ns, path) of files whose content turned out unchanged
+        interrupted = []  # (attempts, status, error, path) of files left 'pending'
+        for f in files:
+            row = known.pop(f.path, None)
+            if (now - f.mtime_ns / 1e9) < min_age:
+                counts["settling"] += 1
+                continue
+            if row is None:
+                todo.append(f)
+                continue
+
+            _, size, mtime_ns, content_hash, version, row_settings, status, attempts, next_attempt = row
+            if version != EXTRACTOR_VERSION or row_settings != settings_json:
+                todo.append(f)
+                continue
+
+            if (size, mtime_ns) != (f.size, f.mtime_ns):
+                # Only re-extract if the bytes changed, not just the timestamp
+                same_content = size == f.size and content_hash and hash_file(f.path) == content_hash
+                if status in DONE_STATES and same_content:
+                    touched.append((f.size, f.mtime_ns, f.path))
+                    counts["unchanged"] += 1
+                else:
+                    todo.append(f)
+            elif status in DONE_STATES:
+                counts["unchanged"] += 1
+            elif status in RETRY_STATES:
+                if attempts >= self.max_attempts:
+                    counts["gave_up"] += 1
+                elif next_attempt > now:
+                    counts["backoff"] += 1
+                else:
+                    todo.append(f)
+            else:
+                attempts += 1
+                if attempts >= self.max_attempts:
+                    logger.warning(f"[!] Giving up on '{os.path.basename(f.path)}' after {attempts} interrupted "
+                                   f"attempt(s) until it changes.")
+                    interrupted.append((attempts, "failed", "Interrupted while being extracted", f.path))
+                    counts["gave_up"] += 1
+                else:
+                    interrupted.append((attempts, "pending", None, f.path))
+                    counts["resumed"] += 1
+                    todo.append(f)
+
+        with self.conn:
+            self.conn.executemany("UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?", touched)
+            self.conn.executemany("UPDATE files SET attempts = ?, status = ?, error = ? WHERE path = ?", interrupted)
+            self.conn.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in known])
+        if known:
+            logger.info(f"[~] Manifest: dropped {len(known)} file(s) no longer in the folder.")
+        return todo, counts
+
+    def begin(self, files, settings):
+        """
+        Marks the files 'pending' before they are dispatched. Attempts and the
+        content hash are kept for a file retried unchanged and reset when it (or
+        the settings) changed; the worker hashes the file as it extracts it and
+        the new hash is stored by `record`.
+
+        Args:
+            files (list[FileState]): Files about to be extracted.
+            settings (dict): Run settings, as given to `plan`.
+        """
+        settings_json = json.dumps(settings, sort_keys=True)
+        rows = [(f.path, f.size, f.mtime_ns, EXTRACTOR_VERSION, settings_json) for f in files]
+        with self.conn:
+            self.conn.executemany(
+                """
+                INSERT INTO files (path, size, mtime_ns, extractor_version, settings, status)
+                VALUES (?, ?, ?, ?, ?, 'pending')
+                ON CONFLICT (path) DO UPDATE SET
+                    attempts = CASE WHEN files.size = excluded.size AND files.mtime_ns = excluded.mtime_ns
+                                     AND files.extractor_version = excluded.extractor_version
+                                     AND files.settings = excluded.settings
+                                    THEN files.attempts ELSE 0 END,
+                    content_hash = CASE WHEN files.size = excluded.size AND files.mtime_ns = excluded.mtime_ns
+                                        THEN files.content_hash END,
+                    size = excluded.size,
+                    mtime_ns = excluded.mtime_ns,
+                    extractor_version = excluded.extractor_version,
+                    settings = excluded.settings,
+                    status = 'pending',
+                    error = NULL
+                """, rows)
+
+    def record(self, path, status, error=None, output=None, file_format=None, elapsed_ms=None,
+               content_hash=None):
+        """
+        Stores the outcome of one file and commits it. Failures schedule the next
+        attempt after `retry_base * 2**(attempts - 1)` seconds (capped at `retry_max`).
+
+        Args:
+            path (str): File path, as given to `begin`.
+            status (str): 'processed', 'empty', 'rejected', 'failed' or 'timed_out'.
+            error (str | None): Error or rejection reason.
+            output (str | None): Output file written for it.
+            file_format (str | None): Detected format.
+            elapsed_ms (float | None): Extraction time.
+            content_hash (str | None): `hash_file` of the file, computed by the worker
+                that extracted it (the stored one is kept when None).
+        """
+        now = time.time()
+        with self.conn:
+            if status in RETRY_STATES:
+                attempts = self.conn.execute("SELECT attempts FROM files WHERE path = ?",
+                                             (path,)).fetchone()[0] + 1
+                delay = min(self.retry_base * 2 ** (attempts - 1), self.retry_max)
+                next_attempt = now + delay
+                if attempts >= self.max_attempts:
+                    logger.warning(f"[!] Giving up on '{os.path.basename(path)}' after {attempts} attempt(s) "
+                                   f"until it changes.")
+                else:
+                    logger.info(f"[~] Will retry '{os.path.basename(path)}' in {delay:.0f}s "
+                                f"(attempt {attempts} of {self.max_attempts}).")
+            else:
+                attempts, next_attempt = 0, 0
+            self.conn.execute(
+                "UPDATE files SET status = ?, error = ?, output = ?, format = ?, attempts = ?, next_attempt = ?, "
+                "finished = ?, elapsed_ms = ?, content_hash = COALESCE(?, content_hash) WHERE path = ?",
+                (status, error, output, file_format, attempts, next_attempt, now, elapsed_ms, content_hash, path))
+
+    def status_counts(self):
+        """
+        Returns {status: number of files} over the whole manifest.
+        """
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM files GROUP BY status"))
@@ -0,0 +1,635 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+import hashlib
+import logging
+import argparse
+import tempfile
+import threading
+import multiprocessing
+import urllib.error
+import urllib.parse
+import urllib.request
+from functools import partial
+from http import HTTPStatus
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from Majd_Zarai_text_extractor.batch import (
+    init_ocr_worker, ocr_threads_per_worker, resolve_worker_count, run_with_timeout
+)
+from Majd_Zarai_text_extractor.metrics import RunMetrics, document_timer
+from Majd_Zarai_text_extractor.registry import get_handler
+from Majd_Zarai_text_extractor.preflight import preflight_file
+from Majd_Zarai_text_extractor.uploads import MAX_UPLOAD_BYTES, check_upload_size, UploadTooLarge
+from Majd_Zarai_text_extractor.extraction_cache import (
+    cached_extract, get_caches, hash_file, DEFAULT_CACHE_DIR, HANDLER_SETTINGS
+)
+
+# ─────────────────────────────────────────────────────────────
+#  JOB SERVICE — Bounded job queue in front of the extractors
+# ─────────────────────────────────────────────────────────────
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 8         # jobs allowed to wait for a worker before submit() pushes back
+DEFAULT_RESULT_TTL = 3600      # seconds a finished job (and its text) is kept for polling
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+UPLOAD_CHUNK_SIZE = 1 << 20    # bytes read per step when an upload is streamed to disk
+RETRY_AFTER = 5                # seconds suggested to clients turned away with 429
+JOB_TIMEOUT = float(os.environ.get("MAJD_JOB_TIMEOUT", 600))  # seconds per job; 0 = no limit
+
+# Workers are started fresh rather than forked: the service usually lives in a
+# threaded process (Streamlit, the asyncio loop), and a fork copies its locks
+# in whatever state the other threads left them
+MP_START_METHOD = "spawn"
+
+# Request parameters accepted as extraction settings, with their parsers
+SETTING_PARSERS = {
+    "lang": str,
+    "dpi": int,
+    "adaptive_dpi": lambda value: value.lower() in ("1", "true", "yes"),
+    "preprocess": lambda value: value.lower() in ("1", "true", "yes"),
+    "layout": lambda value: value.lower() in ("1", "true", "yes"),
+}
+
+
+class ServiceBusy(Exception):
+    """
+    Raised by submit() when the job queue is full. Retry later (HTTP 429).
+    """
+
+
+# ─────────────────────────────────────────────────────────────
+#  Worker side (runs in the executor's processes)
+# ─────────────────────────────────────────────────────────────
+
+_progress_queue = None
+
+
+def _init_worker(progress_queue, ocr_threads):
+    global _progress_queue
+    _progress_queue = progress_queue
+    init_ocr_worker(ocr_threads)
+
+
+def run_extraction_job(job_id, file_path, display_name=None, settings=None, cache_dir=DEFAULT_CACHE_DIR,
+                       content_hash=None, image_root_dir=None):
+    """
+    Extracts one document inside a worker process and reports per-page
+    progress to the service as `(job_id, pages_done, total_pages)` messages.
+
+    Args:
+        job_id (str): Job the progress messages belong to.
+        file_path (str): File to extract.
+        display_name (str | None): Original file name when `file_path` is a temporary copy.
+        settings (dict | None): Overrides for the detected format's HANDLER_SETTINGS;
+            keys the format does not use are ignored.
+        cache_dir (str | None): Extraction cache directory, or None to bypass the cache.
+        content_hash (str | None): SHA-256 of the file if already known (saves re-reading it).
+        image_root_dir (str | None): Root folder for PDF image folders (default: IMAGE_ROOT_DIR);
+            each document's folder is `<content hash>_images`.
+
+    Returns:
+        dict: format, source, text, from_cache, image_dir, image_count, page_stats,
+        stages_ms (time per extraction stage) and elapsed_ms.
+
+    Raises:
+        ValueError: If the file is not a supported, structurally sane document.
+        TimeoutError: If run under `batch.run_with_timeout` and the limit is reached.
+    """
+    def progress(done, total):
+        if _progress_queue is not None:
+            _progress_queue.put((job_id, done, total))
+
+    start = time.perf_counter()
+
+    # Route by what the file really contains; junk and corrupt uploads stop here
+    check = preflight_file(file_path)
+    handler = get_handler(check.format) if check.ok else None
+    if handler is None:
+        raise ValueError(f"unsupported or damaged file: {check.reason}")
+
+    base_settings = HANDLER_SETTINGS[handler.extension]
+    overrides = {key: value for key, value in (settings or {}).items() if key in base_settings}
+    cache, page_cache = get_caches(cache_dir) if cache_dir else (None, None)
+    result = {"format": handler.name, "source": os.path.basename(display_name or file_path),
+              "image_dir": None, "image_count": 0, "page_stats": {}}
+
+    with document_timer() as timer:
+        if handler.has("process"):
+            # PDF: text, OCR and images in one pass. The image folder is named by content hash:
+            # uploads from different sessions can share a file name, never their images
+            content_hash = content_hash or hash_file(file_path)
+            options = {"image_root_dir": image_root_dir} if image_root_dir else {}
+            pdf = handler.load("process")(file_path, overrides, cache=cache, page_cache=page_cache,
+                                          display_name=display_name, progress=progress,
+                                          content_hash=content_hash, image_name=content_hash, **options)
+            result.update(text=pdf.text or "", from_cache=pdf.from_cache, image_dir=pdf.image_dir,
+                          image_count=pdf.image_count, page_stats=pdf.page_stats)
+        else:
+            # The handler settings double as its keyword arguments
+            settings = {**base_settings, **overrides}
+            options = {key: value for key, value in settings.items() if key != "handler"}
+            extract_text = handler.load("extract_text")
+            text, from_cache = cached_extract(file_path, lambda: extract_text(file_path, **options),
+                                              settings, cache, content_hash)
+            result.update(text=text or "", from_cache=from_cache)
+            progress(1, 1)
+    result.update(stages_ms=timer.as_ms(), elapsed_ms=round((time.perf_counter() - start) * 1000, 2))
+
+    return result
+
+
+# ─────────────────────────────────────────────────────────────
+#  Service (runs on an asyncio event loop)
+# ─────────────────────────────────────────────────────────────
+
+class ExtractionService:
+    """
+    Accepts extraction jobs into a bounded queue and runs them on a process pool.
+
+    One dispatcher task per worker process takes jobs off the queue, so the
+    pool never holds more than `max_workers` documents and everything else
+    waits in the queue. Each job fails once it has run for `job_timeout`
+    seconds (see batch.run_with_timeout for what can and cannot be stopped).
+    The CPUs are shared out between the workers' OCR thread pools (see
+    batch.ocr_threads_per_worker). Once `max_queue` jobs are waiting, submit()
+    raises ServiceBusy instead of letting the backlog grow. A job submitted with the
+    content hash of a document already queued, running or done (under the same
+    settings) is answered with the existing job instead of a new one.
+
+    All methods except start()/stop() are plain functions that must be called
+    on the service's event loop; BackgroundService wraps them for other threads.
+    """
+
+    def __init__(self, max_workers=None, max_queue=DEFAULT_QUEUE_SIZE, cache_dir=DEFAULT_CACHE_DIR,
+                 result_ttl=DEFAULT_RESULT_TTL, image_root_dir=None, max_upload_bytes=MAX_UPLOAD_BYTES,
+                 job_timeout=JOB_TIMEOUT):
+        self.max_workers = resolve_worker_count(max_workers)
+        self.ocr_threads = ocr_threads_per_worker(self.max_workers)
+        self.job_timeout = job_timeout or None
+        self.max_queue = max_queue
+        self.cache_dir = cache_dir
+        self.result_ttl = result_ttl
+        self.image_root_dir = image_root_dir
+        self.max_upload_bytes = max_upload_bytes
+        self.jobs = {}
+        self._jobs_by_content = {}  # (content hash, settings) -> job ID
+        self._loop = None
+        self._queue = None
+        self._pool = None
+        self._progress_queue = None
+        self._progress_thread = None
+        self._dispatchers = []
+        self._upload_dir = None
+        self._mp_context = multiprocessing.get_context(MP_START_METHOD)
+        self.metrics = RunMetrics()
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self._mp_context,
+                                   initializer=_init_worker, initargs=(self._progress_queue, self.ocr_threads))
+
+    async def start(self):
+        """
+        Starts the worker pool, the dispatchers and the progress listener.
+
+        Returns:
+            ExtractionService: self, for chaining.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._progress_queue = self._mp_context.Queue()
+        self._pool = self._new_pool()
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.max_workers)]
+        self._progress_thread = threading.Thread(target=self._listen_progress, name="job-progress", daemon=True)
+        self._progress_thread.start()
+        logger.info(f"[~] Extraction service started: {self.max_workers} worker(s) with {self.ocr_threads} "
+                    f"OCR thread(s) each, queue of {self.max_queue} job(s).")
+        return self
+
+    async def stop(self):
+        """
+        Cancels waiting jobs and shuts the worker pool down.
+        """
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        await self._loop.run_in_executor(None, lambda: self._pool.shutdown(cancel_futures=True))
+        self._progress_queue.put(None)
+        self._progress_thread.join()
+        logger.info("[~] Extraction service stopped.")
+
+    def find_job(self, content_hash, settings=None):
+        """
+        Returns the ID of a queued, running or finished (not failed) job for the
+        same content and settings, or None.
+        """
+        job_id = self._jobs_by_content.get(_content_key(content_hash, settings))
+        job = self.jobs.get(job_id)
+        return job_id if job is not None and job["state"] != "failed" else None
+
+    def submit(self, file_path, display_name=None, settings=None, cleanup=False, content_hash=None):
+        """
+        Queues a document for extraction.
+
+        Args:
+            file_path (str): File to extract. It must stay on disk until the job finishes.
+            display_name (str | None): Original file name when `file_path` is a temporary copy.
+            settings (dict | None): Extraction settings (lang, dpi, adaptive_dpi, preprocess, layout);
+                lang is a Tesseract language string such as 'fra+ara', or 'auto' (the default).
+            cleanup (bool): Delete `file_path` once the job has finished.
+            content_hash (str | None): SHA-256 of the file, e.g. from `save_upload`. Lets a
+                duplicate upload reuse the existing job, and the worker skip hashing.
+
+        Returns:
+            str: Job ID to poll with status().
+
+        Raises:
+            ServiceBusy: If `max_queue` jobs are already waiting.
+        """
+        self._expire_jobs()
+        if content_hash:
+            job_id = self.find_job(content_hash, settings)
+            if job_id is not None:
+                logger.info(f"[✓] Duplicate of job {job_id}: {os.path.basename(display_name or file_path)}")
+                if cleanup and file_path != self.jobs[job_id]["path"]:
+                    os.remove(file_path)
+                return job_id
+
+        job_id = uuid.uuid4().hex
+        try:
+            self._queue.put_nowait((job_id, file_path, display_name, settings, cleanup, content_hash))
+        except asyncio.QueueFull:
+            raise ServiceBusy(f"{self.max_queue} job(s) already waiting; retry later.") from None
+
+        self.jobs[job_id] = {
+            "id": job_id,
+            "name": os.path.basename(display_name or file_path),
+            "path": file_path,
+            "state": "queued",
+            "progress": {"done": 0, "total": None},
+            "submitted": time.time(),
+            "started": None,
+            "finished": None,
+            "result": None,
+            "error": None,
+        }
+        if content_hash:
+            self._jobs_by_content[_content_key(content_hash, settings)] = job_id
+        return job_id
+
+    def status(self, job_id):
+        """
+        Returns a snapshot of a job: state ('queued', 'running', 'done' or
+        'failed'), progress {'done', 'total'} in pages, and its result or error.
+        The server-side path of the upload is left out. None if the job is
+        unknown or has expired.
+        """
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        snapshot = {key: value for key, value in job.items() if key != "path"}
+        snapshot["progress"] = dict(job["progress"])
+        return snapshot
+
+    def stats(self):
+        """
+        Returns queue and worker counters (for health checks).
+        """
+        states = [job["state"] for job in self.jobs.values()]
+        return {"workers": self.max_workers, "max_queue": self.max_queue, "waiting": self._queue.qsize(),
+                "running": states.count("running"), "done": states.count("done"), "failed": states.count("failed")}
+
+    async def _dispatch(self):
+        while True:
+            job_id, file_path, display_name, settings, cleanup, content_hash = await self._queue.get()
+            job = self.jobs[job_id]
+            job["state"], job["started"] = "running", time.time()
+            pool = self._pool
+            extract_fn = partial(run_extraction_job, job_id, display_name=display_name, settings=settings,
+                                 cache_dir=self.cache_dir, content_hash=content_hash,
+                                 image_root_dir=self.image_root_dir)
+            try:
+                job["result"] = await self._loop.run_in_executor(
+                    pool, run_with_timeout, extract_fn, file_path, self.job_timeout)
+                job["state"] = "done"
+                result = job["result"]
+                self.metrics.add(job["name"], result["format"], result["stages_ms"], result["elapsed_ms"],
+                                 result["page_stats"].get("pages"))
+                # The last progress messages can arrive after the result and are then
+                # dropped, so the page count comes from the result itself
+                pages = result["page_stats"].get("pages") or job["progress"]["total"] or 1
+                job["progress"] = {"done": pages, "total": pages}
+                logger.info(f"[✓] Job {job_id} ({job['name']}) done.")
+            except TimeoutError:
+                job["state"], job["error"] = "failed", f"timed out after {self.job_timeout:g}s"
+                logger.error(f"[✗] Job {job_id} ({job['name']}) {job['error']}.")
+            except Exception as e:
+                job["state"], job["error"] = "failed", str(e) or type(e).__name__
+                logger.error(f"[✗] Job {job_id} ({job['name']}) failed: {job['error']}")
+                if isinstance(e, BrokenProcessPool) and self._pool is pool:
+                    # A worker died (crash, out of memory); the pool cannot be reused
+                    logger.warning("[!] Worker pool broken, starting a new one.")
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    self._pool = self._new_pool()
+            finally:
+                job["finished"] = time.time()
+                if cleanup:
+                    try:
+                        os.remove(file_path)
+                    except OSError:
+                        pass
+                self._queue.task_done()
+
+    def _listen_progress(self):
+        # Runs on its own thread: the multiprocessing queue only has a blocking get()
+        while True:
+            message = self._progress_queue.get()
+            if message is None:
+                return
+            self._loop.call_soon_threadsafe(self._record_progress, *message)
+
+    def _record_progress(self, job_id, done, total):
+        job = self.jobs.get(job_id)
+        if job is not None and job["state"] == "running":
+            job["progress"] = {"done": done, "total": total}
+
+    def _expire_jobs(self):
+        cutoff = time.time() - self.result_ttl
+        expired = [job_id for job_id, job in self.jobs.items() if job["finished"] and job["finished"] < cutoff]
+        for job_id in expired:
+            del self.jobs[job_id]
+        self._jobs_by_content = {key: job_id for key, job_id in self._jobs_by_content.items()
+                                 if job_id in self.jobs}
+
+    # ─────────────────────────────────────────────────────────
+    #  Local HTTP endpoint
+    # ─────────────────────────────────────────────────────────
+
+    async def serve_http(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        Exposes the service over HTTP:
+
+        - POST /jobs?name=<file name>[&lang=..&adaptive_dpi=1&preprocess=1&layout=1], body =
+          the raw file: 202 {"job_id": ...} (200 with "duplicate": true when the same
+          content already has a job), 429 with Retry-After when the queue is full, or
+          413 when the body is larger than `max_upload_bytes`.
+        - GET /jobs/<job_id>: 200 with the job snapshot (see status()), or 404.
+        - GET /health: 200 with stats().
+        - GET /metrics: stage timings per format and queue gauges, in the
+          Prometheus text format.
+
+        Returns:
+            asyncio.Server: The listening server.
+        """
+        self._upload_dir = tempfile.mkdtemp(prefix="majd_jobs_")
+        server = await asyncio.start_server(self._handle_request, host, port)
+        logger.info(f"[~] Extraction service listening on http://{host}:{port}")
+        return server
+
+    async def _handle_request(self, reader, writer):
+        try:
+            method, target, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            url = urllib.parse.urlsplit(target)
+            query = dict(urllib.parse.parse_qsl(url.query))
+
+            if method == "POST" and url.path == "/jobs":
+                await self._handle_upload(reader, writer, headers, query)
+            elif method == "GET" and url.path.startswith("/jobs/"):
+                job = self.status(url.path[len("/jobs/"):])
+                if job is None:
+                    await _respond(writer, HTTPStatus.NOT_FOUND, {"error": "unknown or expired job"})
+                else:
+                    await _respond(writer, HTTPStatus.OK, job)
+            elif method == "GET" and url.path == "/health":
+                await _respond(writer, HTTPStatus.OK, self.stats())
+            elif method == "GET" and url.path == "/metrics":
+                stats = self.stats()
+                gauges = {"jobs_waiting": stats["waiting"], "jobs_running": stats["running"],
+                          "workers": stats["workers"]}
+                await _respond(writer, HTTPStatus.OK, self.metrics.to_prometheus(gauges))
+            else:
+                await _respond(writer, HTTPStatus.NOT_FOUND, {"error": f"no route for {method} {url.path}"})
+        except (ValueError, ConnectionError, asyncio.IncompleteReadError) as e:
+            logger.warning(f"[!] Bad request: {e}")
+            try:
+                await _respond(writer, HTTPStatus.BAD_REQUEST, {"error": str(e)})
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+
+    async def _handle_upload(self, reader, writer, headers, query):
+        length = int(headers.get("content-length", 0))
+        busy = {"error": f"{self.max_queue} job(s) already waiting; retry later."}
+
+        # Checked on the declared size, before a byte of the body is stored
+        try:
+            check_upload_size(length, self.max_upload_bytes)
+        except UploadTooLarge as e:
+            await _discard_body(reader, length)
+            await _respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": str(e)})
+            return
+
+        if self._queue.full():
+            await _discard_body(reader, length)
+            await _respond(writer, HTTPStatus.TOO_MANY_REQUESTS, busy, {"Retry-After": RETRY_AFTER})
+            return
+
+        name = os.path.basename(query.get("name", "upload"))
+        settings = {key: parse(query[key]) for key, parse in SETTING_PARSERS.items() if key in query}
+        digest = hashlib.sha256()
+        fd, upload_path = tempfile.mkstemp(dir=self._upload_dir, suffix=f"_{name}")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                while length > 0:
+                    chunk = await reader.readexactly(min(UPLOAD_CHUNK_SIZE, length))
+                    digest.update(chunk)
+                    f.write(chunk)
+                    length -= len(chunk)
+            content_hash = digest.hexdigest()
+            duplicate = self.find_job(content_hash, settings) is not None
+            job_id = self.submit(upload_path, display_name=name, settings=settings, cleanup=True,
+                                 content_hash=content_hash)
+        except ServiceBusy:
+            os.remove(upload_path)
+            await _respond(writer, HTTPStatus.TOO_MANY_REQUESTS, busy, {"Retry-After": RETRY_AFTER})
+            return
+        except BaseException:
+            if os.path.exists(upload_path):
+                os.remove(upload_path)
+            raise
+        if duplicate:
+            await _respond(writer, HTTPStatus.OK, {"job_id": job_id, "duplicate": True})
+        else:
+            await _respond(writer, HTTPStatus.ACCEPTED, {"job_id": job_id})
+
+
+def _content_key(content_hash, settings):
+    return content_hash, json.dumps(settings or {}, sort_keys=True)
+
+
+async def _discard_body(reader, length):
+    # Read and drop a refused upload: a client still sending it would otherwise
+    # see a reset connection (broken pipe) instead of the 413/429 response
+    while length > 0:
+        length -= len(await reader.readexactly(min(UPLOAD_CHUNK_SIZE, length)))
+
+
+async def _respond(writer, status, body, extra_headers=None):
+    # Strings are sent as plain text (the Prometheus format), anything else as JSON
+    if isinstance(body, str):
+        payload, content_type = body.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+    else:
+        payload, content_type = json.dumps(body, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8"
+    head = [f"HTTP/1.1 {status.value} {status.phrase}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(payload)}",
+            "Connection: close"]
+    head += [f"{name}: {value}" for name, value in (extra_headers or {}).items()]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload)
+    await writer.drain()
+
+
+# ─────────────────────────────────────────────────────────────
+#  Synchronous clients (Streamlit, scripts)
+# ─────────────────────────────────────────────────────────────
+
+class BackgroundService:
+    """
+    Runs an ExtractionService in-process, on an event loop in a daemon thread,
+    and exposes blocking submit()/status() calls for synchronous code.
+    """
+
+    def __init__(self, **service_options):
+        self.service = ExtractionService(**service_options)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="extraction-service", daemon=True)
+
+    def _call(self, function, *args, **kwargs):
+        async def call():
+            return await function(*args, **kwargs) if asyncio.iscoroutinefunction(function) \
+                else function(*args, **kwargs)
+        return asyncio.run_coroutine_threadsafe(call(), self._loop).result()
+
+    def start(self):
+        self._thread.start()
+        self._call(self.service.start)
+        return self
+
+    def stop(self):
+        self._call(self.service.stop)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def submit(self, file_path, display_name=None, settings=None, cleanup=False, content_hash=None):
+        """
+        See ExtractionService.submit(). Raises ServiceBusy when the queue is full.
+        """
+        return self._call(self.service.submit, file_path, display_name, settings, cleanup, content_hash)
+
+    def status(self, job_id):
+        """
+        See ExtractionService.status().
+        """
+        return self._call(self.service.status, job_id)
+
+
+class HttpServiceClient:
+    """
+    Same submit()/status() calls as BackgroundService, against a service
+    started with `python -m Majd_Zarai_text_extractor.job_service`.
+    """
+
+    def __init__(self, base_url=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, request):
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            if e.code == HTTPStatus.TOO_MANY_REQUESTS:
+                raise ServiceBusy(json.loads(e.read()).get("error", "queue full")) from None
+            if e.code == HTTPStatus.NOT_FOUND:
+                return None
+            if e.code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE:
+                raise UploadTooLarge(json.loads(e.read()).get("error", "file too large")) from None
+            raise
+
+    def submit(self, file_path, display_name=None, settings=None, cleanup=False, content_hash=None):
+        """
+        Uploads a file as a new job. Raises ServiceBusy on a 429 response.
+        The service hashes the upload itself, so `content_hash` is not sent.
+        """
+        query = {"name": display_name or os.path.basename(file_path)}
+        query.update({key: int(value) if isinstance(value, bool) else value
+                      for key, value in (settings or {}).items() if key in SETTING_PARSERS})
+        with open(file_path, "rb") as f:
+            request = urllib.request.Request(
+                f"{self.base_url}/jobs?{urllib.parse.urlencode(query)}", data=f, method="POST",
+                headers={"Content-Type": "application/octet-stream",
+                         "Content-Length": str(os.path.getsize(file_path))})
+            try:
+                return self._request(request)["job_id"]
+            finally:
+                if cleanup:
+                    os.remove(file_path)
+
+    def status(self, job_id):
+        """
+        Returns the job snapshot, or None if the job is unknown or has expired.
+        """
+        return self._request(f"{self.base_url}/jobs/{urllib.parse.quote(job_id)}")
+
+
+async def _serve(args):
+    service = await ExtractionService(max_workers=args.workers, max_queue=args.queue_size,
+                                      cache_dir=None if args.no_cache else args.cache_dir,
+                                      max_upload_bytes=args.max_upload_mb * 1024 ** 2,
+                                      job_timeout=args.job_timeout).start()
+    server = await service.serve_http(args.host, args.port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the extraction job service as a local HTTP endpoint.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (0 = one per CPU)")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="Jobs allowed to wait before new submissions get 429")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Extraction cache directory")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the extraction cache")
+    parser.add_argument("--max-upload-mb", type=int, default=MAX_UPLOAD_BYTES // 1024 ** 2,
+                        help="Largest accepted upload, in MB (larger ones get 413)")
+    parser.add_argument("--job-timeout", type=float, default=JOB_TIMEOUT,
+                        help="Wall-clock limit per job in seconds (0 = none)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
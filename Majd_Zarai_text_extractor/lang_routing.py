@@ -0,0 +1,274 @@
+import re
+import logging
+import threading
+from collections import Counter, namedtuple
+
+from PIL import Image
+
+from Majd_Zarai_text_extractor.metrics import stage
+from Majd_Zarai_text_extractor.ocr_engine import OSD_LANG, available_languages, get_ocr_engine
+
+# ─────────────────────────────────────────────────────────────
+#  LANGUAGE ROUTING — Pick the OCR languages (and rotation) per page
+# ─────────────────────────────────────────────────────────────
+
+logger = logging.getLogger(__name__)
+
+AUTO_LANG = "auto"          # `lang` value that turns routing on
+DEFAULT_LANG = "eng"        # used when nothing can be detected
+LATIN_FALLBACK = "eng+fra"  # Latin-script page whose language is unknown
+
+OSD_DPI = 150               # pages are scaled down to about this before orientation/script detection
+MIN_ORIENTATION_CONF = 2.0  # Tesseract OSD confidences below these are ignored
+MIN_SCRIPT_CONF = 1.0
+
+MIN_TEXT_LETTERS = 40       # letters needed before native text says anything about a language
+TEXT_SAMPLE_CHARS = 4000    # characters of a page's native text that are looked at
+DOCUMENT_SAMPLE_LETTERS = 20000  # native-text letters after which the document language is settled
+SECOND_SCRIPT_SHARE = 0.2   # share of letters in a second script before its language is added
+
+# Short, frequent words that tell French and English apart
+FRENCH_WORDS = frozenset(
+    "le la les des du de un une et est sont pour dans par sur avec que qui ne pas au aux ce cette ces "
+    "il elle nous vous ils leur mais ou où été être avoir sa son ses".split())
+ENGLISH_WORDS = frozenset(
+    "the and of to in is are was were for with on that this these by from be have has not or it "
+    "its an as at which will would".split())
+
+WORD_RE = re.compile(r"[^\W\d_]+")
+ARABIC_RE = re.compile(r"[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]")
+LATIN_RE = re.compile(r"[A-Za-z\u00C0-\u00D6\u00D8-\u00F6\u00F8-\u024F]")
+FRENCH_ACCENTS_RE = re.compile("[àâçéèêëîïôûùüÿœæÀÂÇÉÈÊËÎÏÔÛÙÜŸŒÆ]")
+
+# Tesseract OSD script name -> language packs for it
+SCRIPT_LANGUAGES = {"Arabic": "ara"}
+
+# Clockwise rotation reported by OSD -> PIL transpose that undoes it
+ROTATIONS = {90: Image.Transpose.ROTATE_270, 180: Image.Transpose.ROTATE_180, 270: Image.Transpose.ROTATE_90}
+
+Route = namedtuple("Route", "lang rotate reason")
+
+
+def text_language_scores(text):
+    """
+    Counts the evidence for each supported language in a sample of text:
+    Arabic letters for 'ara'; for the Latin letters, French and English
+    function words (and French accents) decide how they are shared out.
+
+    Returns:
+        Counter: {'ara': letters, 'fra': letters, 'eng': letters}.
+    """
+    sample = text[:TEXT_SAMPLE_CHARS]
+    scores = Counter()
+    arabic = len(ARABIC_RE.findall(sample))
+    latin = len(LATIN_RE.findall(sample))
+    if arabic:
+        scores["ara"] = arabic
+    if latin:
+        words = WORD_RE.findall(sample.lower())
+        french = sum(word in FRENCH_WORDS for word in words) + len(FRENCH_ACCENTS_RE.findall(sample)) / 4
+        english = sum(word in ENGLISH_WORDS for word in words)
+        if french + english:
+            scores["fra"] = latin * french / (french + english)
+            scores["eng"] = latin * english / (french + english)
+        else:
+            scores["eng"] = latin
+    return scores
+
+
+def language_from_scores(scores):
+    """
+    Turns `text_language_scores` into a Tesseract language string: the
+    language with most evidence, plus the other script's language when that
+    script has at least SECOND_SCRIPT_SHARE of the letters ('ara+fra').
+
+    Returns:
+        str | None: e.g. 'fra', 'ara+eng', or None below MIN_TEXT_LETTERS.
+    """
+    total = sum(scores.values())
+    if total < MIN_TEXT_LETTERS:
+        return None
+    latin = "fra" if scores["fra"] > scores["eng"] else "eng"
+    arabic_share = scores["ara"] / total
+    if arabic_share >= 1 - SECOND_SCRIPT_SHARE:
+        return "ara"
+    if arabic_share >= 0.5:
+        return f"ara+{latin}"
+    if arabic_share >= SECOND_SCRIPT_SHARE:
+        return f"{latin}+ara"
+    return latin
+
+
+def detect_text_language(text):
+    """
+    Language of a piece of native text (see `language_from_scores`), or None.
+    """
+    return language_from_scores(text_language_scores(text))
+
+
+def rotate_upright(image, rotate):
+    """
+    Undoes a page rotation found by OSD (clockwise degrees: 0, 90, 180 or 270).
+    """
+    transpose = ROTATIONS.get(rotate % 360)
+    return image.transpose(transpose) if transpose is not None else image
+
+
+class LanguageRouter:
+    """
+    Chooses, for each page sent to OCR, the Tesseract languages to run and
+    the rotation that makes the page upright, so that a page is recognised
+    with its own language pack only instead of every installed one.
+
+    - Native text is the cheapest evidence: the page's own text when it has
+      enough of it, otherwise what the document's native pages said so far
+      (see `observe`).
+    - Otherwise a Tesseract OSD pass on the page scaled down to OSD_DPI gives
+      the script and the page orientation: an Arabic-script page is read
+      with 'ara', a Latin-script one with the document's Latin language if
+      known, else LATIN_FALLBACK.
+    - The OSD rotation is always applied when its confidence is high enough.
+
+    Languages whose pack is not installed are left out; without the OSD pack
+    the rotation is not corrected and pages without any hint use DEFAULT_LANG.
+    `route` is thread-safe; `observe` is meant for the thread walking the pages.
+
+    Args:
+        backend (str): OCR backend, as for `get_ocr_engine`.
+        osd_dpi (int): Resolution the OSD pass works at.
+    """
+
+    def __init__(self, backend='auto', osd_dpi=OSD_DPI):
+        self.backend = backend
+        self.osd_dpi = osd_dpi
+        self.installed = available_languages(backend)
+        self.has_osd = self.installed is None or OSD_LANG in self.installed
+        if not self.has_osd:
+            logger.warning(f"[!] Tesseract's '{OSD_LANG}' data is not installed: pages are not rotated, and "
+                           f"pages without native text are OCR'd in the document's language or '{DEFAULT_LANG}'.")
+        self._scores = Counter()
+        self._lock = threading.Lock()
+        self.routes = Counter()
+
+    def _installed(self, lang):
+        """
+        `lang` without the packs that are not installed (DEFAULT_LANG if none is left).
+        """
+        if self.installed is None:
+            return lang
+        kept = [part for part in lang.split("+") if part in self.installed]
+        return "+".join(kept) if kept else DEFAULT_LANG
+
+    def observe(self, text):
+        """
+        Adds a native page's text to the evidence for the document language
+        (until DOCUMENT_SAMPLE_LETTERS letters have been seen).
+        """
+        if sum(self._scores.values()) < DOCUMENT_SAMPLE_LETTERS and text:
+            self._scores.update(text_language_scores(text))
+
+    def document_language(self):
+        """
+        Language of the native text observed so far, or None.
+        """
+        return language_from_scores(self._scores)
+
+    def hint(self, text=""):
+        """
+        Native-text evidence for one page: its own text if it says enough,
+        else the document language. Call from the thread that observes pages
+        and pass the result to `route`.
+        """
+        return detect_text_language(text) or self.document_language()
+
+    def _detect(self, image, dpi):
+        """
+        OSD on a reduced, grayscale copy of the page; None if it cannot decide.
+        """
+        factor = max(1, round(dpi / self.osd_dpi))
+        small = image.reduce(factor) if factor > 1 else image
+        try:
+            with stage("osd"):
+                return get_ocr_engine(OSD_LANG, self.backend).detect_orientation_script(small.convert("L"))
+        except TimeoutError:
+            raise
+        except Exception as e:
+            logger.debug(f"Orientation/script detection failed: {e}")
+            return None
+
+    def route(self, image, dpi, hint=None):
+        """
+        Decides how one rendered page is OCR'd.
+
+        Args:
+            image (PIL.Image.Image): The page, as rendered for OCR.
+            dpi (int): Resolution it was rendered at.
+            hint (str | None): Language from native text (see `hint`).
+
+        Returns:
+            Route: Tesseract language string, clockwise rotation to undo, and a
+            short reason for the log.
+        """
+        osd = self._detect(image, dpi) if self.has_osd else None
+        rotate = 0
+        if osd is not None and osd["orientation_conf"] >= MIN_ORIENTATION_CONF:
+            rotate = osd["rotate"]
+
+        hint_parts = hint.split("+") if hint else []
+        latin = next((part for part in hint_parts if part != "ara"), None)
+        if osd is not None and osd["script_conf"] >= MIN_SCRIPT_CONF:
+            script = osd["script"]
+            if script in SCRIPT_LANGUAGES:
+                lang, reason = SCRIPT_LANGUAGES[script], f"{script} script"
+                if "ara" in hint_parts and latin:
+                    # Native text mixes Arabic and a Latin language: keep both
+                    lang, reason = f"{lang}+{latin}", f"{script} script and native text"
+            elif script == "Latin":
+                lang, reason = latin or LATIN_FALLBACK, "Latin script" + (" and native text" if latin else "")
+            else:
+                lang, reason = hint or DEFAULT_LANG, f"{script} script, no matching language"
+        elif hint:
+            lang, reason = hint, "native text"
+        else:
+            lang, reason = DEFAULT_LANG, "nothing detected"
+
+        route = Route(self._installed(lang), rotate, reason)
+        with self._lock:
+            self.routes[route.lang] += 1
+        return route
+
+    def prepare(self, image, dpi, hint=None, route=None):
+        """
+        Routes a page (unless `route` is already known, e.g. from a first
+        low-DPI pass) and turns it upright.
+
+        Returns:
+            tuple[PIL.Image.Image, Route]: The upright page and its route.
+        """
+        if route is None:
+            route = self.route(image, dpi, hint)
+        return rotate_upright(image, route.rotate), route
+
+
+def ocr_image(image, lang=AUTO_LANG, dpi=300, router=None, hint=None):
+    """
+    OCRs one page image with `lang`, or, for lang='auto', with the languages
+    and rotation `router` picks for it. Used by the simple extraction paths.
+
+    Args:
+        image (PIL.Image.Image): Rendered page.
+        lang (str): Tesseract language string, or 'auto'.
+        dpi (int): Resolution of the image.
+        router (LanguageRouter | None): Router shared by the pages of a
+            document (created for this page if None and lang='auto').
+        hint (str | None): Language from native text, if any.
+
+    Returns:
+        str: The recognised text.
+    """
+    if lang != AUTO_LANG:
+        return get_ocr_engine(lang).image_to_string(image)
+    image, route = (router or LanguageRouter()).prepare(image, dpi, hint)
+    logger.info(f"OCR language '{route.lang}' ({route.reason}"
+                f"{f', rotated {route.rotate}°' if route.rotate else ''}).")
+    return get_ocr_engine(route.lang).image_to_string(image)
@@ -0,0 +1,311 @@
+import time
+import logging
+import functools
+import threading
+import statistics
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ─────────────────────────────────────────────────────────────
+#  METRICS — Per-stage timers, per-format totals, Prometheus text
+# ─────────────────────────────────────────────────────────────
+
+logger = logging.getLogger(__name__)
+
+# Stages timed inside the handlers ('import' is a handler's first, lazy import in
+# the process, 'osd' the orientation/script pass that picks OCR languages);
+# whatever is left of a document's wall-clock time (cache lookups, table files,
+# scheduling) is reported as 'other'
+STAGES = ("import", "open", "native_text", "render", "preprocess", "osd", "ocr", "images", "write")
+
+MAX_DOCUMENTS = 10000   # per-document records kept for the report and the percentiles
+METRIC_PREFIX = "majd_extractor"
+DEFAULT_METRICS_PORT = 9464
+
+
+class StageTimer:
+    """
+    Seconds spent in each stage while one document is extracted.
+
+    Stages that run on thread pools (OCR, preprocessing, image writes) are
+    summed over their threads, so they can add up to more than the
+    document's wall-clock time.
+    """
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds):
+        with self._lock:
+            self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+            self.total += seconds
+
+    def as_ms(self):
+        """
+        Returns {stage: milliseconds}, rounded for reports.
+        """
+        return {name: round(seconds * 1000, 2) for name, seconds in self.seconds.items()}
+
+
+# Timer of the document being extracted in this process. Each worker process
+# extracts one document at a time, so a module global (rather than a context
+# variable, which would not reach the OCR threads) is enough.
+_current = None
+
+
+@contextmanager
+def document_timer():
+    """
+    Times the stages of the document extracted inside the block.
+
+    Yields:
+        StageTimer: Filled by every `stage()` entered until the block ends.
+    """
+    global _current
+    previous, _current = _current, StageTimer()
+    try:
+        yield _current
+    finally:
+        _current = previous
+
+
+def current_timer():
+    """
+    Returns the StageTimer of the document being extracted, or None outside `document_timer()`.
+    """
+    return _current
+
+
+@contextmanager
+def stage(name):
+    """
+    Adds the time spent in the block to stage `name` of the current document.
+    Costs one clock read when no document is being timed.
+    """
+    timer = _current
+    if timer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, time.perf_counter() - start)
+
+
+def timed_iter(iterable, name):
+    """
+    Passes `iterable` through, adding the time spent producing each item to
+    stage `name`. Time recorded by nested stages meanwhile (e.g. 'open' inside
+    a handler generator) is not counted twice, nor is the consumer's time
+    between two items.
+
+    Args:
+        iterable (Iterable): Usually a handler generator.
+        name (str): Stage to charge.
+
+    Yields:
+        The items of `iterable`.
+    """
+    timer = _current
+    if timer is None:
+        yield from iterable
+        return
+
+    iterator = iter(iterable)
+    spent = 0.0
+    try:
+        while True:
+            start, nested = time.perf_counter(), timer.total
+            try:
+                item = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                spent += time.perf_counter() - start - (timer.total - nested)
+            yield item
+    finally:
+        timer.add(name, spent)
+
+
+def timed_generator(name):
+    """
+    Decorator form of `timed_iter` for `iter_text_from_*` generators.
+    """
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            return timed_iter(function(*args, **kwargs), name)
+        return wrapper
+    return decorate
+
+
+# ─────────────────────────────────────────────────────────────
+#  Aggregation over a run (or the lifetime of a service)
+# ─────────────────────────────────────────────────────────────
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+class RunMetrics:
+    """
+    Collects the stage times of every extracted document and aggregates them
+    per format: totals since start (for counters) and p50/p95 latencies over
+    the last `max_documents` documents. Thread-safe.
+    """
+
+    def __init__(self, max_documents=MAX_DOCUMENTS):
+        self.started = time.time()
+        self.documents = deque(maxlen=max_documents)
+        self._formats = {}
+        self._lock = threading.Lock()
+
+    def add(self, source, file_format, stages_ms, elapsed_ms, pages=None):
+        """
+        Records one extracted document.
+
+        Args:
+            source (str): File name.
+            file_format (str): Handler name ('pdf', 'docx', 'xlsx').
+            stages_ms (dict): {stage: milliseconds}, from `StageTimer.as_ms()`.
+            elapsed_ms (float): Wall-clock time of the whole document.
+            pages (int | None): Page count, for PDFs.
+        """
+        other_ms = max(0.0, elapsed_ms - sum(stages_ms.values()))
+        record = {"source": source, "format": file_format, "elapsed_ms": round(elapsed_ms, 2),
+                  "stages_ms": {**stages_ms, "other": round(other_ms, 2)}}
+        if pages is not None:
+            record["pages"] = pages
+
+        with self._lock:
+            self.documents.append(record)
+            totals = self._formats.setdefault(file_format, {"documents": 0, "pages": 0, "elapsed_ms": 0.0,
+                                                            "stages_ms": dict.fromkeys(STAGES + ("other",), 0.0)})
+            totals["documents"] += 1
+            totals["pages"] += pages or 0
+            totals["elapsed_ms"] += elapsed_ms
+            for name, ms in record["stages_ms"].items():
+                totals["stages_ms"][name] = totals["stages_ms"].get(name, 0.0) + ms
+
+    def by_format(self):
+        """
+        Returns per-format totals, latency percentiles and the share of time
+        taken by each stage.
+        """
+        with self._lock:
+            formats = {name: {**totals, "stages_ms": dict(totals["stages_ms"])}
+                       for name, totals in self._formats.items()}
+            latencies = {}
+            for record in self.documents:
+                latencies.setdefault(record["format"], []).append(record["elapsed_ms"])
+
+        for name, totals in formats.items():
+            staged = sum(totals["stages_ms"].values()) or 1
+            totals["elapsed_ms"] = round(totals["elapsed_ms"], 2)
+            totals["stages_ms"] = {stage_name: round(ms, 2) for stage_name, ms in totals["stages_ms"].items()}
+            totals["stage_share"] = {stage_name: round(ms / staged, 3)
+                                     for stage_name, ms in totals["stages_ms"].items()}
+            values = latencies.get(name)
+            if values:
+                totals["p50_ms"] = round(statistics.median(values), 2)
+                totals["p95_ms"] = round(_percentile(values, 0.95), 2)
+        return formats
+
+    def report(self):
+        """
+        Returns the JSON-serialisable metrics report: stages, per-format
+        aggregates and the per-document records.
+        """
+        with self._lock:
+            documents = list(self.documents)
+        return {"stages": list(STAGES) + ["other"], "formats": self.by_format(), "documents": documents}
+
+    def log_summary(self):
+        """
+        Logs one line per format with the stages that took the most time.
+        """
+        for name, totals in sorted(self.by_format().items()):
+            shares = sorted(totals["stage_share"].items(), key=lambda item: item[1], reverse=True)
+            top = ", ".join(f"{stage_name} {share:.0%}" for stage_name, share in shares if share >= 0.01)
+            logger.info(f"[~] {name}: {totals['documents']} document(s) in {totals['elapsed_ms'] / 1000:.2f}s "
+                        f"— {top or 'no stage time recorded'}")
+
+    def to_prometheus(self, gauges=None):
+        """
+        Renders the totals in the Prometheus text exposition format (0.0.4).
+
+        Args:
+            gauges (dict | None): Extra {name: value} gauges (e.g. queue depth),
+                exported as `majd_extractor_<name>`.
+
+        Returns:
+            str: The /metrics response body.
+        """
+        formats = self.by_format()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{label}"' for key, label in labels.items())
+                lines.append(f"{METRIC_PREFIX}_{name}{{{label_text}}} {value}" if label_text
+                             else f"{METRIC_PREFIX}_{name} {value}")
+
+        metric("documents_total", "counter", "Documents extracted, by format.",
+               [({"format": name}, totals["documents"]) for name, totals in formats.items()])
+        metric("pages_total", "counter", "PDF pages extracted.",
+               [({"format": name}, totals["pages"]) for name, totals in formats.items() if totals["pages"]])
+        metric("document_seconds_total", "counter", "Wall-clock extraction time, by format.",
+               [({"format": name}, round(totals["elapsed_ms"] / 1000, 6)) for name, totals in formats.items()])
+        metric("stage_seconds_total", "counter", "Time spent in each extraction stage, by format.",
+               [({"format": name, "stage": stage_name}, round(ms / 1000, 6))
+                for name, totals in formats.items() for stage_name, ms in totals["stages_ms"].items()])
+        metric("document_seconds", "gauge", "Per-document latency quantiles over recent documents.",
+               [({"format": name, "quantile": quantile}, round(totals[key] / 1000, 6))
+                for name, totals in formats.items()
+                for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms")) if key in totals])
+        metric("start_time_seconds", "gauge", "Unix time the metrics started being collected.",
+               [({}, self.started)])
+        for name, value in (gauges or {}).items():
+            metric(name, "gauge", name.replace("_", " ").capitalize() + ".", [({}, value)])
+        return "\n".join(lines) + "\n"
+
+
+def serve_metrics(metrics, host="127.0.0.1", port=DEFAULT_METRICS_PORT):
+    """
+    Serves `metrics.to_prometheus()` at http://<host>:<port>/metrics from a
+    daemon thread, for the duration of a batch or watch run.
+
+    Args:
+        metrics (RunMetrics): Metrics to expose.
+        host (str): Interface to listen on.
+        port (int): TCP port.
+
+    Returns:
+        ThreadingHTTPServer: The running server (call shutdown() to stop it).
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.to_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(f"metrics endpoint: {format % args}")
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-endpoint", daemon=True).start()
+    logger.info(f"[~] Metrics available at http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,299 @@
+import os
+import queue
+import atexit
+import logging
+import functools
+import threading
+import importlib.util
+
+from PIL import Image
+
+# tesserocr (C-API bindings, Tesseract stays loaded in-process) is preferred when installed.
+# Both backends are imported only when the first engine is created.
+HAS_TESSEROCR = importlib.util.find_spec("tesserocr") is not None
+
+# ─────────────────────────────────────────────────────────────
+#  OCR ENGINE — Shared Tesseract backends for all handlers
+# ─────────────────────────────────────────────────────────────
+
+logger = logging.getLogger(__name__)
+
+# Tesseract's orientation and script detection data (osd.traineddata)
+OSD_LANG = 'osd'
+
+# Pages OCR'd at once by one process (see ocr_thread_count)
+OCR_THREADS_ENV = "MAJD_OCR_THREADS"
+
+# Pages are already recognised in parallel, so Tesseract's own OpenMP threads
+# would only oversubscribe the CPUs. Set before tesserocr is loaded, and
+# inherited by every `tesseract` subprocess pytesseract starts.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+
+def ocr_thread_count():
+    """
+    Number of pages this process OCRs at once: MAJD_OCR_THREADS when set (batch
+    and job service workers get their share of the CPUs, see
+    `set_ocr_thread_count`), else one per CPU.
+    """
+    try:
+        return max(1, int(os.environ[OCR_THREADS_ENV]))
+    except (KeyError, ValueError):
+        return os.cpu_count() or 1
+
+
+def set_ocr_thread_count(count):
+    """
+    Sets this process's OCR thread budget (`ocr_thread_count`). Called in each
+    worker process before any engine is created, so the Tesseract pools are
+    sized to it too.
+    """
+    os.environ[OCR_THREADS_ENV] = str(max(1, int(count)))
+
+
+def _to_pil(image):
+    """
+    Accepts a PIL image or a NumPy array and returns a PIL image.
+    """
+    if isinstance(image, Image.Image):
+        return image
+    return Image.fromarray(image)
+
+
+class PytesseractEngine:
+    """
+    Fallback backend built on pytesseract.
+    Every call starts a `tesseract` process and reloads the language data,
+    so it is only used when tesserocr is not installed.
+    """
+
+    name = "pytesseract"
+
+    def __init__(self, lang='eng'):
+        import pytesseract  # one tesseract subprocess per call
+        self._pytesseract = pytesseract
+        self.lang = lang
+
+    def image_to_string(self, image):
+        return self._pytesseract.image_to_string(image, lang=self.lang)
+
+    def image_to_string_with_confidence(self, image):
+        """
+        OCRs an image once and returns (text, mean word confidence 0-100 or None).
+        The text is rebuilt from Tesseract's word boxes: words joined by spaces,
+        lines by newlines and paragraphs by a blank line.
+        """
+        pytesseract = self._pytesseract
+        data = pytesseract.image_to_data(image, lang=self.lang, output_type=pytesseract.Output.DICT)
+
+        lines = []
+        confidences = []
+        current_key = None
+        current_paragraph = None
+        for i, word in enumerate(data["text"]):
+            if not word or not word.strip():
+                continue
+            confidence = float(data["conf"][i])
+            if confidence >= 0:
+                confidences.append(confidence)
+
+            paragraph = (data["block_num"][i], data["par_num"][i])
+            key = paragraph + (data["line_num"][i],)
+            if key != current_key:
+                if current_paragraph is not None and paragraph != current_paragraph:
+                    lines.append("")
+                lines.append(word)
+                current_key, current_paragraph = key, paragraph
+            else:
+                lines[-1] += " " + word
+
+        mean_confidence = sum(confidences) / len(confidences) if confidences else None
+        return "\n".join(lines), mean_confidence
+
+    def detect_orientation_script(self, image):
+        """
+        Runs Tesseract's orientation and script detection (OSD) on an image.
+
+        Returns:
+            dict: 'rotate' (clockwise degrees that make the page upright),
+            'orientation_conf', 'script' (e.g. 'Latin', 'Arabic') and 'script_conf'.
+
+        Raises:
+            pytesseract.TesseractError: If the page has too little text to decide.
+        """
+        pytesseract = self._pytesseract
+        osd = pytesseract.image_to_osd(image, output_type=pytesseract.Output.DICT)
+        return {"rotate": int(osd["rotate"]), "orientation_conf": float(osd["orientation_conf"]),
+                "script": osd["script"], "script_conf": float(osd["script_conf"])}
+
+    def close(self):
+        pass
+
+
+class TesserocrEngine:
+    """
+    Pool of long-lived Tesseract instances (tesserocr.PyTessBaseAPI).
+
+    Each instance loads the `lang` data once and is then reused for every page
+    and document processed by this process. Instances are created on demand up
+    to `size` (default: the process's OCR thread budget) and handed out one per
+    thread; tesserocr releases the GIL while recognising, so a thread pool of
+    the same size keeps the process's share of the cores busy.
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, lang='eng', size=None):
+        import tesserocr
+        self._tesserocr = tesserocr
+        self.lang = lang
+        self.size = size or ocr_thread_count()
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                logger.info(f"Loading Tesseract instance {self._created}/{self.size} (lang='{self.lang}').")
+                if self.lang == OSD_LANG:
+                    return self._tesserocr.PyTessBaseAPI(lang=self.lang, psm=self._tesserocr.PSM.OSD_ONLY)
+                return self._tesserocr.PyTessBaseAPI(lang=self.lang)
+
+        # Pool is full: wait for another thread to give one back
+        return self._idle.get()
+
+    def image_to_string(self, image):
+        api = self._acquire()
+        try:
+            api.SetImage(_to_pil(image))
+            return api.GetUTF8Text()
+        finally:
+            self._idle.put(api)
+
+    def image_to_string_with_confidence(self, image):
+        """
+        OCRs an image once and returns (text, mean word confidence 0-100 or None).
+        """
+        api = self._acquire()
+        try:
+            api.SetImage(_to_pil(image))
+            text = api.GetUTF8Text()
+            confidences = api.AllWordConfidences()
+            mean_confidence = sum(confidences) / len(confidences) if confidences else None
+            return text, mean_confidence
+        finally:
+            self._idle.put(api)
+
+    def detect_orientation_script(self, image):
+        """
+        Orientation and script detection; same result as
+        `PytesseractEngine.detect_orientation_script`. Use the OSD_LANG engine.
+
+        Raises:
+            RuntimeError: If the page has too little text to decide.
+        """
+        api = self._acquire()
+        try:
+            api.SetImage(_to_pil(image))
+            result = api.DetectOrientationScript()
+        finally:
+            self._idle.put(api)
+        if not result:
+            raise RuntimeError("orientation and script detection found too little text")
+        # orient_deg is the clockwise rotation of the page as scanned; turning it
+        # a further 360 - orient_deg degrees clockwise puts it upright
+        return {"rotate": (360 - result["orient_deg"]) % 360, "orientation_conf": result["orient_conf"],
+                "script": result["script_name"], "script_conf": result["script_conf"]}
+
+    def close(self):
+        while True:
+            try:
+                api = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            api.End()
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def resolve_backend(backend='auto'):
+    """
+    Returns the backend `get_ocr_engine` uses: 'tesserocr' or 'pytesseract'
+    (the `name` of its engines).
+    """
+    if backend == 'auto':
+        backend = os.environ.get("MAJD_OCR_BACKEND", "tesserocr" if HAS_TESSEROCR else "pytesseract")
+
+    if backend == 'tesserocr' and not HAS_TESSEROCR:
+        logger.warning("tesserocr is not installed; falling back to pytesseract.")
+        backend = 'pytesseract'
+    return backend
+
+
+@functools.lru_cache(maxsize=None)
+def available_languages(backend='auto'):
+    """
+    Language packs installed for Tesseract (e.g. {'eng', 'fra', 'osd'}),
+    looked up once per process.
+
+    Returns:
+        frozenset[str] | None: The installed packs, or None if Tesseract could
+        not be asked (then every language is assumed to be there).
+    """
+    try:
+        if resolve_backend(backend) == 'tesserocr':
+            import tesserocr
+            return frozenset(tesserocr.get_languages()[1])
+        import pytesseract
+        return frozenset(pytesseract.get_languages(config=''))
+    except Exception as e:
+        logger.warning(f"[!] Could not list the installed Tesseract languages: {e}")
+        return None
+
+
+def get_ocr_engine(lang='eng', backend='auto'):
+    """
+    Returns the process-wide OCR engine for a language, creating it on first use.
+    Engines are cached so loaded language data is shared across pages and documents.
+
+    Args:
+        lang (str): Tesseract language code(s), e.g. 'eng' or 'eng+fra'.
+        backend (str): 'auto' (tesserocr if installed), 'tesserocr' or 'pytesseract'.
+            The MAJD_OCR_BACKEND environment variable overrides 'auto'.
+
+    Returns:
+        TesserocrEngine | PytesseractEngine: Engine exposing `image_to_string(image)`,
+        `image_to_string_with_confidence(image)` and, for lang=OSD_LANG,
+        `detect_orientation_script(image)`.
+    """
+    backend = resolve_backend(backend)
+
+    key = (backend, lang)
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = TesserocrEngine(lang) if backend == 'tesserocr' else PytesseractEngine(lang)
+            _engines[key] = engine
+    return engine
+
+
+def shutdown_ocr_engines():
+    """
+    Releases all cached Tesseract instances. Registered to run at interpreter exit.
+    """
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.close()
+        _engines.clear()
+
+
+atexit.register(shutdown_ocr_engines)
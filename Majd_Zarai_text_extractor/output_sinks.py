@@ -0,0 +1,263 @@
+import os
+import gzip
+import json
+import logging
+import importlib.util
+
+from Majd_Zarai_text_extractor.text_writer import atomic_open
+
+# ─────────────────────────────────────────────────────────────
+#  OUTPUT SINKS — Many documents packed into compressed shards
+# ─────────────────────────────────────────────────────────────
+
+logger = logging.getLogger(__name__)
+
+# zstandard is optional: gzip (standard library) is used when it is missing
+HAS_ZSTD = importlib.util.find_spec("zstandard") is not None
+
+SHARD_PREFIX = "majd_zarai_texts"
+SHARD_MAX_BYTES = 256 * 1024 * 1024   # compressed bytes per shard before a new one is started
+BLOCK_SIZE = 1024 * 1024              # uncompressed bytes of JSON Lines per compressed block
+COMPRESSION_SUFFIXES = {"zstd": ".zst", "gzip": ".gz", "none": ""}
+INDEX_SUFFIX = ".index.jsonl"
+PART_SUFFIX = ".part"
+
+
+def resolve_compression(compression="auto"):
+    """
+    Turns the user-facing compression setting into 'zstd', 'gzip' or 'none'.
+
+    Args:
+        compression (str): 'auto' (zstd if installed, else gzip), 'zstd', 'gzip' or 'none'.
+
+    Returns:
+        str: The codec to use.
+
+    Raises:
+        ValueError: For an unknown codec, or 'zstd' without the zstandard package.
+    """
+    if compression == "auto":
+        return "zstd" if HAS_ZSTD else "gzip"
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unknown compression '{compression}' (expected auto, zstd, gzip or none).")
+    if compression == "zstd" and not HAS_ZSTD:
+        raise ValueError("zstd compression needs the 'zstandard' package (pip install zstandard).")
+    return compression
+
+
+def _codec(compression, level=None):
+    """
+    Returns (compress, decompress) functions for one block.
+    """
+    if compression == "zstd":
+        import zstandard
+        return (zstandard.ZstdCompressor(level=level or 3).compress,
+                zstandard.ZstdDecompressor().decompress)
+    if compression == "gzip":
+        return (lambda data: gzip.compress(data, compresslevel=level or 6, mtime=0),
+                gzip.decompress)
+    return bytes, bytes
+
+
+def _compression_of(shard_name):
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if suffix and shard_name.endswith(suffix):
+            return compression
+    return "none"
+
+
+class ShardedJsonlSink:
+    """
+    Packs extracted documents into a few large, compressed JSON Lines shards
+    instead of writing one small text file per document.
+
+    Each document is one line, {"id": ..., <metadata>..., "text": ...}. Lines are
+    grouped into blocks of about `block_size` bytes and every block is compressed
+    on its own (one gzip member or zstd frame), so:
+
+    - a shard is still an ordinary .jsonl.gz / .jsonl.zst file that zcat,
+      zstdcat or pandas read from start to end;
+    - a single document is read back by seeking to its block and decompressing
+      only that block, using the shard's offset index (see ShardReader).
+
+    A shard is written as `<name>.part` and only renamed, next to its
+    `<name>.index.jsonl`, when it is full or the sink is closed: a crash never
+    leaves a truncated shard that looks complete. `on_seal(shard_name, ids)` is
+    called once a shard and its index are safely on disk.
+    """
+
+    def __init__(self, output_dir, prefix=SHARD_PREFIX, compression="auto", shard_max_bytes=SHARD_MAX_BYTES,
+                 block_size=BLOCK_SIZE, level=None, on_seal=None):
+        self.output_dir = output_dir
+        self.prefix = prefix
+        self.compression = resolve_compression(compression)
+        self.shard_max_bytes = shard_max_bytes
+        self.block_size = block_size
+        self.on_seal = on_seal
+        self._compress, _ = _codec(self.compression, level)
+
+        self.shard_name = None
+        self.document_count = 0
+        self.shard_count = 0
+        self._file = None
+        self._offset = 0
+        self._block = []
+        self._block_ids = []
+        self._block_bytes = 0
+        self._index = []
+        self._next_number = self._first_free_number()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _first_free_number(self):
+        # New runs add shards after the existing ones; unfinished ones from a crash are discarded
+        os.makedirs(self.output_dir, exist_ok=True)
+        numbers = [-1]
+        for name in os.listdir(self.output_dir):
+            if not name.startswith(f"{self.prefix}_"):
+                continue
+            if name.endswith(PART_SUFFIX):
+                logger.warning(f"[!] Removing unfinished shard from an interrupted run: {name}")
+                os.remove(os.path.join(self.output_dir, name))
+                continue
+            number = name[len(self.prefix) + 1:].split(".", 1)[0]
+            if number.isdigit():
+                numbers.append(int(number))
+        return max(numbers) + 1
+
+    def _open_shard(self):
+        suffix = COMPRESSION_SUFFIXES[self.compression]
+        self.shard_name = f"{self.prefix}_{self._next_number:05d}.jsonl{suffix}"
+        self._next_number += 1
+        self._file = open(os.path.join(self.output_dir, self.shard_name + PART_SUFFIX), "wb")
+        self._offset = 0
+        self._index = []
+
+    def write(self, doc_id, text, **metadata):
+        """
+        Appends one document.
+
+        Args:
+            doc_id (str): Unique document ID (the key used by ShardReader.read).
+            text (str): Extracted text.
+            **metadata: Extra JSON-serialisable fields stored with the text (source, format...).
+
+        Returns:
+            str: Name of the shard the document goes to.
+        """
+        if self._file is None:
+            self._open_shard()
+
+        record = {"id": doc_id, **metadata, "text": text}
+        line = (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        self._block.append(line)
+        self._block_ids.append(doc_id)
+        self._block_bytes += len(line)
+        self.document_count += 1
+
+        shard_name = self.shard_name
+        if self._block_bytes >= self.block_size:
+            self._flush_block()
+            if self._offset >= self.shard_max_bytes:
+                self._seal_shard()
+        return shard_name
+
+    def _flush_block(self):
+        if not self._block:
+            return
+        data = self._compress(b"".join(self._block))
+        self._file.write(data)
+        for line_number, doc_id in enumerate(self._block_ids):
+            self._index.append({"id": doc_id, "offset": self._offset, "length": len(data), "line": line_number})
+        self._offset += len(data)
+        self._block, self._block_ids, self._block_bytes = [], [], 0
+
+    def _seal_shard(self):
+        self._flush_block()
+        self._file.close()
+        self._file = None
+
+        shard_path = os.path.join(self.output_dir, self.shard_name)
+        os.replace(shard_path + PART_SUFFIX, shard_path)
+        with atomic_open(shard_path + INDEX_SUFFIX) as f:
+            for entry in self._index:
+                f.write(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+        self.shard_count += 1
+        logger.info(f"[✓] Shard written: {shard_path} ({len(self._index)} document(s), "
+                    f"{self._offset / 1024 ** 2:.1f} MB)")
+        if self.on_seal is not None:
+            self.on_seal(self.shard_name, [entry["id"] for entry in self._index])
+
+    def close(self):
+        """
+        Seals the current shard (if any) and writes its index.
+        """
+        if self._file is not None:
+            self._seal_shard()
+
+
+class ShardReader:
+    """
+    Random access to the documents of a folder of shards written by ShardedJsonlSink.
+
+    The offset indexes are loaded once; `read(doc_id)` then costs one seek and
+    the decompression of a single block. When a document appears in several
+    shards (re-extracted by a later run) the newest shard wins.
+    """
+
+    def __init__(self, output_dir, prefix=SHARD_PREFIX):
+        self.output_dir = output_dir
+        self._entries = {}
+        self._codecs = {}
+        self._last_block = (None, None)  # (shard, offset), lines: consecutive reads often share a block
+
+        for name in sorted(os.listdir(output_dir)):
+            if not (name.startswith(f"{prefix}_") and name.endswith(INDEX_SUFFIX)):
+                continue
+            shard_name = name[:-len(INDEX_SUFFIX)]
+            with open(os.path.join(output_dir, name), "r", encoding="utf-8") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    entry["shard"] = shard_name
+                    self._entries[entry["id"]] = entry
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._entries
+
+    def ids(self):
+        """
+        Returns every document ID in the shards.
+        """
+        return list(self._entries)
+
+    def read(self, doc_id):
+        """
+        Returns the stored record ({"id", <metadata>, "text"}) of one document.
+
+        Raises:
+            KeyError: If no shard contains `doc_id`.
+        """
+        entry = self._entries[doc_id]
+        key = (entry["shard"], entry["offset"])
+
+        if self._last_block[0] == key:
+            lines = self._last_block[1]
+        else:
+            compression = _compression_of(entry["shard"])
+            if compression not in self._codecs:
+                self._codecs[compression] = _codec(compression)[1]
+            with open(os.path.join(self.output_dir, entry["shard"]), "rb") as f:
+                f.seek(entry["offset"])
+                data = f.read(entry["length"])
+            lines = self._codecs[compression](data).split(b"\n")
+            self._last_block = (key, lines)
+
+        return json.loads(lines[entry["line"]])
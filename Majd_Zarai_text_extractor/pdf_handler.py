@@ -1,20 +1,23 @@
 import fitz  # PyMuPDF for reading PDFs
-import pytesseract  # OCR engine for scanned documents
-from pdf2image import convert_from_path  # Converts PDF pages to images
+from Majd_Zarai_text_extractor.ocr_engine import get_ocr_engine, ocr_thread_count, resolve_backend  # Shared Tesseract backend for scanned documents
+from Majd_Zarai_text_extractor.lang_routing import AUTO_LANG, LanguageRouter, ocr_image  # Per-page OCR languages
+from PIL import Image  # In-memory page images for OCR
 import tempfile  # For creating temporary directories
 import os 
 
 # ─────────────────────────────────────────────────────────────
-#  ORIGINAL FUNCTION — Core working solution (no changes)
+#  ORIGINAL FUNCTION — Core working solution (OCR language now 'auto' by default)
 # ─────────────────────────────────────────────────────────────
 
-def extract_text_from_pdf(file_path):
+def extract_text_from_pdf(file_path, lang=AUTO_LANG):
     """
     Extracts text from a PDF file. If the file has no machine-readable text,
-    OCR is automatically applied using pytesseract.
+    OCR is automatically applied using Tesseract.
 
     Args:
         file_path (str): Path to the PDF file.
+        lang (str): Tesseract language(s) for OCR, or 'auto' to detect the
+            script, language and rotation of each page (see lang_routing).
 
     Returns:
         str: The extracted text (machine or OCR).
@@ -30,28 +33,38 @@ def extract_text_from_pdf(file_path):
                 full_text += text + "\n"
                 requires_ocr = False  # Found extractable text
             else:
-                print(f"[INFO] No extractable text on page {page_number + 1}, may fallback to OCR...")
+                logger.info(f"No extractable text on page {page_number + 1}, may fallback to OCR...")
 
         # If none of the pages had extractable text, fallback to OCR
         if requires_ocr:
-            print(f"[INFO] Applying OCR on scanned PDF: {file_path}")
+            logger.info(f"Applying OCR on scanned PDF: {file_path}")
+            from pdf2image import convert_from_path  # Converts PDF pages to images (imported only when needed)
             with tempfile.TemporaryDirectory() as temp_dir:
                 images = convert_from_path(file_path, dpi=300, fmt='png', output_folder=temp_dir)
+                router = LanguageRouter() if lang == AUTO_LANG else None
                 for i, image in enumerate(images):
-                    ocr_text = pytesseract.image_to_string(image, lang='eng')
+                    ocr_text = ocr_image(image, lang, dpi=300, router=router)
                     full_text += f"\n[OCR - Page {i + 1}]\n{ocr_text}"
 
         return full_text.strip()
 
     except Exception as e:
-        print(f"[ERROR] Failed to extract PDF: {file_path} – {e}")
+        logger.error(f"Failed to extract PDF: {file_path} – {e}")
         return ""
 
 # ─────────────────────────────────────────────────────────────
 #  BONUS FUNCTION — Enhanced, production-grade version
 # ─────────────────────────────────────────────────────────────
 
+import json
+import hashlib
 import logging
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from Majd_Zarai_text_extractor.metrics import stage
+from Majd_Zarai_text_extractor.pdf_layout import LayoutExtractor
 
 try:
     from tqdm import tqdm  #  progress bar for multi-page PDFs
@@ -61,62 +74,466 @@ except ImportError:
 
 # Configure a basic logger for this module
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-def extract_text_from_pdf_enhanced(file_path, lang='eng'):
+# Resolution used to rasterise pages before OCR
+OCR_DPI = 300
+
+# Adaptive OCR: first pass resolution, and the mean word confidence (0-100)
+# below which a page is re-rendered at OCR_DPI and OCR'd again
+LOW_OCR_DPI = 150
+MIN_OCR_CONFIDENCE = 80
+
+# Page-cache value for a low-DPI render whose OCR confidence was too low
+RETRY_MARKER = "\0retry"
+
+# Per-page OCR decision thresholds (see classify_page). Character counts are for
+# an A4 page and are scaled by the actual page area.
+OCR_THRESHOLDS = {
+    "min_native_chars": 200,     # at least this much native text: never OCR
+    "min_image_coverage": 0.02,  # text-less page whose images cover less than this is treated as blank
+    "scan_image_coverage": 0.6,  # images covering this much of a page with little text mean a scan
+    "min_drawing_coverage": 0.02,  # ...unless filled vector paths cover this much (text converted to outlines)
+    "min_drawing_paths": 10,       # ...in at least this many paths (not one background rectangle)
+}
+
+A4_AREA = 595 * 842  # in PDF points
+
+
+def _image_coverage(page):
     """
-    Enhanced version of PDF extraction with per-page OCR, logging, and progress tracking.
+    Fraction of the page area covered by images (overlaps are not merged,
+    so the sum is capped at 1.0).
+    """
+    page_rect = page.rect
+    page_area = abs(page_rect) or 1
+    covered = 0
+    for info in page.get_image_info():
+        covered += abs(fitz.Rect(info["bbox"]) & page_rect)
+    return min(covered / page_area, 1.0)
 
-    Features:
-    - Attempts to extract machine-readable text with PyMuPDF.
-    - Falls back to Tesseract OCR per page if text is not available.
-    - Logs detailed statistics and handles errors gracefully.
-    - Optional: shows a progress bar if tqdm is installed.
+
+def _drawing_coverage(page):
+    """
+    Number of filled vector paths on the page and the fraction of the page
+    area their bounding boxes cover (capped at 1.0). Text converted to
+    outlines and vector-traced scans show up here and not as text or images.
+    """
+    page_rect = page.rect
+    page_area = abs(page_rect) or 1
+    paths = 0
+    covered = 0
+    for drawing in page.get_drawings():
+        if drawing.get("fill") is None:
+            continue  # strokes only: rules, borders, frames
+        paths += 1
+        covered += abs(drawing["rect"] & page_rect)
+    return paths, min(covered / page_area, 1.0)
+
+
+def classify_page(page, text, thresholds=None):
+    """
+    Decides whether a page is worth sending to OCR, using cheap PyMuPDF data
+    (native character count, image coverage and page size; the vector paths
+    are only listed for pages with neither text nor images).
+
+    - Plenty of native text                        -> native, no OCR
+    - No text, (almost) no images or filled paths  -> blank, no OCR
+    - No text but images on the page               -> OCR
+    - No text but many filled vector paths         -> OCR (text converted to outlines, vector scan)
+    - A little text on a page covered by an image  -> OCR (scan with a text header/stamp)
+    - Otherwise                                    -> native
 
     Args:
-        file_path (str): Path to the input PDF file.
-        lang (str): Language code for OCR (default: 'eng').
+        page (fitz.Page): Page object.
+        text (str): The page's native text (`page.get_text()`).
+        thresholds (dict | None): Overrides for OCR_THRESHOLDS.
 
     Returns:
-        str: The extracted and concatenated full text from the PDF.
+        tuple[str, str]: Decision ('native', 'ocr' or 'skip') and a short reason.
+    """
+    limits = {**OCR_THRESHOLDS, **(thresholds or {})}
+    chars = len(text.strip())
+    area_ratio = abs(page.rect) / A4_AREA
+    min_chars = limits["min_native_chars"] * area_ratio
+
+    if chars >= min_chars:
+        return "native", f"{chars} native chars"
+
+    coverage = _image_coverage(page)
+    if chars == 0:
+        if coverage >= limits["min_image_coverage"]:
+            return "ocr", f"no text layer, images cover {coverage:.0%} of the page"
+        paths, drawn = _drawing_coverage(page)
+        if paths >= limits["min_drawing_paths"] and drawn >= limits["min_drawing_coverage"]:
+            return "ocr", f"no text layer, {paths} filled vector paths cover {drawn:.0%} of the page"
+        return "skip", f"no text, images cover {coverage:.0%} and vector paths {drawn:.0%} of the page"
+
+    if coverage >= limits["scan_image_coverage"]:
+        return "ocr", f"only {chars} native chars on a page {coverage:.0%} covered by images"
+    return "native", f"{chars} native chars, images cover {coverage:.0%}"
+
+def render_page_to_image(page, dpi=300):
     """
+    Rasterises an already-open PyMuPDF page straight into memory.
+    No poppler process, no re-parse of the PDF and no PNG round-trip on disk.
+
+    Args:
+        page (fitz.Page): Page object from an open document.
+        dpi (int): Rendering resolution.
+
+    Returns:
+        PIL.Image.Image: RGB image of the page.
+    """
+    pix = page.get_pixmap(dpi=dpi, alpha=False)
+    return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+
+def render_page_with_pdf2image(file_path, page_number, dpi=300):
+    """
+    Legacy rendering path: re-opens the PDF through poppler for one page and
+    round-trips it through a PNG in a temporary directory. Kept for comparison
+    in benchmarks/bench_ocr_render.py.
+
+    Args:
+        file_path (str): Path to the PDF file.
+        page_number (int): Zero-based page index.
+        dpi (int): Rendering resolution.
+
+    Returns:
+        PIL.Image.Image: Image of the page.
+    """
+    from pdf2image import convert_from_path
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        image = convert_from_path(
+            file_path,
+            dpi=dpi,
+            fmt='png',
+            output_folder=temp_dir,
+            first_page=page_number + 1,
+            last_page=page_number + 1
+        )[0]
+        image.load()  # read pixels before the temp file disappears
+    return image
+
+
+@contextmanager
+def _ocr_pool(max_workers):
+    """
+    Thread pool for OCR pages. On a normal exit it waits for its work like
+    `with ThreadPoolExecutor()`; if the block raises (a per-file timeout, or a
+    consumer that stops reading the generator), pages still queued are
+    cancelled and the ones being OCR'd are not waited for.
+    """
+    pool = ThreadPoolExecutor(max_workers=max_workers)
     try:
+        yield pool
+    except BaseException:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown(wait=True)
+
+
+def _ocr_page(ocr_engine, image, page_number, dpi, page_cache=None, cache_settings=None,
+              with_confidence=False, min_confidence=None, preprocess_steps=None, router=None, hint=None,
+              route=None):
+    """
+    Runs Tesseract on a rendered page. Executed on the OCR worker pool.
+
+    When a page cache is given, the page is looked up by a hash of its rendered
+    pixels first, so an unchanged page in a revised document is not OCR'd again.
+
+    Args:
+        ocr_engine: Engine from `get_ocr_engine`, already bound to the OCR language
+            (None when a `router` picks the language).
+        image (PIL.Image.Image): Rendered page.
+        page_number (int): Zero-based page index.
+        dpi (int): Resolution the page was rendered at.
+        page_cache (ExtractionCache | None): Cache of OCR text per rendered page.
+        cache_settings (dict | None): OCR settings that are part of the cache key.
+        with_confidence (bool): Also measure Tesseract's mean word confidence.
+        min_confidence (float | None): If set, flag the page for a higher-DPI
+            retry when the confidence is below it (or no words were found).
+        preprocess_steps (dict | None): If set, clean the page up with
+            `preprocess_image` (these are its step options) before OCR.
+        router (LanguageRouter | None): Picks the page's OCR languages and turns
+            it upright before preprocessing and OCR.
+        hint (str | None): Language of the page's (or document's) native text.
+        route (Route | None): Routing decided by an earlier pass over this page.
+
+    Returns:
+        dict: 'text' (prefixed with its `[OCR - Page N]` marker), 'from_cache',
+        'dpi', 'confidence', 'retry' and, when routed, 'route'.
+    """
+    result = {"dpi": dpi, "confidence": None, "from_cache": False, "retry": False, "route": route}
+
+    key = None
+    ocr_text = None
+    if page_cache is not None:
+        key = page_cache.make_key(hashlib.sha256(image.tobytes()).hexdigest(), {**cache_settings, "dpi": dpi})
+        ocr_text = page_cache.get(key)
+        if ocr_text == RETRY_MARKER:
+            # This low-DPI render was already found too uncertain
+            result["retry"] = True
+            return result
+        result["from_cache"] = ocr_text is not None
+
+    if ocr_text is None:
+        if router is not None:
+            image, result["route"] = router.prepare(image, dpi, hint, route)
+            ocr_engine = get_ocr_engine(result["route"].lang, router.backend)
+
+        if preprocess_steps is not None:
+            from Majd_Zarai_text_extractor.preprocess import preprocess_image  # NumPy, loaded only when enabled
+            with stage("preprocess"):
+                image, _ = preprocess_image(image, preprocess_steps)
+
+        with stage("ocr"):
+            if with_confidence or min_confidence is not None:
+                ocr_text, result["confidence"] = ocr_engine.image_to_string_with_confidence(image)
+            else:
+                ocr_text = ocr_engine.image_to_string(image)
+        ocr_text = ocr_text.strip()
+
+        if min_confidence is not None:
+            result["retry"] = result["confidence"] is None or result["confidence"] < min_confidence
+
+        # A low-DPI pass that was not good enough is remembered as such, not as text
+        if page_cache is not None:
+            page_cache.put(key, RETRY_MARKER if result["retry"] else ocr_text)
+
+    result["text"] = f"\n[OCR - Page {page_number + 1}]\n{ocr_text}"
+    return result
+
+
+def iter_text_from_pdf(file_path, lang=AUTO_LANG, max_workers=None, dpi=OCR_DPI, page_cache=None,
+                       ocr_thresholds=None, adaptive_dpi=False, low_dpi=LOW_OCR_DPI,
+                       min_confidence=MIN_OCR_CONFIDENCE, preprocess=False, image_writer=None, stats=None,
+                       progress=None, layout=False):
+    """
+    Streaming version of `extract_text_from_pdf_enhanced`: yields the text of
+    each page, in page order, as soon as it (and every page before it) is ready.
+
+    Only the OCR pages still in flight and the native pages queued behind them
+    are held in memory, never the whole document. Errors are raised, not logged.
+
+    Args:
+        file_path (str): Path to the input PDF file.
+        lang (str): Tesseract language(s) for OCR, or 'auto' (default) to pick the
+            languages of each OCR page from its native text or a low-DPI
+            orientation/script pass, and turn rotated pages upright (see lang_routing).
+        max_workers (int | None): Concurrent OCR pages (default: the process's OCR
+            thread budget, see ocr_engine.ocr_thread_count).
+        dpi (int): Rendering resolution for OCR pages (default: 300).
+        page_cache (ExtractionCache | None): Per-page OCR cache.
+        ocr_thresholds (dict | None): Overrides for OCR_THRESHOLDS (see classify_page).
+        adaptive_dpi (bool): OCR at `low_dpi` first and re-render at `dpi` only
+            the pages whose mean word confidence is below `min_confidence`.
+        low_dpi (int): Resolution of the first, cheap pass in adaptive mode.
+        min_confidence (float): Confidence (0-100) needed to keep a low-DPI result.
+        preprocess (bool | dict): Grayscale, crop, deskew and binarise OCR pages
+            before Tesseract sees them; a dict overrides PREPROCESS_STEPS.
+        image_writer (PdfImageWriter | None): Saves each page's embedded images
+            during the same page walk (the caller closes it).
+        stats (dict | None): Filled with page counts once the document is done.
+        progress (callable | None): Called as progress(pages_done, total_pages)
+            each time a page is finished (native, skipped or OCR'd).
+        layout (bool): Read native text in reading order, without running
+            headers and footers, and with tables as tab-separated rows
+            (see pdf_layout.LayoutExtractor) instead of `page.get_text()`.
+
+    Yields:
+        str: Native page text, or `[OCR - Page N]`-prefixed OCR text.
+    """
+    with stage("open"):
         doc = fitz.open(file_path)
+    with doc:
         total_pages = len(doc)
-        full_text = []
+        pending = deque()  # page texts, or slots for pages still being OCR'd
         ocr_pages = 0
         native_pages = 0
+        skipped_pages = 0
+        cache_hits = 0
+        retried_pages = 0
+        done_pages = 0
+
+        def page_done():
+            nonlocal done_pages
+            done_pages += 1
+            if progress is not None:
+                progress(done_pages, total_pages)
 
         # Use tqdm to show progress if installed
         iterator = tqdm(enumerate(doc), total=total_pages, desc="Processing PDF") if USE_TQDM else enumerate(doc)
 
-        for page_number, page in iterator:
-            # Attempt to extract machine-readable text
-            text = page.get_text()
-            if text.strip():
-                full_text.append(text)
-                native_pages += 1
-            else:
-                # Log and fallback to OCR for this page
-                logger.info(f"Page {page_number + 1} has no extractable text. Applying OCR.")
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    image = convert_from_path(
-                        file_path,
-                        dpi=300,
-                        fmt='png',
-                        output_folder=temp_dir,
-                        first_page=page_number + 1,
-                        last_page=page_number + 1
-                    )[0]
-                    ocr_text = pytesseract.image_to_string(image, lang=lang)
-                    full_text.append(f"\n[OCR - Page {page_number + 1}]\n{ocr_text.strip()}")
+        workers = max_workers or ocr_thread_count()
+        in_flight = {}  # Future -> slot dict {"page": n, "result": ...}
+        router = LanguageRouter() if lang == AUTO_LANG else None
+        ocr_engine = get_ocr_engine(lang) if router is None else None
+        cache_settings = {"ocr": resolve_backend(), "lang": lang}
+        layout_extractor = LayoutExtractor() if layout else None
+
+        preprocess_steps = None
+        if preprocess:
+            from Majd_Zarai_text_extractor.preprocess import PREPROCESS_STEPS
+            preprocess_steps = {**PREPROCESS_STEPS, **(preprocess if isinstance(preprocess, dict) else {})}
+            cache_settings["preprocess"] = preprocess_steps
+
+        with _ocr_pool(workers) as ocr_pool:
+
+            def submit(slot, render_dpi, retry_below=None):
+                # PyMuPDF is not thread-safe, so pages are rendered here and only OCR runs in the pool
+                with stage("render"):
+                    image = render_page_to_image(doc[slot["page"]], dpi=render_dpi)
+                future = ocr_pool.submit(_ocr_page, ocr_engine, image, slot["page"], render_dpi,
+                                         page_cache, cache_settings, adaptive_dpi, retry_below,
+                                         preprocess_steps, router, slot.get("hint"), slot.get("route"))
+                in_flight[future] = slot
+
+            def collect_done():
+                # Store finished results; low-confidence low-DPI pages go back in at full DPI
+                nonlocal cache_hits, retried_pages
+                for future in [f for f in in_flight if f.done()]:
+                    slot = in_flight.pop(future)
+                    result = future.result()
+                    # A full-DPI retry keeps the languages and rotation of the first pass
+                    route = slot["route"] = result["route"]
+                    if result["retry"]:
+                        retried_pages += 1
+                        submit(slot, dpi)
+                        continue
+                    cache_hits += result["from_cache"]
+                    page_done()
+                    if adaptive_dpi:
+                        confidence = result["confidence"]
+                        logger.info(f"Page {slot['page'] + 1}: OCR at {result['dpi']} DPI, confidence "
+                                    f"{'n/a' if confidence is None else f'{confidence:.1f}'}.")
+                    if route is not None:
+                        logger.info(f"Page {slot['page'] + 1}: OCR in '{route.lang}' ({route.reason}"
+                                    f"{f', rotated {route.rotate}°' if route.rotate else ''}).")
+                    slot["result"] = result["text"]
+
+            def head_ready():
+                return pending and (not isinstance(pending[0], dict) or "result" in pending[0])
+
+            for page_number, page in iterator:
+                if image_writer is not None:
+                    image_writer.add_page(doc, page_number)
+
+                # Attempt to extract machine-readable text, then decide whether OCR is worth it
+                with stage("native_text"):
+                    text = layout_extractor.page_text(page) if layout_extractor else page.get_text()
+                    decision, reason = classify_page(page, text, ocr_thresholds)
+
+                if decision == "native":
+                    logger.debug(f"Page {page_number + 1}: native text ({reason}).")
+                    if router is not None:
+                        router.observe(text)
+                    if text.strip():
+                        pending.append(text)
+                    native_pages += 1
+                    page_done()
+                elif decision == "skip":
+                    logger.info(f"Page {page_number + 1}: skipping OCR ({reason}).")
+                    skipped_pages += 1
+                    page_done()
+                else:
+                    # Log and hand this page to the OCR pool
+                    logger.info(f"Page {page_number + 1}: applying OCR ({reason}).")
+
+                    # Bound the number of rendered pages held in memory
+                    while len(in_flight) >= 2 * workers:
+                        wait(list(in_flight), return_when=FIRST_COMPLETED)
+                        collect_done()
+
+                    slot = {"page": page_number}
+                    if router is not None:
+                        slot["hint"] = router.hint(text)
+                    if adaptive_dpi:
+                        submit(slot, low_dpi, retry_below=min_confidence)
+                    else:
+                        submit(slot, dpi)
+                    pending.append(slot)
                     ocr_pages += 1
 
-        # Summary log
-        logger.info(f"Extraction complete: {native_pages} native pages, {ocr_pages} OCR pages.")
+                # Emit every page at the head of the queue that is ready, keeping page order
+                collect_done()
+                while head_ready():
+                    part = pending.popleft()
+                    yield part["result"] if isinstance(part, dict) else part
+
+            # Wait for outstanding OCR pages
+            while pending:
+                if not head_ready():
+                    wait(list(in_flight), return_when=FIRST_COMPLETED)
+                    collect_done()
+                    continue
+                part = pending.popleft()
+                yield part["result"] if isinstance(part, dict) else part
+
+    if stats is not None:
+        stats.update(pages=total_pages, native_pages=native_pages, ocr_pages=ocr_pages,
+                     skipped_pages=skipped_pages, ocr_cache_hits=cache_hits, ocr_retries=retried_pages)
+        if router is not None:
+            stats.update(ocr_languages=dict(router.routes))
+        if layout_extractor is not None:
+            stats.update(tables=layout_extractor.table_count, running_lines_removed=layout_extractor.removed_lines)
+
+    # Summary log
+    logger.info(f"Extraction complete: {native_pages} native pages, {ocr_pages} OCR pages, "
+                f"{skipped_pages} blank page(s) skipped.")
+    if layout_extractor is not None:
+        logger.info(f"Layout: {layout_extractor.table_count} table(s) found, "
+                    f"{layout_extractor.removed_lines} running header/footer line(s) removed.")
+    if adaptive_dpi:
+        logger.info(f"Adaptive OCR: {ocr_pages - retried_pages} page(s) kept at {low_dpi} DPI, "
+                    f"{retried_pages} re-OCR'd at {dpi} DPI.")
+    if page_cache is not None:
+        logger.info(f"OCR page cache: {cache_hits} hit(s), {ocr_pages - cache_hits} miss(es).")
+    if router is not None and router.routes:
+        logger.info("OCR languages: " + ", ".join(f"{lang} x{count}" for lang, count in router.routes.most_common()))
+
+
+def extract_text_from_pdf_enhanced(file_path, lang=AUTO_LANG, max_workers=None, dpi=OCR_DPI, page_cache=None,
+                                   ocr_thresholds=None, adaptive_dpi=False, preprocess=False, layout=False):
+    """
+    Enhanced version of PDF extraction with per-page OCR, logging, and progress tracking.
+
+    Features:
+    - Attempts to extract machine-readable text with PyMuPDF.
+    - Decides per page whether OCR is needed (no text layer, or a scan with
+      only a thin text header) and skips blank pages.
+    - OCR pages run on a worker pool while native pages keep being read;
+      the output is reassembled in page order.
+    - Logs detailed statistics and handles errors gracefully.
+    - Optional: shows a progress bar if tqdm is installed.
 
-        return "\n".join(full_text).strip()
+    Args:
+        file_path (str): Path to the input PDF file.
+        lang (str): Tesseract language(s) for OCR, or 'auto' (default) to detect
+            them per page (see iter_text_from_pdf).
+        max_workers (int | None): Concurrent OCR pages (default: the process's OCR
+            thread budget, see ocr_engine.ocr_thread_count).
+        dpi (int): Rendering resolution for OCR pages (default: 300).
+        page_cache (ExtractionCache | None): Per-page OCR cache; only pages whose
+            rendered content changed are sent to Tesseract.
+        ocr_thresholds (dict | None): Overrides for OCR_THRESHOLDS (see classify_page).
+        adaptive_dpi (bool): OCR at LOW_OCR_DPI first and retry at `dpi` only the
+            pages whose Tesseract confidence is below MIN_OCR_CONFIDENCE.
+        preprocess (bool | dict): Clean pages up before OCR (see preprocess.PREPROCESS_STEPS).
+        layout (bool): Layout-aware native text: reading order, no running
+            headers/footers, tables as tab-separated rows.
 
+    Returns:
+        str: The extracted and concatenated full text from the PDF.
+    """
+    try:
+        return "\n".join(iter_text_from_pdf(file_path, lang, max_workers, dpi, page_cache,
+                                                  ocr_thresholds, adaptive_dpi,
+                                                  preprocess=preprocess, layout=layout)).strip()
+
+    except TimeoutError:
+        raise  # the batch's per-file limit, not an extraction failure
     except Exception as e:
         logger.error(f"Enhanced PDF extraction failed for {file_path}: {e}")
         return ""
@@ -128,46 +545,241 @@ def extract_text_from_pdf_enhanced(file_path, lang='eng'):
 #  BONUS FUNCTION — extract images from pdf
 # ─────────────────────────────────────────────────────────────
 
-def extract_images_from_pdf(file_path, output_root_dir='extracted_texts/majd_extracted_images_from_pdf'):
+IMAGE_ROOT_DIR = 'extracted_texts/majd_extracted_images_from_pdf'
+IMAGE_MANIFEST = 'manifest.json'
+
+# Images are written on this many threads while the main thread keeps decoding
+IMAGE_WRITE_WORKERS = 4
+
+
+def image_dir_for(file_path, output_root_dir=IMAGE_ROOT_DIR, display_name=None, name=None):
     """
-    Extracts and saves all embedded images from a PDF using PyMuPDF.
-    
+    Folder that `extract_images_from_pdf` writes a document's images to.
+
     Args:
-        file_path (str): Full path to the input PDF file.
-        output_root_dir (str): Root folder where images will be stored.
-    
+        file_path (str): Path to the PDF file.
+        output_root_dir (str): Root folder where images are stored.
+        display_name (str | None): Original file name, when `file_path` is a
+            temporary copy (e.g. an upload in the web interface).
+        name (str | None): Folder name to use instead of the file's stem, e.g.
+            the content hash of an upload, so that two different files with
+            the same name never share a folder.
+
     Returns:
-        int: Number of images extracted.
+        str: `<output_root_dir>/<name or pdf_name>_images`.
     """
-    try:
-        doc = fitz.open(file_path)
-        pdf_name = os.path.splitext(os.path.basename(file_path))[0]
-        
-        # Create per-document image folder
-        image_dir = os.path.join(output_root_dir, f"{pdf_name}_images")
-        os.makedirs(image_dir, exist_ok=True)
+    pdf_name = name or os.path.splitext(os.path.basename(display_name or file_path))[0]
+    return os.path.join(output_root_dir, f"{pdf_name}_images")
 
-        image_count = 0
 
-        for page_index in range(len(doc)):
-            images = doc.get_page_images(page_index)
+def _write_image(path, data):
+    with stage("images"), open(path, "wb") as f:
+        f.write(data)
 
-            for img_index, img in enumerate(images):
-                xref = img[0]  # reference to the image
-                base_image = doc.extract_image(xref)
-                image_bytes = base_image["image"]
-                image_ext = base_image["ext"]
-                image_filename = f"page{page_index+1}_img{img_index+1}.{image_ext}"
 
-                image_path = os.path.join(image_dir, image_filename)
-                with open(image_path, "wb") as f:
-                    f.write(image_bytes)
+class PdfImageWriter:
+    """
+    Saves the embedded images of one open PDF, page by page, each unique image once.
+
+    An image is identified by its xref (an object reused on many pages, like a
+    logo, is decoded once) and by a hash of its bytes (identical images stored
+    as separate objects are written once). Files keep the name of their first
+    occurrence, `page<N>_img<M>.<ext>`, and `manifest.json` maps every page to
+    the files it shows. Writes run on a small thread pool while the next
+    images are decoded.
+
+    Pages are fed by `extract_images_from_pdf`, or by the text page walk of
+    `iter_text_from_pdf` so a document is only opened and walked once. The
+    folder is created on the first page; closing a writer that saw no page
+    leaves nothing on disk. A failure is logged and stops image extraction
+    for the document without interrupting the text.
+
+    `source` is the document's file name for the log and the manifest
+    (default: the folder name without `_images`, plus `.pdf`).
+    """
 
-                image_count += 1
+    def __init__(self, image_dir, min_bytes=0, min_width=0, min_height=0, max_workers=IMAGE_WRITE_WORKERS,
+                 source=None):
+        self.image_dir = image_dir
+        self.source = source or f"{os.path.basename(image_dir)[:-len('_images')]}.pdf"
+        self.min_bytes = min_bytes
+        self.min_width = min_width
+        self.min_height = min_height
+        self.max_workers = max_workers
+        self.image_count = 0
+
+        self._pool = None
+        self._writes = set()
+        self._by_xref = {}   # xref -> manifest entry (None if filtered out)
+        self._by_hash = {}   # sha256 -> manifest entry
+        self._images = []
+        self._pages = {}
+        self._skipped = 0
+        self._repeats = 0
+        self._failed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def add_page(self, doc, page_index):
+        """
+        Saves the images of one page not seen on an earlier page.
+
+        Args:
+            doc (fitz.Document): The open document.
+            page_index (int): Zero-based page index.
+        """
+        if self._failed:
+            return
+        try:
+            with stage("images"):
+                self._add_page(doc, page_index)
+        except TimeoutError:
+            raise
+        except Exception as e:
+            self._failed = True
+            logger.error(f"[✗] Failed to extract images from PDF '{self.source}': {e}")
+
+    def _add_page(self, doc, page_index):
+        if self._pool is None:
+            os.makedirs(self.image_dir, exist_ok=True)
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        page_files = []
+        for img_index, img in enumerate(doc.get_page_images(page_index)):
+            xref, width, height = img[0], img[2], img[3]
+
+            if xref in self._by_xref:
+                entry = self._by_xref[xref]
+                self._repeats += entry is not None
+            elif width < self.min_width or height < self.min_height:
+                # Dimensions come from the page's image list, so nothing is decoded
+                entry = self._by_xref[xref] = None
+                self._skipped += 1
+            else:
+                entry = self._add_image(doc, xref, f"page{page_index+1}_img{img_index+1}")
+
+            if entry is None:
+                continue
+            if not entry["pages"] or entry["pages"][-1] != page_index + 1:
+                entry["pages"].append(page_index + 1)
+            if entry["file"] not in page_files:
+                page_files.append(entry["file"])
+
+        if page_files:
+            self._pages[str(page_index + 1)] = page_files
+
+    def _add_image(self, doc, xref, stem):
+        base_image = doc.extract_image(xref)
+        image_bytes = base_image["image"]
+        if len(image_bytes) < self.min_bytes:
+            self._by_xref[xref] = None
+            self._skipped += 1
+            return None
+
+        digest = hashlib.sha256(image_bytes).hexdigest()
+        entry = self._by_hash.get(digest)
+        if entry is not None:
+            self._repeats += 1
+        else:
+            image_filename = f"{stem}.{base_image['ext']}"
+            entry = {
+                "file": image_filename,
+                "sha256": digest,
+                "xrefs": [],
+                "width": base_image["width"],
+                "height": base_image["height"],
+                "bytes": len(image_bytes),
+                "pages": [],
+            }
+            self._by_hash[digest] = entry
+            self._images.append(entry)
+
+            # Bound the encoded images waiting in memory for the disk
+            if len(self._writes) >= 4 * self.max_workers:
+                done, self._writes = wait(self._writes, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            self._writes.add(self._pool.submit(
+                _write_image, os.path.join(self.image_dir, image_filename), image_bytes))
+
+        entry["xrefs"].append(xref)
+        self._by_xref[xref] = entry
+        return entry
+
+    def close(self):
+        """
+        Waits for pending writes and saves the manifest.
+
+        Returns:
+            int: Number of image files written.
+        """
+        if self._pool is None:
+            return self.image_count
+        try:
+            for future in self._writes:
+                future.result()
+        except TimeoutError:
+            raise
+        except Exception as e:
+            self._failed = True
+            logger.error(f"[✗] Failed to extract images from PDF '{self.source}': {e}")
+        finally:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+            self._writes = set()
+        if self._failed:
+            return self.image_count
+
+        manifest = {"source": self.source, "images": self._images, "pages": self._pages}
+        with open(os.path.join(self.image_dir, IMAGE_MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        self.image_count = len(self._images)
+        logger.info(f"[✓] Extracted {self.image_count} image(s) from '{self.source}' into: {self.image_dir} "
+                    f"({self._repeats} repeat(s) not rewritten, {self._skipped} filtered out)")
+        return self.image_count
+
+
+def extract_images_from_pdf(file_path, output_root_dir=IMAGE_ROOT_DIR, display_name=None,
+                            min_bytes=0, min_width=0, min_height=0, max_workers=IMAGE_WRITE_WORKERS,
+                            image_name=None):
+    """
+    Extracts and saves the embedded images of a PDF using PyMuPDF, each unique
+    image once, with a `manifest.json` mapping pages to images (see PdfImageWriter).
 
-        logger.info(f"[✓] Extracted {image_count} image(s) from '{pdf_name}.pdf' into: {image_dir}")
-        return image_count
+    Args:
+        file_path (str): Full path to the input PDF file.
+        output_root_dir (str): Root folder where images will be stored.
+        display_name (str | None): Original file name used for the folder when
+            `file_path` is a temporary copy.
+        min_bytes (int): Skip images whose encoded size is below this (e.g. tracking pixels).
+        min_width (int): Skip images narrower than this, in pixels.
+        min_height (int): Skip images shorter than this, in pixels.
+        max_workers (int): Threads writing image files.
+        image_name (str | None): Folder name instead of the file's stem (see image_dir_for).
 
+    Returns:
+        int: Number of image files written.
+    """
+    try:
+        image_dir = image_dir_for(file_path, output_root_dir, display_name, image_name)
+        writer = PdfImageWriter(image_dir, min_bytes, min_width, min_height, max_workers,
+                                source=os.path.basename(display_name or file_path))
+        with fitz.open(file_path) as doc, writer:
+            for page_index in range(len(doc)):
+                writer.add_page(doc, page_index)
+        return writer.image_count
+
+    except TimeoutError:
+        raise
     except Exception as e:
         logger.error(f"[✗] Failed to extract images from PDF '{file_path}': {e}")
         return 0
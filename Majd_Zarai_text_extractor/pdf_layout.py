@@ -0,0 +1,337 @@
+import re
+import statistics
+from collections import namedtuple
+
+import fitz  # PyMuPDF
+
+# ─────────────────────────────────────────────────────────────
+#  PDF LAYOUT — Reading order, running headers/footers, tables
+# ─────────────────────────────────────────────────────────────
+
+# Same text flags as page.get_text(): no images, ligatures and whitespace kept
+TEXT_FLAGS = fitz.TEXTFLAGS_TEXT
+
+MARGIN_BAND = 0.08        # top/bottom fraction of the page searched for running headers and footers
+COLUMN_GAP = 12           # points of white space between two columns of text
+CELL_GAP_EM = 1.5         # gap between two spans, in font sizes, that makes them separate cells
+ROW_GAP_EM = 1.5          # vertical gap between two table rows, in line heights, before the table ends
+MIN_TABLE_ROWS = 3
+MAX_CELL_SHARE = 0.3      # two-column rows are only a table if cells are narrower than this share of the text width
+
+# "7", "- 7 -", "Page 7", "page 7 of 12", "7/12"
+PAGE_NUMBER = re.compile(r"^[\s\-–—]*(page\s*)?\d+(\s*(/|of)\s*\d+)?[\s\-–—]*$", re.IGNORECASE)
+
+# One run of text on a line; a line split by a wide gap gives several segments (table cells)
+Segment = namedtuple("Segment", "x0 y0 x1 y1 text block line")
+Box = namedtuple("Box", "x0 y0 x1 y1 text")
+
+
+def _normalise(text):
+    # Running lines differ only by their numbers ("Page 3 of 9", "Report – 2024-05-03")
+    return re.sub(r"\d+", "#", " ".join(text.lower().split()))
+
+
+def page_segments(page):
+    """
+    Reads a page's text as positioned segments, in one `get_text('dict')` call.
+
+    Spans of a line are merged unless they are more than CELL_GAP_EM font
+    sizes apart, in which case they are kept as separate segments (the cells
+    of a table row set in a single line).
+
+    Args:
+        page (fitz.Page): Page object.
+
+    Returns:
+        list[Segment]: Non-blank segments, in content order.
+    """
+    segments = []
+    line_number = 0
+    for block in page.get_text("dict", flags=TEXT_FLAGS)["blocks"]:
+        for line in block.get("lines", ()):
+            line_number += 1
+            current = None
+            for span in line["spans"]:
+                text = span["text"]
+                if not text.strip():
+                    continue
+                x0, y0, x1, y1 = span["bbox"]
+                if current is not None and x0 - current[2] <= span["size"] * CELL_GAP_EM:
+                    current[2], current[1], current[3] = x1, min(current[1], y0), max(current[3], y1)
+                    current[4] += text
+                    continue
+                if current is not None:
+                    segments.append(Segment(*current, block["number"], line_number))
+                current = [x0, y0, x1, y1, text]
+            if current is not None:
+                segments.append(Segment(*current, block["number"], line_number))
+    return segments
+
+
+def _group_rows(segments):
+    """
+    Groups segments whose vertical centres line up into rows, top to bottom,
+    each row sorted left to right.
+    """
+    rows = []
+    for segment in sorted(segments, key=lambda s: (s.y0 + s.y1) / 2):
+        centre = (segment.y0 + segment.y1) / 2
+        if rows:
+            row = rows[-1]
+            row_centre = (row[0].y0 + row[0].y1) / 2
+            if abs(centre - row_centre) <= min(segment.y1 - segment.y0, row[0].y1 - row[0].y0) / 2:
+                row.append(segment)
+                continue
+        rows.append([segment])
+    for row in rows:
+        row.sort(key=lambda s: s.x0)
+    return rows
+
+
+def _merge_intervals(intervals):
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _table_box(run, text_width):
+    """
+    Turns a run of multi-cell rows into a table Box, or returns None if the
+    run does not look like a table (e.g. two columns of prose side by side).
+    """
+    if len(run) < MIN_TABLE_ROWS:
+        return None
+    cells = [segment for row in run for segment in row]
+    columns = _merge_intervals((s.x0, s.x1) for s in cells)
+    if len(columns) < 2:
+        return None
+    if len(columns) == 2 and statistics.median(s.x1 - s.x0 for s in cells) > MAX_CELL_SHARE * text_width:
+        return None
+
+    lines = []
+    for row in run:
+        values = [""] * len(columns)
+        for segment in row:
+            centre = (segment.x0 + segment.x1) / 2
+            index = next((i for i, (start, end) in enumerate(columns) if start <= centre <= end), 0)
+            values[index] = f"{values[index]} {segment.text.strip()}".strip()
+        lines.append("\t".join(values))
+    return Box(min(s.x0 for s in cells), min(s.y0 for s in cells), max(s.x1 for s in cells),
+               max(s.y1 for s in cells), "\n".join(lines))
+
+
+def find_tables(segments):
+    """
+    Finds tables as runs of at least MIN_TABLE_ROWS consecutive rows that each
+    have two or more cells, with consistent columns (merged cell extents) and,
+    for two-column runs, cells narrower than MAX_CELL_SHARE of the text width.
+    Works on text positions only, so ruled and unruled tables are both found
+    without parsing the page's drawings.
+
+    Args:
+        segments (list[Segment]): Output of `page_segments`.
+
+    Returns:
+        tuple[list[Box], list[Segment]]: One Box per table (rows as tab-separated
+        cells) and the segments that are not part of a table.
+    """
+    if not segments:
+        return [], []
+    text_width = max(s.x1 for s in segments) - min(s.x0 for s in segments) or 1
+
+    tables, used = [], set()
+    run = []
+
+    def close_run():
+        table = _table_box(run, text_width)
+        if table is not None:
+            tables.append(table)
+            used.update(id(segment) for row in run for segment in row)
+        run.clear()
+
+    for row in _group_rows(segments):
+        if len(row) < 2:
+            close_run()
+            continue
+        if run:
+            previous = run[-1]
+            height = max(s.y1 - s.y0 for s in row + previous)
+            if min(s.y0 for s in row) - max(s.y1 for s in previous) > ROW_GAP_EM * height:
+                close_run()
+        run.append(row)
+    close_run()
+
+    return tables, [segment for segment in segments if id(segment) not in used]
+
+
+def _gaps(boxes, axis, min_gap=0):
+    """
+    Bands of white space crossing all the boxes along `axis` (0: vertical
+    gutters between columns, 1: horizontal gaps between rows of boxes).
+
+    Returns:
+        list[tuple[float, float]]: (start, end) of each gap wider than `min_gap`, in order.
+    """
+    intervals = sorted((box[axis], box[axis + 2]) for box in boxes)
+    gaps = []
+    reach = intervals[0][1]
+    for start, end in intervals[1:]:
+        if start > reach and start - reach >= min_gap:
+            gaps.append((reach, start))
+        reach = max(reach, end)
+    return gaps
+
+
+def _split(boxes, axis, gaps):
+    """
+    Splits boxes into the groups between consecutive gaps along `axis`.
+    """
+    groups = [[] for _ in range(len(gaps) + 1)]
+    for box in boxes:
+        groups[sum(box[axis] >= gap_end for _, gap_end in gaps)].append(box)
+    return groups
+
+
+def reading_order(boxes, column_gap=COLUMN_GAP):
+    """
+    Orders text boxes the way a person reads the page.
+
+    The page is cut into horizontal strips at every gap that crosses it.
+    Consecutive strips that keep a vertical gutter of at least `column_gap`
+    points free (two columns side by side, or one column running on alone)
+    form a band, which is read column by column, left before right, each
+    column being ordered the same way. Strips that cross every gutter
+    (a full-width title, table or footnote) end the band and are read in
+    place, so a page can go from one column to two and back.
+
+    Args:
+        boxes (list[Box]): Paragraph and table boxes of one page.
+        column_gap (float): Narrowest white space (in points) taken as a column gutter.
+
+    Returns:
+        list[Box]: The same boxes, in reading order.
+    """
+    if len(boxes) <= 1:
+        return list(boxes)
+
+    ordered = []
+    band, band_gutters = [], []
+
+    def flush():
+        if not band:
+            return
+        if band_gutters:
+            cut = band_gutters[0][0]
+            left = [box for box in band if box.x1 <= cut]
+            ordered.extend(reading_order(left, column_gap))
+            ordered.extend(reading_order([box for box in band if box.x1 > cut], column_gap))
+        else:
+            ordered.extend(sorted(band, key=lambda box: (box.y0, box.x0)))
+
+    for strip in _split(boxes, 1, _gaps(boxes, 1)):
+        if band:
+            # The strip joins the band if a gutter still runs through both
+            shared = _gaps(band + strip, 0, column_gap)
+            if shared:
+                band.extend(strip)
+                band_gutters = shared
+                continue
+            flush()
+        band, band_gutters = list(strip), _gaps(strip, 0, column_gap)
+    flush()
+    return ordered
+
+
+def _paragraph_boxes(segments):
+    """
+    Rebuilds PyMuPDF's text blocks from the segments left after header, footer
+    and table removal: one Box per block, its lines joined with newlines.
+    """
+    blocks = {}
+    for segment in segments:
+        blocks.setdefault(segment.block, []).append(segment)
+
+    boxes = []
+    for block_segments in blocks.values():
+        lines = {}
+        for segment in block_segments:
+            lines.setdefault(segment.line, []).append(segment.text.strip())
+        boxes.append(Box(min(s.x0 for s in block_segments), min(s.y0 for s in block_segments),
+                         max(s.x1 for s in block_segments), max(s.y1 for s in block_segments),
+                         "\n".join(" ".join(parts) for parts in lines.values())))
+    return boxes
+
+
+class LayoutExtractor:
+    """
+    Layout-aware native text for the pages of one document, from a single
+    `get_text('dict')` call per page:
+
+    - running headers and footers are dropped: lines in the top or bottom
+      MARGIN_BAND of the page that are page numbers, or that repeat (numbers
+      aside) a margin line of an earlier page. The first page's header is
+      kept, since nothing has repeated yet;
+    - tables found from text alignment (see `find_tables`) are emitted as
+      `[Table N]` followed by one tab-separated line per row;
+    - paragraphs and tables are put in reading order, so multi-column pages
+      are read column by column (see `reading_order`).
+
+    Use one instance per document: it remembers the margin lines seen so far.
+    """
+
+    def __init__(self, strip_running=True, detect_tables=True, margin=MARGIN_BAND, column_gap=COLUMN_GAP):
+        self.strip_running = strip_running
+        self.detect_tables = detect_tables
+        self.margin = margin
+        self.column_gap = column_gap
+        self.table_count = 0
+        self.removed_lines = 0
+        self._running = set()
+
+    def _strip_running_lines(self, segments, page_rect):
+        top = page_rect.y0 + self.margin * page_rect.height
+        bottom = page_rect.y1 - self.margin * page_rect.height
+        kept, seen_here = [], set()
+        for segment in segments:
+            if segment.y1 <= top or segment.y0 >= bottom:
+                key = _normalise(segment.text)
+                seen_here.add(key)
+                if key in self._running or PAGE_NUMBER.match(segment.text):
+                    self.removed_lines += 1
+                    continue
+            kept.append(segment)
+        self._running |= seen_here
+        return kept
+
+    def page_text(self, page):
+        """
+        Returns the layout-aware text of one page.
+
+        Args:
+            page (fitz.Page): The next page of the document.
+
+        Returns:
+            str: Paragraphs (and tables) in reading order, separated by blank lines.
+        """
+        segments = page_segments(page)
+        if self.strip_running:
+            segments = self._strip_running_lines(segments, page.rect)
+
+        tables = []
+        if self.detect_tables:
+            tables, segments = find_tables(segments)
+        boxes = _paragraph_boxes(segments) + tables
+
+        table_boxes = {id(box) for box in tables}
+        parts = []
+        for box in reading_order(boxes, self.column_gap):
+            if id(box) in table_boxes:
+                self.table_count += 1
+                parts.append(f"[Table {self.table_count}]\n{box.text}")
+            else:
+                parts.append(box.text)
+        return "\n\n".join(parts) + "\n" if parts else ""
@@ -0,0 +1,102 @@
+import os
+from contextlib import nullcontext
+from typing import Optional
+from dataclasses import dataclass, field
+
+from Majd_Zarai_text_extractor.pdf_handler import (
+    IMAGE_ROOT_DIR,
+    PdfImageWriter,
+    extract_images_from_pdf,
+    image_dir_for,
+    iter_text_from_pdf,
+)
+from Majd_Zarai_text_extractor.extraction_cache import HANDLER_SETTINGS, cached_extract, cached_extract_to_file
+
+# ─────────────────────────────────────────────────────────────
+#  PDF PIPELINE — Text, OCR and images from a single open
+# ─────────────────────────────────────────────────────────────
+
+@dataclass
+class PdfResult:
+    """
+    Everything `process_pdf` produced for one document.
+
+    `text` holds the full text when no output file was requested; otherwise it
+    is None and the text is in `output_path` (None if nothing was extracted).
+    `page_stats` is empty when the text came from the cache, since the
+    document was not walked.
+    """
+    source: str
+    text: Optional[str] = None
+    output_path: Optional[str] = None
+    has_text: bool = False
+    from_cache: bool = False
+    image_dir: Optional[str] = None
+    image_count: int = 0
+    page_stats: dict = field(default_factory=dict)
+
+
+def process_pdf(file_path, settings=None, output_path=None, cache=None, page_cache=None,
+                extract_images=True, image_root_dir=IMAGE_ROOT_DIR, display_name=None,
+                image_filters=None, max_workers=None, progress=None, content_hash=None, image_name=None):
+    """
+    Opens a PDF once and, in a single page walk, extracts its native text, OCRs
+    the pages that need it and saves its embedded images.
+
+    With a cache hit the text is served from the cache and the document is only
+    opened again if its image folder is missing.
+
+    Args:
+        file_path (str): Path to the PDF file.
+        settings (dict | None): Overrides for HANDLER_SETTINGS['.pdf'] (lang, dpi,
+            adaptive_dpi, preprocess, layout); part of the cache key.
+        output_path (str | None): Stream the text to this file instead of returning it.
+        cache (ExtractionCache | None): Whole-document text cache.
+        page_cache (ExtractionCache | None): Per-page OCR cache.
+        extract_images (bool): Also save embedded images.
+        image_root_dir (str): Root folder for the `<pdf_name>_images` folders.
+        display_name (str | None): Original file name when `file_path` is a temporary copy.
+        image_filters (dict | None): min_bytes / min_width / min_height for PdfImageWriter.
+        max_workers (int | None): Concurrent OCR pages (default: the process's OCR thread budget).
+        progress (callable | None): Called as progress(pages_done, total_pages)
+            during the page walk (not called on a cache hit).
+        content_hash (str | None): Precomputed `hash_file(file_path)`, if already known.
+        image_name (str | None): Image folder name instead of the file's stem
+            (`<image_name>_images`, see image_dir_for).
+
+    Returns:
+        PdfResult: Text (or output path), cache status, image folder/count and page counts.
+    """
+    settings = {**HANDLER_SETTINGS[".pdf"], **(settings or {})}
+    result = PdfResult(source=os.path.basename(display_name or file_path), output_path=output_path)
+
+    writer = None
+    if extract_images:
+        result.image_dir = image_dir_for(file_path, image_root_dir, display_name, image_name)
+        writer = PdfImageWriter(result.image_dir, source=result.source, **(image_filters or {}))
+
+    def iter_fn():
+        return iter_text_from_pdf(file_path, lang=settings["lang"], max_workers=max_workers, dpi=settings["dpi"],
+                                  page_cache=page_cache, adaptive_dpi=settings["adaptive_dpi"],
+                                  preprocess=settings["preprocess"], layout=settings["layout"], image_writer=writer,
+                                  stats=result.page_stats, progress=progress)
+
+    with writer if writer is not None else nullcontext():
+        if output_path:
+            result.has_text, result.from_cache = cached_extract_to_file(
+                file_path, iter_fn, settings, output_path, cache, content_hash)
+            if not result.has_text:
+                result.output_path = None
+        else:
+            result.text, result.from_cache = cached_extract(
+                file_path, lambda: "\n".join(iter_fn()).strip(), settings, cache, content_hash)
+            result.has_text = bool(result.text)
+
+    if writer is not None:
+        result.image_count = writer.image_count
+        # Images from a cached document are normally on disk from its first run
+        if result.from_cache and not os.path.isdir(result.image_dir):
+            result.image_count = extract_images_from_pdf(file_path, image_root_dir, display_name,
+                                                         image_name=image_name, **(image_filters or {}))
+
+    return result
@@ -0,0 +1,147 @@
+import os
+import re
+import time
+import logging
+import zipfile
+from typing import Optional
+from dataclasses import dataclass
+
+from Majd_Zarai_text_extractor.registry import handler_for_extension
+
+# ─────────────────────────────────────────────────────────────
+#  PREFLIGHT — Real format and structural sanity before extraction
+# ─────────────────────────────────────────────────────────────
+
+logger = logging.getLogger(__name__)
+
+HEAD_SIZE = 4096   # bytes read from the start of a file
+TAIL_SIZE = 4096   # bytes read from the end of a PDF (trailer, startxref, %%EOF)
+
+PDF_HEADER = b"%PDF-"
+PDF_HEADER_WINDOW = 1024  # readers accept junk before the header, up to this offset
+ZIP_SIGNATURES = (b"PK\x03\x04", b"PK\x05\x06")  # first local file header / empty archive
+OLE_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"  # legacy .doc / .xls (and encrypted OOXML)
+
+STARTXREF_RE = re.compile(rb"startxref\s+(\d+)")
+XREF_TARGET_RE = re.compile(rb"\s*(xref|\d+\s+\d+\s+obj)")
+
+# Main-document content type in [Content_Types].xml -> (format, part that must exist)
+OOXML_MAIN_TYPES = {
+    b"wordprocessingml.document.main+xml": ("docx", "word/document.xml"),
+    b"spreadsheetml.sheet.main+xml": ("xlsx", "xl/workbook.xml"),
+}
+
+
+@dataclass
+class PreflightResult:
+    """
+    Outcome of `preflight_file` for one file.
+
+    `format` is the registry name of what the file really is ('pdf', 'docx',
+    'xlsx'), `declared` what its extension claims. `reason` explains a
+    rejection, or notes a repairable defect on an accepted file.
+    """
+    path: str
+    ok: bool = False
+    format: Optional[str] = None
+    declared: Optional[str] = None
+    reason: str = ""
+    elapsed_ms: float = 0.0
+
+    @property
+    def rerouted(self):
+        """
+        True when the content does not match the extension (e.g. a DOCX named .pdf).
+        """
+        return self.ok and self.declared is not None and self.declared != self.format
+
+
+def _check_pdf(f, size):
+    """
+    Returns (ok, reason) for a file whose head contains the PDF header.
+    Only the last TAIL_SIZE bytes and a few bytes at the startxref offset are read.
+    """
+    f.seek(max(0, size - TAIL_SIZE))
+    tail = f.read(TAIL_SIZE)
+
+    if b"%%EOF" not in tail:
+        return False, "truncated PDF: no %%EOF marker at the end of the file"
+
+    matches = list(STARTXREF_RE.finditer(tail))
+    if not matches:
+        return False, "damaged PDF: no startxref before %%EOF"
+
+    offset = int(matches[-1].group(1))
+    if offset >= size:
+        return False, f"truncated PDF: startxref points to byte {offset}, past the end of the file ({size} bytes)"
+
+    f.seek(offset)
+    if not XREF_TARGET_RE.match(f.read(64)):
+        # PyMuPDF rebuilds a broken cross-reference table, so this is not fatal
+        return True, "startxref does not point to a cross-reference section (will be repaired on open)"
+    return True, ""
+
+
+def _check_ooxml(file_path):
+    """
+    Returns (format, ok, reason) for a ZIP file. The central directory is read
+    (which fails on truncated archives) but no member is decompressed except
+    the small [Content_Types].xml.
+    """
+    try:
+        with zipfile.ZipFile(file_path) as archive:
+            names = set(archive.namelist())
+            if "[Content_Types].xml" not in names:
+                return None, False, "ZIP archive without [Content_Types].xml (not an Office document)"
+            content_types = archive.read("[Content_Types].xml")
+    except zipfile.BadZipFile as e:
+        return None, False, f"truncated or corrupt ZIP container: {e}"
+
+    for content_type, (format_name, main_part) in OOXML_MAIN_TYPES.items():
+        if content_type in content_types:
+            if main_part not in names:
+                return format_name, False, f"damaged {format_name.upper()}: '{main_part}' is missing"
+            return format_name, True, ""
+    return None, False, "Office Open XML package that is neither a Word document nor an Excel workbook"
+
+
+def preflight_file(file_path):
+    """
+    Works out what a file really is from its content and checks that it is
+    structurally sane, in a few milliseconds and without loading any handler:
+
+    - PDF: header in the first KB, %%EOF and a startxref inside the file.
+    - DOCX/XLSX: readable ZIP central directory, [Content_Types].xml naming
+      the document type, and the main part present.
+
+    Args:
+        file_path (str): File to check.
+
+    Returns:
+        PreflightResult: `ok` is False for files that should not reach a handler.
+    """
+    start = time.perf_counter()
+    declared = handler_for_extension(os.path.splitext(file_path)[1])
+    result = PreflightResult(path=file_path, declared=declared.name if declared else None)
+
+    try:
+        size = os.path.getsize(file_path)
+        with open(file_path, "rb") as f:
+            head = f.read(HEAD_SIZE)
+
+            if size == 0:
+                result.reason = "empty file"
+            elif PDF_HEADER in head[:PDF_HEADER_WINDOW + len(PDF_HEADER)]:
+                result.format = "pdf"
+                result.ok, result.reason = _check_pdf(f, size)
+            elif head.startswith(ZIP_SIGNATURES):
+                result.format, result.ok, result.reason = _check_ooxml(file_path)
+            elif head.startswith(OLE_SIGNATURE):
+                result.reason = "legacy binary Office file (.doc/.xls) or password-protected document"
+            else:
+                result.reason = f"unrecognised content (starts with {head[:8]!r})"
+    except OSError as e:
+        result.reason = f"unreadable: {e}"
+
+    result.elapsed_ms = (time.perf_counter() - start) * 1000
+    return result
@@ -0,0 +1,219 @@
+import logging
+
+import numpy as np
+from PIL import Image
+
+# ─────────────────────────────────────────────────────────────
+#  PREPROCESSING — Clean up rendered pages before OCR (NumPy)
+# ─────────────────────────────────────────────────────────────
+
+logger = logging.getLogger(__name__)
+
+# Default pipeline; any key can be overridden per call. Pages are always
+# converted to grayscale, then: downscale -> crop -> deskew -> threshold.
+PREPROCESS_STEPS = {
+    "max_side": None,        # downscale so the longest side is at most this many pixels (None: keep)
+    "crop": True,            # strip dark scanner borders, then blank margins
+    "deskew": True,
+    "max_skew": 5.0,         # largest rotation searched, in degrees
+    "skew_step": 0.25,       # angular resolution of the search, in degrees
+    "threshold": True,       # adaptive (local mean) binarisation
+    "block_size": 31,        # threshold neighbourhood, in pixels (odd)
+    "offset": 10,            # how much darker than its neighbourhood a pixel must be to count as ink
+}
+
+INK_LEVEL = 128            # grey level below which a pixel counts as ink for cropping
+BORDER_DARK_RATIO = 0.5    # rows/columns at the edge that are more than half dark are scanner border
+CONTENT_INK_RATIO = 0.002  # rows/columns with less ink than this are blank
+CROP_MARGIN = 10           # pixels of white kept around the content
+MAX_SKEW_SAMPLES = 200000  # ink pixels used to estimate the skew angle
+
+
+def to_grayscale(pixels):
+    """
+    Converts an RGB array to 8-bit luma (ITU-R 601 weights, integer arithmetic).
+
+    Args:
+        pixels (np.ndarray): HxWx3 or HxW uint8 array.
+
+    Returns:
+        np.ndarray: HxW uint8 array.
+    """
+    if pixels.ndim == 2:
+        return pixels
+    rgb = pixels[..., :3].astype(np.uint32)
+    return ((rgb[..., 0] * 299 + rgb[..., 1] * 587 + rgb[..., 2] * 114) // 1000).astype(np.uint8)
+
+
+def _leading_run(mask):
+    """
+    Length of the run of True values at the start of a 1-D boolean array.
+    """
+    return len(mask) if mask.all() else int(np.argmin(mask))
+
+
+def crop_to_content(gray):
+    """
+    Removes dark scanner borders and blank margins around the page content.
+
+    Border rows/columns are only stripped from the edges inwards, so dark
+    content in the middle of the page (tables, photos) is never cut.
+
+    Args:
+        gray (np.ndarray): HxW uint8 grayscale page.
+
+    Returns:
+        tuple[np.ndarray, tuple[int, int, int, int]]: The cropped view and its
+        (top, bottom, left, right) bounds in the input. A page without any
+        content is returned unchanged.
+    """
+    height, width = gray.shape
+    ink = gray < INK_LEVEL
+
+    # 1) Scanner borders: solid dark bands along the edges
+    row_dark = ink.mean(axis=1) > BORDER_DARK_RATIO
+    col_dark = ink.mean(axis=0) > BORDER_DARK_RATIO
+    top = _leading_run(row_dark)
+    bottom = height - _leading_run(row_dark[::-1])
+    left = _leading_run(col_dark)
+    right = width - _leading_run(col_dark[::-1])
+    if top >= bottom or left >= right:
+        return gray, (0, height, 0, width)
+
+    # 2) Blank margins: bounding box of rows/columns that carry some ink
+    inner = ink[top:bottom, left:right]
+    rows = np.flatnonzero(inner.mean(axis=1) > CONTENT_INK_RATIO)
+    cols = np.flatnonzero(inner.mean(axis=0) > CONTENT_INK_RATIO)
+    if rows.size == 0 or cols.size == 0:
+        return gray, (0, height, 0, width)
+
+    bounds = (
+        max(top + int(rows[0]) - CROP_MARGIN, top),
+        min(top + int(rows[-1]) + 1 + CROP_MARGIN, bottom),
+        max(left + int(cols[0]) - CROP_MARGIN, left),
+        min(left + int(cols[-1]) + 1 + CROP_MARGIN, right),
+    )
+    return gray[bounds[0]:bounds[1], bounds[2]:bounds[3]], bounds
+
+
+def estimate_skew(gray, max_angle=5.0, step=0.25):
+    """
+    Estimates the rotation of the text lines with a projection-profile search.
+
+    Ink pixels are sheared by each candidate angle in turn and projected onto
+    the vertical axis; the angle giving the sharpest row histogram (largest
+    sum of squares, i.e. lines falling into the fewest rows) wins. One angle
+    is held in memory at a time (a few MB for `MAX_SKEW_SAMPLES` pixels).
+
+    Args:
+        gray (np.ndarray): HxW uint8 grayscale page.
+        max_angle (float): Largest angle searched in either direction, in degrees.
+        step (float): Angular resolution, in degrees.
+
+    Returns:
+        float: Skew in degrees (counter-clockwise positive, as PIL's rotate);
+        rotating by the negated value straightens the page.
+    """
+    ink = gray < INK_LEVEL
+    # Sample every n-th column rather than listing every ink pixel of a dense page
+    stride = int(np.count_nonzero(ink)) // MAX_SKEW_SAMPLES + 1
+    ys, xs = np.nonzero(ink[:, ::stride])
+    if ys.size < 2:
+        return 0.0
+    xs *= stride
+
+    angles = np.arange(-max_angle, max_angle + step / 2, step)
+    ys, xs = ys.astype(np.float64), xs.astype(np.float64)
+    rows = np.empty_like(ys)
+
+    scores = np.empty(len(angles))
+    for index, slope in enumerate(np.tan(np.radians(angles))):
+        # Row each ink pixel falls into at this angle
+        np.multiply(xs, slope, out=rows)
+        rows += ys
+        np.rint(rows, out=rows)
+        rows -= rows.min()
+        histogram = np.bincount(rows.astype(np.intp)).astype(np.float64)
+        scores[index] = histogram @ histogram
+
+    return float(angles[int(np.argmax(scores))])
+
+
+def adaptive_threshold(gray, block_size=31, offset=10):
+    """
+    Binarises a page against its local mean brightness, so uneven lighting and
+    scanner shading do not swallow faint text the way one global cut-off does.
+    Local means come from a summed-area table, so the cost does not depend on
+    `block_size`.
+
+    Args:
+        gray (np.ndarray): HxW uint8 grayscale page.
+        block_size (int): Side of the square neighbourhood, in pixels (odd).
+        offset (int): A pixel is ink if it is this much darker than its neighbourhood mean.
+
+    Returns:
+        np.ndarray: HxW uint8 array, 0 for ink and 255 for background.
+    """
+    half = block_size // 2
+    block = 2 * half + 1
+    height, width = gray.shape
+
+    padded = np.pad(gray, half, mode="edge").astype(np.int64)
+    integral = np.zeros((padded.shape[0] + 1, padded.shape[1] + 1), dtype=np.int64)
+    np.cumsum(np.cumsum(padded, axis=0), axis=1, out=integral[1:, 1:])
+
+    window_sum = (integral[block:block + height, block:block + width]
+                  - integral[:height, block:block + width]
+                  - integral[block:block + height, :width]
+                  + integral[:height, :width])
+
+    # ink where gray < mean - offset, without dividing: gray * area < sum - offset * area
+    area = block * block
+    ink = gray.astype(np.int64) * area < window_sum - offset * area
+    return np.where(ink, 0, 255).astype(np.uint8)
+
+
+def preprocess_image(image, steps=None):
+    """
+    Runs the preprocessing pipeline on one rendered page.
+
+    Args:
+        image (PIL.Image.Image | np.ndarray): Rendered page (RGB or grayscale).
+        steps (dict | None): Overrides for PREPROCESS_STEPS.
+
+    Returns:
+        tuple[PIL.Image.Image, dict]: The page ready for OCR (mode 'L') and what
+        was done: 'input_pixels', 'output_pixels', 'skew' (degrees) and 'crop'
+        ((top, bottom, left, right) or None).
+    """
+    options = {**PREPROCESS_STEPS, **(steps or {})}
+    pixels = np.asarray(image)
+    info = {"input_pixels": pixels.shape[0] * pixels.shape[1], "skew": 0.0, "crop": None}
+
+    gray = to_grayscale(pixels)
+
+    max_side = options["max_side"]
+    if max_side and max(gray.shape) > max_side:
+        scale = max_side / max(gray.shape)
+        size = (max(1, round(gray.shape[1] * scale)), max(1, round(gray.shape[0] * scale)))
+        gray = np.asarray(Image.fromarray(gray).resize(size, Image.LANCZOS))
+
+    if options["crop"]:
+        gray, info["crop"] = crop_to_content(gray)
+
+    if options["deskew"]:
+        info["skew"] = estimate_skew(gray, options["max_skew"], options["skew_step"])
+        if info["skew"]:
+            # Fill the corners uncovered by the rotation with the paper colour
+            background = int(np.median(gray[::8, ::8]))
+            rotated = Image.fromarray(gray).rotate(-info["skew"], resample=Image.BILINEAR,
+                                                   expand=True, fillcolor=background)
+            gray = np.asarray(rotated)
+
+    if options["threshold"]:
+        gray = adaptive_threshold(gray, options["block_size"], options["offset"])
+
+    info["output_pixels"] = gray.shape[0] * gray.shape[1]
+    logger.debug(f"Preprocessed page: {info['input_pixels']} -> {info['output_pixels']} px, "
+                 f"skew {info['skew']:+.2f}°, crop {info['crop']}.")
+    return Image.fromarray(gray), info
@@ -0,0 +1,209 @@
+import os
+import logging
+import importlib
+
+from Majd_Zarai_text_extractor.metrics import stage
+
+# ─────────────────────────────────────────────────────────────
+#  HANDLER REGISTRY — Formats, how to recognise them, lazy loading
+# ─────────────────────────────────────────────────────────────
+
+logger = logging.getLogger(__name__)
+
+# Enough leading bytes for every registered signature
+MAGIC_READ_SIZE = 8
+
+
+class HandlerSpec:
+    """
+    One registered document format.
+
+    Entry points are given as "package.module:function" strings (or plain
+    callables) and are only imported the first time they are used, so the
+    heavy libraries behind a format (PyMuPDF, python-docx, openpyxl...) are
+    never loaded by a run that does not meet a file of that type.
+    """
+
+    def __init__(self, name, extensions, mime_types=(), magic=(), **entry_points):
+        self.name = name
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.mime_types = tuple(mime_types)
+        self.magic = tuple(magic)
+        self._entry_points = entry_points
+        self._loaded = {}
+
+    def __repr__(self):
+        return f"HandlerSpec({self.name!r}, extensions={self.extensions!r})"
+
+    @property
+    def extension(self):
+        """
+        Canonical extension of the format (the key used in HANDLER_SETTINGS).
+        """
+        return self.extensions[0]
+
+    def has(self, entry_point):
+        """
+        Whether the format provides an entry point (without importing anything).
+        """
+        return entry_point in self._entry_points
+
+    def load(self, entry_point):
+        """
+        Returns the callable behind an entry point, importing its module on first use.
+
+        Args:
+            entry_point (str): e.g. 'iter_text' or 'extract_text'.
+
+        Returns:
+            callable: The handler function.
+        """
+        function = self._loaded.get(entry_point)
+        if function is not None:
+            return function
+
+        target = self._entry_points.get(entry_point)
+        if target is None:
+            raise KeyError(f"Handler '{self.name}' has no '{entry_point}' entry point.")
+        if callable(target):
+            function = target
+        else:
+            module_name, _, attribute = target.partition(":")
+            logger.debug(f"Loading {module_name} for {self.name} files.")
+            with stage("import"):
+                function = getattr(importlib.import_module(module_name), attribute)
+
+        self._loaded[entry_point] = function
+        return function
+
+
+_handlers = {}
+
+
+def register_handler(name, extensions, mime_types=(), magic=(), **entry_points):
+    """
+    Registers (or replaces) a document format.
+
+    Args:
+        name (str): Short format name, e.g. 'pdf'.
+        extensions (Iterable[str]): File extensions with the dot, canonical one first.
+        mime_types (Iterable[str]): MIME types browsers send for it.
+        magic (Iterable[bytes]): Signatures the file content starts with.
+        **entry_points (str | callable): Handler functions, e.g.
+            iter_text='package.module:function'.
+
+    Returns:
+        HandlerSpec: The registered spec.
+    """
+    spec = HandlerSpec(name, extensions, mime_types, magic, **entry_points)
+    _handlers[name] = spec
+    return spec
+
+
+def registered_handlers():
+    """
+    Returns every registered HandlerSpec, in registration order.
+    """
+    return list(_handlers.values())
+
+
+def supported_extensions():
+    """
+    Returns all extensions that have a handler.
+    """
+    return tuple(ext for spec in _handlers.values() for ext in spec.extensions)
+
+
+def get_handler(name):
+    """
+    Returns the handler registered under `name` (e.g. 'pdf'), or None.
+    """
+    return _handlers.get(name)
+
+
+def handler_for_extension(ext):
+    """
+    Returns the handler for an extension such as '.pdf' (case-insensitive), or None.
+    """
+    ext = ext.lower()
+    for spec in _handlers.values():
+        if ext in spec.extensions:
+            return spec
+    return None
+
+
+def handler_for_mime(mime_type):
+    """
+    Returns the handler for a MIME type, or None.
+    """
+    for spec in _handlers.values():
+        if mime_type in spec.mime_types:
+            return spec
+    return None
+
+
+def handler_for_magic(header):
+    """
+    Returns the handler whose signature starts `header`, or None when no
+    signature matches or several formats share it (e.g. every OOXML file is a ZIP).
+    """
+    matches = [spec for spec in _handlers.values() if any(header.startswith(sig) for sig in spec.magic)]
+    return matches[0] if len(matches) == 1 else None
+
+
+def handler_for_path(file_path, mime_type=None, sniff=True):
+    """
+    Finds the handler for a file: by extension, then MIME type, then (if
+    `sniff`) by the signature of its first bytes.
+
+    Args:
+        file_path (str): Path of the file.
+        mime_type (str | None): MIME type reported by the uploader, if any.
+        sniff (bool): Read the first bytes when neither extension nor MIME type is known.
+
+    Returns:
+        HandlerSpec | None: The handler, or None for an unsupported file.
+    """
+    spec = handler_for_extension(os.path.splitext(file_path)[1])
+    if spec is None and mime_type:
+        spec = handler_for_mime(mime_type)
+    if spec is None and sniff:
+        try:
+            with open(file_path, "rb") as f:
+                spec = handler_for_magic(f.read(MAGIC_READ_SIZE))
+        except OSError:
+            spec = None
+    return spec
+
+
+# ─────────────────────────────────────────────────────────────
+#  Built-in formats
+# ─────────────────────────────────────────────────────────────
+
+register_handler(
+    "pdf",
+    extensions=(".pdf",),
+    mime_types=("application/pdf",),
+    magic=(b"%PDF-",),
+    iter_text="Majd_Zarai_text_extractor.pdf_handler:iter_text_from_pdf",
+    extract_text="Majd_Zarai_text_extractor.pdf_handler:extract_text_from_pdf_enhanced",
+    process="Majd_Zarai_text_extractor.pdf_pipeline:process_pdf",
+)
+
+register_handler(
+    "docx",
+    extensions=(".docx",),
+    mime_types=("application/vnd.openxmlformats-officedocument.wordprocessingml.document",),
+    magic=(b"PK\x03\x04",),
+    iter_text="Majd_Zarai_text_extractor.docx_handler:iter_text_from_docx",
+    extract_text="Majd_Zarai_text_extractor.docx_handler:extract_text_from_docx_enhanced",
+)
+
+register_handler(
+    "xlsx",
+    extensions=(".xlsx",),
+    mime_types=("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",),
+    magic=(b"PK\x03\x04",),
+    iter_text="Majd_Zarai_text_extractor.excel_handler:iter_text_from_excel",
+    extract_text="Majd_Zarai_text_extractor.excel_handler:extract_text_from_excel_enhanced",
+)
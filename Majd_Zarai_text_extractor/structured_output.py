@@ -0,0 +1,177 @@
+import json
+import datetime
+import logging
+
+from Majd_Zarai_text_extractor.text_writer import atomic_open
+
+# ─────────────────────────────────────────────────────────────
+#  STRUCTURED OUTPUT — Typed tables as JSON Lines
+# ─────────────────────────────────────────────────────────────
+
+logger = logging.getLogger(__name__)
+
+# Order matters: bool is a subclass of int, datetime a subclass of date
+VALUE_TYPES = (
+    (bool, "bool"),
+    (int, "int"),
+    (float, "float"),
+    (datetime.datetime, "datetime"),
+    (datetime.date, "date"),
+    (datetime.time, "time"),
+    (datetime.timedelta, "duration"),
+    (str, "string"),
+)
+
+
+def value_type(value):
+    """
+    Returns the schema type name of a cell value ('null' for None).
+    """
+    if value is None:
+        return "null"
+    for python_type, name in VALUE_TYPES:
+        if isinstance(value, python_type):
+            return name
+    return "string"
+
+
+def merge_types(current, new):
+    """
+    Widens a column type so it can hold a new value type.
+    int + float -> float, anything else that disagrees -> mixed.
+    """
+    if new == "null" or current == new:
+        return current
+    if current == "null":
+        return new
+    if {current, new} == {"int", "float"}:
+        return "float"
+    return "mixed"
+
+
+def _json_value(value):
+    """
+    JSON encoding for values json cannot handle natively.
+    Dates/times become ISO strings and durations become seconds.
+    """
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+
+class TableWriter:
+    """
+    Writes every table of a document (Excel sheets, DOCX tables) to one
+    JSON Lines file, one record per line, as rows are produced:
+
+        {"kind": "table",  "table": "Sheet1", "source": "xlsx"}
+        {"kind": "row",    "table": "Sheet1", "values": ["EP", 3, 1.5, "2024-05-01T00:00:00"]}
+        ...
+        {"kind": "schema", "table": "Sheet1", "source": "xlsx", "row_count": 41,
+         "columns": [{"name": "EP", "type": "string"}, {"name": "Score", "type": "int"}, ...]}
+
+    The schema record closes each table, once every value has been seen. If the
+    first row contains only text it is used for the column names instead of
+    being written as data. The file is only created if the document has a table,
+    and is written atomically: it only replaces `output_path` on `close()`, and
+    is discarded if the `with` block raises.
+    """
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self._output = None  # the atomic_open() context the file comes from
+        self._file = None
+        self._table = None
+        self.table_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._file is not None:
+            # Hands the error to atomic_open, which deletes the partial file
+            output, self._output, self._file, self._table = self._output, None, None, None
+            output.__exit__(exc_type, exc, tb)
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=_json_value))
+        self._file.write("\n")
+
+    def start_table(self, name, source):
+        """
+        Begins a new table (closing the previous one if still open).
+
+        Args:
+            name (str): Sheet title or table label.
+            source (str): Where it comes from, e.g. 'xlsx' or 'docx'.
+        """
+        if self._table is not None:
+            self.end_table()
+        if self._file is None:
+            self._output = atomic_open(self.output_path)
+            self._file = self._output.__enter__()
+
+        self._table = {"name": name, "source": source, "header": None, "types": [], "rows": 0}
+        self._write({"kind": "table", "table": name, "source": source})
+
+    def write_row(self, values):
+        """
+        Appends one row of typed values to the current table.
+        """
+        table = self._table
+        values = [value.strip() if isinstance(value, str) else value for value in values]
+
+        if table["header"] is None and table["rows"] == 0:
+            if values and all(isinstance(value, str) and value for value in values):
+                table["header"] = values
+                return
+
+        types = table["types"]
+        if len(values) > len(types):
+            types.extend(["null"] * (len(values) - len(types)))
+        for index, value in enumerate(values):
+            types[index] = merge_types(types[index], value_type(value))
+
+        self._write({"kind": "row", "table": table["name"], "values": values})
+        table["rows"] += 1
+
+    def end_table(self):
+        """
+        Closes the current table by writing its schema record.
+        """
+        table = self._table
+        if table is None:
+            return
+
+        header = table["header"] or []
+        width = max(len(header), len(table["types"]))
+        columns = []
+        for index in range(width):
+            name = header[index] if index < len(header) else f"column_{index + 1}"
+            col_type = table["types"][index] if index < len(table["types"]) else "null"
+            columns.append({"name": name, "type": col_type})
+
+        self._write({
+            "kind": "schema",
+            "table": table["name"],
+            "source": table["source"],
+            "row_count": table["rows"],
+            "columns": columns,
+        })
+        self._table = None
+        self.table_count += 1
+
+    def close(self):
+        """
+        Closes the open table (if any) and the output file.
+        """
+        if self._file is None:
+            return
+        self.end_table()
+        output, self._output, self._file = self._output, None, None
+        output.__exit__(None, None, None)
+        logger.info(f"[✓] Structured output: {self.table_count} table(s) written to {self.output_path}")
@@ -0,0 +1,95 @@
+import os
+import time
+import uuid
+from contextlib import contextmanager
+
+from Majd_Zarai_text_extractor.metrics import current_timer
+
+# ─────────────────────────────────────────────────────────────
+#  TEXT WRITER — Stream handler output straight to disk
+# ─────────────────────────────────────────────────────────────
+
+# Output files are written through a 64 KB buffer rather than one syscall per page
+OUTPUT_BUFFER_SIZE = 64 * 1024
+
+
+@contextmanager
+def atomic_open(output_path, mode="w", encoding="utf-8"):
+    """
+    Opens a temporary file next to `output_path` and renames it over
+    `output_path` when the block completes, so readers only ever see the
+    previous file or the complete new one, never a truncated one. The
+    temporary file is deleted if the block raises.
+
+    Args:
+        output_path (str): Final destination.
+        mode (str): 'w' for text or 'wb' for bytes.
+        encoding (str): Encoding in text mode.
+
+    Yields:
+        file: The open temporary file.
+    """
+    directory, name = os.path.split(output_path)
+    tmp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with open(tmp_path, mode.replace("w", "x"), encoding=None if "b" in mode else encoding,
+                  buffering=OUTPUT_BUFFER_SIZE) as f:
+            yield f
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_text_stream(output_path, chunks):
+    """
+    Writes the chunks yielded by an `iter_text_from_*` generator to a file.
+
+    The result is byte-for-byte what `"\\n".join(chunks).strip()` would produce,
+    but only one chunk (plus any trailing whitespace held back for the final
+    strip) is ever in memory. The file is written atomically: if the generator
+    raises, `output_path` is left as it was.
+
+    Time spent writing (not producing the chunks) is charged to the 'write'
+    stage of the document being timed, if any.
+
+    Args:
+        output_path (str): Destination text file.
+        chunks (Iterable[str]): Pieces of text, joined with newlines.
+
+    Returns:
+        int: Number of characters written (0 means the document was empty).
+    """
+    written = 0
+    started = False
+    pending = ""  # separators and trailing whitespace not written yet
+    timer = current_timer()
+    write_seconds = 0.0
+
+    with atomic_open(output_path) as f:
+        for chunk in chunks:
+            if not started:
+                chunk = chunk.lstrip()
+                if not chunk:
+                    continue
+                started = True
+            else:
+                pending += "\n"
+
+            body = chunk.rstrip()
+            if body:
+                start = time.perf_counter()
+                f.write(pending)
+                f.write(body)
+                write_seconds += time.perf_counter() - start
+                written += len(pending) + len(body)
+                pending = chunk[len(body):]
+            else:
+                pending += chunk
+        closing = time.perf_counter()
+
+    if timer is not None:
+        # Flushing the buffer and renaming the file are part of the write too
+        timer.add("write", write_seconds + time.perf_counter() - closing)
+    return written
@@ -0,0 +1,125 @@
+import os
+import time
+import shutil
+import hashlib
+import logging
+import tempfile
+
+from Majd_Zarai_text_extractor.extraction_cache import HASH_CHUNK_SIZE
+
+# ─────────────────────────────────────────────────────────────
+#  UPLOADS — Streamed to disk, hashed on the way, expired on a TTL
+# ─────────────────────────────────────────────────────────────
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_ROOT = os.path.join(tempfile.gettempdir(), "majd_uploads")
+UPLOAD_DIR = os.path.join(UPLOAD_ROOT, "files")          # uploaded documents, named by content hash
+UPLOAD_IMAGE_DIR = os.path.join(UPLOAD_ROOT, "images")   # images extracted from uploaded PDFs
+
+# Keep in step with server.maxUploadSize in .streamlit/config.toml
+MAX_UPLOAD_BYTES = int(os.environ.get("MAJD_MAX_UPLOAD_MB", 200)) * 1024 * 1024
+UPLOAD_TTL = 3600  # seconds an upload and its artefacts are kept after their last use
+
+
+class UploadTooLarge(ValueError):
+    """
+    Raised when an upload is bigger than the configured maximum.
+    """
+
+
+def check_upload_size(size, max_bytes=MAX_UPLOAD_BYTES):
+    """
+    Rejects an upload from its declared size, before any of it is read.
+
+    Raises:
+        UploadTooLarge: If `size` exceeds `max_bytes`.
+    """
+    if max_bytes and size is not None and size > max_bytes:
+        raise UploadTooLarge(f"file is {size / 1024 ** 2:.1f} MB, the limit is {max_bytes / 1024 ** 2:.0f} MB")
+
+
+def save_upload(stream, filename, upload_dir=UPLOAD_DIR, max_bytes=MAX_UPLOAD_BYTES,
+                chunk_size=HASH_CHUNK_SIZE):
+    """
+    Copies an uploaded file to disk in fixed-size chunks, computing its SHA-256
+    on the way, so the upload is never held in memory a second time and never
+    has to be read again to be hashed.
+
+    The file is stored as `<upload_dir>/<sha256><ext>`: uploading the same
+    content twice reuses the first copy (and refreshes its TTL).
+
+    Args:
+        stream (file-like): Readable binary stream (e.g. Streamlit's UploadedFile).
+        filename (str): Original file name (only its extension is kept).
+        upload_dir (str): Destination folder.
+        max_bytes (int | None): Size limit, enforced while copying; None or 0 for no limit.
+        chunk_size (int): Bytes read per step.
+
+    Returns:
+        tuple[str, str, int]: Stored path, hex SHA-256 (as `hash_file` computes it) and size.
+
+    Raises:
+        UploadTooLarge: If the stream turns out bigger than `max_bytes`.
+    """
+    os.makedirs(upload_dir, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+
+    fd, tmp_path = tempfile.mkstemp(dir=upload_dir, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in iter(lambda: stream.read(chunk_size), b""):
+                size += len(chunk)
+                check_upload_size(size, max_bytes)
+                digest.update(chunk)
+                f.write(chunk)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+    content_hash = digest.hexdigest()
+    path = os.path.join(upload_dir, content_hash + os.path.splitext(filename)[1].lower())
+    if os.path.exists(path):
+        os.remove(tmp_path)
+        os.utime(path)
+        logger.info(f"[~] Duplicate upload: {filename} is already stored as {os.path.basename(path)}")
+    else:
+        os.replace(tmp_path, path)
+    return path, content_hash, size
+
+
+def purge_expired(directory, ttl=UPLOAD_TTL):
+    """
+    Deletes the files and folders directly inside `directory` that have not been
+    modified for `ttl` seconds (uploads, per-PDF image folders, stale .part files).
+
+    Args:
+        directory (str): Folder to clean; missing folders are ignored.
+        ttl (float): Age in seconds after which an entry is removed.
+
+    Returns:
+        int: Number of entries removed.
+    """
+    if not os.path.isdir(directory):
+        return 0
+
+    cutoff = time.time() - ttl
+    removed = 0
+    for entry in os.scandir(directory):
+        try:
+            if entry.stat(follow_symlinks=False).st_mtime >= cutoff:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path)
+            else:
+                os.remove(entry.path)
+            removed += 1
+        except FileNotFoundError:
+            continue  # removed by another session meanwhile
+        except OSError as e:
+            logger.warning(f"[!] Could not remove expired upload artefact {entry.path}: {e}")
+
+    if removed:
+        logger.info(f"[~] Removed {removed} expired entr{'y' if removed == 1 else 'ies'} from {directory}")
+    return removed
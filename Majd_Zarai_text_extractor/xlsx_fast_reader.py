@@ -0,0 +1,210 @@
+import re
+import zipfile
+import logging
+import posixpath
+import xml.etree.ElementTree as ET
+
+from openpyxl.utils.datetime import from_excel, WINDOWS_EPOCH, MAC_EPOCH
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+
+# ─────────────────────────────────────────────────────────────
+#  FAST PATH — Stream XLSX sheets straight from their XML parts
+# ─────────────────────────────────────────────────────────────
+
+logger = logging.getLogger(__name__)
+
+NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+CELL_REF_RE = re.compile(r"([A-Z]+)")
+
+
+def _column_index(cell_ref):
+    """
+    Converts the letters of a cell reference ('AB12') into a 0-based column index.
+    """
+    letters = CELL_REF_RE.match(cell_ref).group(1)
+    index = 0
+    for letter in letters:
+        index = index * 26 + (ord(letter) - 64)
+    return index - 1
+
+
+def _cast_number(value):
+    """
+    Same conversion openpyxl applies to numeric cells.
+    """
+    if "." in value or "E" in value or "e" in value:
+        return float(value)
+    return int(value)
+
+
+def _element_text(element):
+    """
+    Text of a shared-string or inline-string element: either a single <t>, or
+    the <t> of every rich-text run <r>. Phonetic hints (<rPh>) are ignored.
+    """
+    parts = []
+    for child in element:
+        if child.tag == f"{NS_MAIN}t":
+            parts.append(child.text or "")
+        elif child.tag == f"{NS_MAIN}r":
+            parts.extend(t.text or "" for t in child.iter(f"{NS_MAIN}t"))
+    return "".join(parts)
+
+
+def _read_shared_strings(archive):
+    """
+    Loads the shared-strings table (one entry per unique string in the workbook).
+    """
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+
+    strings = []
+    with archive.open("xl/sharedStrings.xml") as f:
+        for _, element in ET.iterparse(f):
+            if element.tag == f"{NS_MAIN}si":
+                strings.append(_element_text(element))
+                element.clear()
+    return strings
+
+
+def _read_date_styles(archive):
+    """
+    Returns {style index: 'date' | 'timedelta'} for cell styles with a date/time
+    number format, so numeric cells can be converted like openpyxl does.
+    """
+    if "xl/styles.xml" not in archive.namelist():
+        return {}
+
+    root = ET.fromstring(archive.read("xl/styles.xml"))
+    custom_formats = {
+        int(fmt.get("numFmtId")): fmt.get("formatCode")
+        for fmt in root.iter(f"{NS_MAIN}numFmt")
+    }
+
+    date_styles = {}
+    cell_xfs = root.find(f"{NS_MAIN}cellXfs")
+    if cell_xfs is None:
+        return date_styles
+
+    for index, xf in enumerate(cell_xfs.findall(f"{NS_MAIN}xf")):
+        fmt_id = int(xf.get("numFmtId", 0))
+        fmt = custom_formats.get(fmt_id, BUILTIN_FORMATS.get(fmt_id))
+        if is_timedelta_format(fmt):
+            date_styles[index] = "timedelta"
+        elif is_date_format(fmt):
+            date_styles[index] = "date"
+    return date_styles
+
+
+def _read_sheet_parts(archive):
+    """
+    Returns (epoch, [(sheet title, part name), ...]) in workbook order.
+    Chartsheets and other non-worksheet parts are left out.
+    """
+    workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+    rels = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels.iter(f"{NS_PKG_REL}Relationship")}
+
+    workbook_pr = workbook.find(f"{NS_MAIN}workbookPr")
+    date1904 = workbook_pr is not None and workbook_pr.get("date1904") in ("1", "true")
+    epoch = MAC_EPOCH if date1904 else WINDOWS_EPOCH
+
+    sheets = []
+    for sheet in workbook.iter(f"{NS_MAIN}sheet"):
+        target = targets.get(sheet.get(f"{NS_REL}id"), "")
+        if target.startswith("/"):
+            part = target.lstrip("/")
+        else:
+            part = posixpath.normpath(posixpath.join("xl", target))
+        if "worksheets/" in part:
+            sheets.append((sheet.get("name"), part))
+    return epoch, sheets
+
+
+def _iter_rows(archive, part, shared_strings, date_styles, epoch):
+    """
+    Yields each row of one worksheet as a list of Python values (None for gaps),
+    parsing the sheet XML incrementally and discarding rows once emitted.
+    """
+    with archive.open(part) as f:
+        sheet_data = None
+        next_row = 1
+
+        for event, element in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                if element.tag == f"{NS_MAIN}sheetData":
+                    sheet_data = element
+                continue
+
+            if element.tag != f"{NS_MAIN}row":
+                continue
+
+            # Rows missing from the XML are empty rows
+            row_number = int(element.get("r", next_row))
+            while next_row < row_number:
+                yield []
+                next_row += 1
+            next_row = row_number + 1
+
+            values = []
+            for position, cell in enumerate(element.iter(f"{NS_MAIN}c")):
+                ref = cell.get("r")
+                column = _column_index(ref) if ref else position
+                if column >= len(values):
+                    values.extend([None] * (column - len(values) + 1))
+
+                cell_type = cell.get("t", "n")
+                v = cell.find(f"{NS_MAIN}v")
+
+                if cell_type == "inlineStr":
+                    inline = cell.find(f"{NS_MAIN}is")
+                    value = _element_text(inline) if inline is not None else None
+                elif v is None or v.text is None:
+                    value = None
+                elif cell_type == "s":
+                    value = shared_strings[int(v.text)]
+                elif cell_type == "b":
+                    value = v.text == "1"
+                elif cell_type == "n":
+                    value = _cast_number(v.text)
+                    style = date_styles.get(int(cell.get("s", 0)))
+                    if style:
+                        value = from_excel(value, epoch, timedelta=style == "timedelta")
+                else:  # 'str' (formula result), 'e' (error), 'd' (ISO date)
+                    value = v.text
+
+                values[column] = value
+
+            yield values
+
+            # Drop the parsed row so memory stays flat on tall sheets
+            if sheet_data is not None:
+                sheet_data.clear()
+
+
+def iter_sheets_fast(file_path):
+    """
+    Fast XLSX reader that bypasses openpyxl's object model: parses the
+    workbook, shared-strings and styles parts once, then streams each sheet's
+    XML row by row.
+
+    Args:
+        file_path (str): Path to the .xlsx file.
+
+    Yields:
+        tuple[str, Iterator[list]]: Sheet title and an iterator over its rows
+        (lists of cell values). Each row iterator must be consumed before
+        moving on to the next sheet.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        epoch, sheets = _read_sheet_parts(archive)
+        shared_strings = _read_shared_strings(archive)
+        date_styles = _read_date_styles(archive)
+
+        logger.info(f"Workbook opened: {len(sheets)} sheet(s) found.")
+
+        for title, part in sheets:
+            yield title, _iter_rows(archive, part, shared_strings, date_styles, epoch)
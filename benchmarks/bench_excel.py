@@ -0,0 +1,105 @@
+# benchmarks/bench_excel.py
+
+"""
+Memory and throughput of the three XLSX reading paths in excel_handler:
+- full:      openpyxl.load_workbook() with the whole object model in memory
+- read_only: openpyxl read-only mode, rows parsed lazily
+- fast:      xlsx_fast_reader, sheet XML + shared strings parsed directly
+
+Each mode runs in its own subprocess so its peak RSS is measured in isolation.
+
+Usage:
+    python benchmarks/bench_excel.py --rows 200000 --cols 12
+    python benchmarks/bench_excel.py --file path/to/workbook.xlsx
+"""
+
+import os
+import sys
+import time
+import json
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODES = {
+    "full": {"read_only": False, "fast": False},
+    "read_only": {"read_only": True, "fast": False},
+    "fast": {"read_only": True, "fast": True},
+}
+
+
+def generate_workbook(path, rows, cols):
+    """
+    Writes a synthetic sheet mixing strings, integers, floats and repeated labels.
+    """
+    import openpyxl
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("Data")
+    sheet.append([f"Column {c}" for c in range(cols)])
+    for r in range(rows):
+        sheet.append([
+            f"label-{r % 100}" if c % 3 == 0 else (r * c if c % 3 == 1 else r / (c + 1))
+            for c in range(cols)
+        ])
+    workbook.save(path)
+
+
+def run_mode(file_path, mode):
+    """
+    Child-process entry point: streams the workbook to /dev/null and prints stats as JSON.
+    """
+    import logging
+    import resource
+    from Majd_Zarai_text_extractor.excel_handler import iter_text_from_excel
+
+    logging.disable(logging.INFO)
+    start = time.perf_counter()
+    lines = 0
+    for _ in iter_text_from_excel(file_path, **MODES[mode]):
+        lines += 1
+    elapsed = time.perf_counter() - start
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak_kb //= 1024  # macOS reports bytes
+    print(json.dumps({"seconds": elapsed, "lines": lines, "peak_rss_mb": peak_kb / 1024}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark XLSX extraction modes.")
+    parser.add_argument("--file", help="Existing .xlsx to benchmark (otherwise one is generated)")
+    parser.add_argument("--rows", type=int, default=100000, help="Rows in the generated sheet")
+    parser.add_argument("--cols", type=int, default=10, help="Columns in the generated sheet")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    parser.add_argument("--child", nargs=2, metavar=("FILE", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_mode(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = args.file
+        if not file_path:
+            file_path = os.path.join(temp_dir, "bench.xlsx")
+            generate_workbook(file_path, args.rows, args.cols)
+
+        size_mb = os.path.getsize(file_path) / (1024 * 1024)
+        print(f"{file_path}: {size_mb:.1f} MB")
+
+        for mode in args.modes:
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", file_path, mode],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            stats = json.loads(output.strip().splitlines()[-1])
+            print(f"{mode:<10} {stats['seconds']:7.2f} s  {size_mb / stats['seconds']:6.2f} MB/s  "
+                  f"{stats['lines'] / stats['seconds']:9.0f} rows/s  peak RSS {stats['peak_rss_mb']:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
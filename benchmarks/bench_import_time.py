@@ -0,0 +1,81 @@
+# benchmarks/bench_import_time.py
+
+"""
+Cold-start cost of the extractor: how long importing each entry point takes in
+a fresh interpreter, and which heavy libraries it pulls in.
+
+Each measurement runs in its own subprocess (nothing cached in sys.modules)
+and is repeated; the fastest run is reported, which filters out disk-cache
+noise. The last rows resolve and load one handler through the registry, as a
+run over files of a single type would.
+
+Usage:
+    python benchmarks/bench_import_time.py --repeat 5
+    python -X importtime -c "import extract_text_Majd_Zarai" 2> import.log   # per-module detail
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("fitz", "pymupdf", "docx", "openpyxl", "PIL.Image", "numpy", "pytesseract", "pdf2image", "tqdm")
+
+CASES = {
+    "registry": "import Majd_Zarai_text_extractor.registry",
+    "CLI module": "import extract_text_Majd_Zarai",
+    "pdf_handler": "import Majd_Zarai_text_extractor.pdf_handler",
+    "docx_handler": "import Majd_Zarai_text_extractor.docx_handler",
+    "excel_handler": "import Majd_Zarai_text_extractor.excel_handler",
+    "CLI + xlsx handler": (
+        "import extract_text_Majd_Zarai\n"
+        "from Majd_Zarai_text_extractor.registry import handler_for_extension\n"
+        "handler_for_extension('.xlsx').load('iter_text')"
+    ),
+    "CLI + pdf handler": (
+        "import extract_text_Majd_Zarai\n"
+        "from Majd_Zarai_text_extractor.registry import handler_for_extension\n"
+        "handler_for_extension('.pdf').load('process')"
+    ),
+}
+
+CHILD = """
+import sys, time, json
+start = time.perf_counter()
+exec(compile({code!r}, "<case>", "exec"))
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(code, repeat):
+    """
+    Runs `code` in `repeat` fresh interpreters; returns (fastest ms, heavy modules loaded).
+    """
+    timings, loaded = [], []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", CHILD.format(code=code, heavy=HEAVY_MODULES)],
+            cwd=ROOT, check=True, capture_output=True, text=True,
+        ).stdout
+        stats = json.loads(output.strip().splitlines()[-1])
+        timings.append(stats["ms"])
+        loaded = stats["loaded"]
+    return min(timings), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import time of the extractor entry points.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per case")
+    args = parser.parse_args()
+
+    for name, code in CASES.items():
+        ms, loaded = measure(code, args.repeat)
+        print(f"{name:<20} {ms:8.1f} ms   loads: {', '.join(loaded) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# benchmarks/bench_layout.py
+
+"""
+Compares native PDF text extraction modes, for speed and for layout quality:
+- get_text:   PyMuPDF's plain page.get_text() (the default mode)
+- layout:     LayoutExtractor (reading order, running headers/footers, tables)
+- pdfplumber: page.extract_text() as used by the old extract_text.py (if installed)
+
+Without a PDF argument a synthetic report is generated: every page has a
+running header and footer, a full-width title, two columns of paragraphs and
+a table, and its content stream is deliberately written out of reading order
+(footer first, right column before left, table cells column by column), as
+many PDF producers do. Quality is then scored against the known layout:
+
+- order:  share of consecutive paragraphs found in the right order
+- tables: share of table rows found as one tab-separated line
+- running: header/footer lines left in the text (lower is better)
+
+Usage:
+    python benchmarks/bench_layout.py --generate 30
+    python benchmarks/bench_layout.py path/to/report.pdf --pages 50
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import importlib.util
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+from corpus import sentence, WORDS
+from Majd_Zarai_text_extractor.pdf_layout import LayoutExtractor
+
+HEADER = "ACME Corporation - Quarterly report"
+TABLE_COLUMNS = 4
+TABLE_ROWS = 6
+
+
+def write_layout_pdf(path, pages, rng):
+    """
+    Writes the synthetic report and returns its ground truth: per page, the
+    paragraphs in reading order and the table rows as tab-separated lines.
+    """
+    truth = []
+    with fitz.open() as doc:
+        for page_number in range(pages):
+            page = doc.new_page()  # A4-ish 595 x 842
+            title = f"Section {page_number + 1}: " + sentence(rng, 6)
+            columns = [[sentence(rng, 14) + " " + sentence(rng, 14) for _ in range(3)] for _ in range(2)]
+            table = [[f"ROW-{page_number:03d}-{r}", rng.choice(WORDS), f"{rng.uniform(0, 999):.2f}",
+                      f"{rng.randint(1, 99)}%"] for r in range(TABLE_ROWS)]
+
+            # Footer and table first, columns right to left, header last: stream order != reading order
+            page.insert_text((270, 815), f"Page {page_number + 1} of {pages}", fontsize=8)
+            for c in range(TABLE_COLUMNS):
+                for r, row in enumerate(table):
+                    page.insert_text((72 + c * 120, 560 + r * 16), row[c], fontsize=9)
+            for column in (1, 0):
+                x0 = 72 + column * 240
+                for index, paragraph in enumerate(columns[column]):
+                    y0 = 130 + index * 120
+                    page.insert_textbox(fitz.Rect(x0, y0, x0 + 220, y0 + 110), paragraph, fontsize=9)
+            page.insert_text((72, 100), title, fontsize=14)
+            page.insert_text((72, 40), HEADER, fontsize=8)
+
+            truth.append({"paragraphs": [title] + columns[0] + columns[1],
+                          "rows": ["\t".join(row) for row in table]})
+        doc.save(path, garbage=3, deflate=True)
+    return truth
+
+
+def score(texts, truth):
+    """
+    Layout quality of the extracted page texts against the ground truth.
+    """
+    in_order = pairs = rows_found = rows = running = 0
+    for page_number, (text, expected) in enumerate(zip(texts, truth)):
+        flat = " ".join(text.split())
+        positions = [flat.find(" ".join(p.split())) for p in expected["paragraphs"]]
+        for before, after in zip(positions, positions[1:]):
+            pairs += 1
+            in_order += 0 <= before < after
+        lines = {line.strip() for line in text.splitlines()}
+        rows += len(expected["rows"])
+        rows_found += sum(row in lines for row in expected["rows"])
+        running += (page_number > 0 and HEADER in text) + (f"Page {page_number + 1} of" in text)
+    return {"order": in_order / pairs, "tables": rows_found / rows, "running": running}
+
+
+def extractors():
+    """
+    Name -> function(pdf_path, page_numbers) returning the page texts.
+    """
+    def plain(path, page_numbers):
+        with fitz.open(path) as doc:
+            return [doc[n].get_text() for n in page_numbers]
+
+    def layout(path, page_numbers):
+        extractor = LayoutExtractor()
+        with fitz.open(path) as doc:
+            return [extractor.page_text(doc[n]) for n in page_numbers]
+
+    found = {"get_text": plain, "layout": layout}
+    if importlib.util.find_spec("pdfplumber") is not None:
+        def plumber(path, page_numbers):
+            import pdfplumber
+            with pdfplumber.open(path) as pdf:
+                return [pdf.pages[n].extract_text() or "" for n in page_numbers]
+        found["pdfplumber"] = plumber
+    else:
+        print("pdfplumber is not installed: pip install pdfplumber to include it.\n")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark layout-aware PDF text extraction.")
+    parser.add_argument("pdf", nargs="?", help="PDF to extract (default: a generated synthetic report)")
+    parser.add_argument("--pages", type=int, default=None, help="Only the first N pages")
+    parser.add_argument("--generate", type=int, default=20, help="Pages of the synthetic report")
+    parser.add_argument("--seed", type=int, default=1, help="Synthetic report random seed")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes (the fastest one is kept)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        truth = None
+        path = args.pdf
+        if path is None:
+            path = os.path.join(temp_dir, "layout.pdf")
+            truth = write_layout_pdf(path, args.generate, random.Random(args.seed))
+
+        with fitz.open(path) as doc:
+            page_numbers = list(range(min(args.pages or len(doc), len(doc))))
+        print(f"{os.path.basename(path)}: {len(page_numbers)} page(s), best of {args.repeat} pass(es)\n")
+
+        for name, extract in extractors().items():
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                texts = extract(path, page_numbers)
+                timings.append((time.perf_counter() - start) * 1000)
+            best = min(timings)
+            line = f"{name:<11} {best / len(page_numbers):8.2f} ms/page  total {best / 1000:6.2f} s"
+            if truth is not None:
+                quality = score(texts, truth)
+                line += (f"  order {quality['order']:6.1%}  tables {quality['tables']:6.1%}  "
+                         f"running lines left {quality['running']}")
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/bench_ocr_render.py
+
+"""
+Compares the two page-rendering paths used before OCR:
+- pdf2image: one poppler process per page, PNG written to a temp dir and decoded again
+- pymupdf:   pixmap rendered from the already-open fitz page straight into memory
+
+Usage:
+    python benchmarks/bench_ocr_render.py path/to/scanned.pdf --pages 10 --dpi 300 [--ocr]
+
+With --ocr, Tesseract time is measured too so the rendering share of the
+total per-page latency is visible.
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+from Majd_Zarai_text_extractor.ocr_engine import get_ocr_engine
+from Majd_Zarai_text_extractor.pdf_handler import render_page_to_image, render_page_with_pdf2image
+
+
+def time_renderer(name, render, page_numbers, run_ocr, lang):
+    """
+    Renders (and optionally OCRs) each page, returning per-page timings in ms.
+    """
+    render_ms, ocr_ms = [], []
+    ocr_engine = get_ocr_engine(lang)
+    for page_number in page_numbers:
+        start = time.perf_counter()
+        image = render(page_number)
+        render_ms.append((time.perf_counter() - start) * 1000)
+
+        if run_ocr:
+            start = time.perf_counter()
+            ocr_engine.image_to_string(image)
+            ocr_ms.append((time.perf_counter() - start) * 1000)
+
+    print(f"{name:<10} render: median {statistics.median(render_ms):8.1f} ms/page, "
+          f"total {sum(render_ms) / 1000:6.2f} s")
+    if run_ocr:
+        print(f"{'':<10} ocr:    median {statistics.median(ocr_ms):8.1f} ms/page, "
+              f"total {sum(ocr_ms) / 1000:6.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF page rendering for OCR.")
+    parser.add_argument("pdf", help="PDF file to render")
+    parser.add_argument("--pages", type=int, default=10, help="Number of pages to render")
+    parser.add_argument("--dpi", type=int, default=300, help="Rendering resolution")
+    parser.add_argument("--ocr", action="store_true", help="Also time Tesseract on each rendered page")
+    parser.add_argument("--lang", default="eng", help="OCR language")
+    args = parser.parse_args()
+
+    doc = fitz.open(args.pdf)
+    page_numbers = range(min(args.pages, len(doc)))
+    print(f"{args.pdf}: {len(page_numbers)} page(s) at {args.dpi} DPI")
+
+    time_renderer("pdf2image",
+                  lambda n: render_page_with_pdf2image(args.pdf, n, dpi=args.dpi),
+                  page_numbers, args.ocr, args.lang)
+    time_renderer("pymupdf",
+                  lambda n: render_page_to_image(doc[n], dpi=args.dpi),
+                  page_numbers, args.ocr, args.lang)
+
+
+if __name__ == "__main__":
+    main()
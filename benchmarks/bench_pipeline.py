@@ -0,0 +1,221 @@
+# benchmarks/bench_pipeline.py
+
+"""
+End-to-end throughput of every handler on a synthetic corpus (see corpus.py).
+
+For each kind of document (digital PDF, scanned PDF, DOCX with large tables,
+tall and wide XLSX) a fresh subprocess extracts every file of that kind
+through the handler registry, with the extraction cache off. The script reports:
+
+- docs/s, pages/s (PDF) and MB/s of input
+- p50 / p95 per-document latency
+- peak RSS of the process
+- the time spent in each extraction stage (open, native text, render, OCR...)
+
+Results are also written as JSON (with the git commit, Python version and
+CPU count) so runs can be compared across commits with --compare.
+
+Usage:
+    python benchmarks/bench_pipeline.py --scale small --repeat 3
+    python benchmarks/bench_pipeline.py --corpus /tmp/majd_corpus --output results/after.json --compare results/before.json
+    python benchmarks/bench_pipeline.py --kinds pdf_digital xlsx_tall
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from corpus import SCALES, generate_corpus
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+
+def percentile(values, fraction):
+    """
+    Nearest-rank percentile of a non-empty list.
+    """
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def peak_rss_mb():
+    """
+    Peak resident memory of this process. On Linux VmHWM is read, because
+    ru_maxrss survives exec() and would report the parent's peak at fork time.
+    """
+    try:
+        with open("/proc/self/status", "r", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+
+    import resource
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak_kb //= 1024  # macOS reports bytes
+    return peak_kb / 1024
+
+
+def run_kind(entries, repeat):
+    """
+    Child-process entry point: extracts each file `repeat` times and prints stats as JSON.
+    """
+    import logging
+    from Majd_Zarai_text_extractor.registry import handler_for_path
+    from Majd_Zarai_text_extractor.metrics import document_timer
+
+    logging.disable(logging.WARNING)
+    latencies, pages, chars, stages_ms = [], 0, 0, {}
+    for _ in range(repeat):
+        for entry in entries:
+            handler = handler_for_path(entry["path"])
+            iter_text = handler.load("iter_text")
+            stats = {}
+            options = {"stats": stats} if handler.name == "pdf" else {}
+
+            start = time.perf_counter()
+            with document_timer() as timer:
+                for chunk in iter_text(entry["path"], **options):
+                    chars += len(chunk)
+            latencies.append((time.perf_counter() - start) * 1000)
+            pages += stats.get("pages", 0)
+            for name, ms in timer.as_ms().items():
+                stages_ms[name] = stages_ms.get(name, 0) + ms
+
+    print(json.dumps({"latencies_ms": latencies, "pages": pages, "chars": chars, "peak_rss_mb": peak_rss_mb(),
+                      "stages_ms": stages_ms}))
+
+
+def summarise(kind, entries, child, repeat):
+    """
+    Turns one child's raw timings into the reported metrics.
+    """
+    seconds = sum(child["latencies_ms"]) / 1000
+    total_bytes = sum(entry["bytes"] for entry in entries) * repeat
+    return {
+        "kind": kind,
+        "files": len(entries),
+        "repeat": repeat,
+        "input_mb": round(total_bytes / (1024 * 1024), 3),
+        "seconds": round(seconds, 3),
+        "docs_per_s": round(len(child["latencies_ms"]) / seconds, 2),
+        "pages_per_s": round(child["pages"] / seconds, 2) if child["pages"] else None,
+        "mb_per_s": round(total_bytes / (1024 * 1024) / seconds, 2),
+        "p50_ms": round(statistics.median(child["latencies_ms"]), 1),
+        "p95_ms": round(percentile(child["latencies_ms"], 0.95), 1),
+        "peak_rss_mb": round(child["peak_rss_mb"], 1),
+        "chars": child["chars"],
+        "stages_ms": {name: round(ms, 1) for name, ms in child["stages_ms"].items() if ms},
+    }
+
+
+def environment():
+    """
+    What the numbers depend on: commit, interpreter, machine.
+    """
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {
+        "commit": git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def print_comparison(results, baseline_path):
+    """
+    Prints the change of the main metrics against an earlier results file.
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {row["kind"]: row for row in json.load(f)["results"]}
+
+    print(f"\nvs {baseline_path}:")
+    for row in results:
+        before = baseline.get(row["kind"])
+        if before is None:
+            continue
+        changes = []
+        for metric in ("mb_per_s", "p50_ms", "p95_ms", "peak_rss_mb"):
+            if before.get(metric):
+                changes.append(f"{metric} {(row[metric] / before[metric] - 1):+7.1%}")
+        print(f"{row['kind']:<12} " + "  ".join(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every handler on a synthetic corpus.")
+    parser.add_argument("--corpus", help="Corpus folder (generated there if missing; default: a temp folder)")
+    parser.add_argument("--scale", choices=list(SCALES), default="small", help="Corpus size")
+    parser.add_argument("--seed", type=int, default=1, help="Corpus random seed")
+    parser.add_argument("--kinds", nargs="+", choices=list(SCALES["small"]), help="Only these kinds")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over each file")
+    parser.add_argument("--output", help="Results JSON (default: benchmarks/results/<commit>_<scale>.json)")
+    parser.add_argument("--compare", help="Earlier results JSON to compare against")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        with open(args.child, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        run_kind(entries, args.repeat)
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        corpus_dir = args.corpus or os.path.join(temp_dir, "corpus")
+        entries = generate_corpus(corpus_dir, args.scale, args.seed, args.kinds)
+
+        results = []
+        for kind in SCALES[args.scale]:
+            group = [entry for entry in entries if entry["kind"] == kind]
+            if not group:
+                continue
+            group_file = os.path.join(temp_dir, f"{kind}.json")
+            with open(group_file, "w", encoding="utf-8") as f:
+                json.dump(group, f)
+
+            completed = subprocess.run(
+                [sys.executable, __file__, "--child", group_file, "--repeat", str(args.repeat)],
+                capture_output=True, text=True,
+            )
+            if completed.returncode != 0:
+                error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "failed"
+                print(f"{kind:<12} skipped: {error}")
+                continue
+
+            row = summarise(kind, group, json.loads(completed.stdout.strip().splitlines()[-1]), args.repeat)
+            results.append(row)
+            pages = f"{row['pages_per_s']:8.1f} pages/s" if row["pages_per_s"] else " " * 15
+            print(f"{kind:<12} {row['docs_per_s']:8.2f} docs/s {pages} {row['mb_per_s']:8.2f} MB/s  "
+                  f"p50 {row['p50_ms']:8.1f} ms  p95 {row['p95_ms']:8.1f} ms  peak RSS {row['peak_rss_mb']:7.1f} MB")
+
+    env = environment()
+    output = args.output or os.path.join(RESULTS_DIR, f"{env['commit'] or 'nogit'}_{args.scale}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"environment": env, "scale": args.scale, "seed": args.seed, "results": results}, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/bench_preprocess.py
+
+"""
+Effect of the preprocessing stage (preprocess.py) on OCR time and accuracy.
+
+Pages of a PDF with a text layer are rendered, optionally degraded to look
+like scans (rotation, grey background noise, dark scanner border), then
+OCR'd twice: as rendered, and after preprocess_image(). The page's own text
+layer is the ground truth, so accuracy is the word-level similarity between
+OCR output and native text.
+
+Usage:
+    python benchmarks/bench_preprocess.py path/to/native.pdf --pages 5 --skew 2 --noise 25 --border 60
+    python benchmarks/bench_preprocess.py path/to/native.pdf --no-ocr   # preprocessing cost only
+"""
+
+import os
+import sys
+import time
+import argparse
+import difflib
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+import numpy as np
+from PIL import Image
+from Majd_Zarai_text_extractor.ocr_engine import get_ocr_engine
+from Majd_Zarai_text_extractor.pdf_handler import render_page_to_image
+from Majd_Zarai_text_extractor.preprocess import preprocess_image
+
+
+def degrade(image, skew, noise, border, seed):
+    """
+    Makes a clean render look like a scan: rotated, noisy and framed by a dark border.
+    """
+    if skew:
+        image = image.rotate(skew, resample=Image.BILINEAR, expand=True, fillcolor="white")
+    pixels = np.asarray(image.convert("L")).astype(np.int16)
+    if noise:
+        rng = np.random.default_rng(seed)
+        pixels = pixels - rng.integers(0, noise, size=pixels.shape, dtype=np.int16)
+    if border:
+        pixels[:border], pixels[-border:] = 20, 20
+        pixels[:, :border], pixels[:, -border:] = 20, 20
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).convert("RGB")
+
+
+def word_accuracy(expected, actual):
+    """
+    Similarity (0-1) of the two texts compared word by word.
+    """
+    return difflib.SequenceMatcher(None, expected.split(), actual.split(), autojunk=False).ratio()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR with and without preprocessing.")
+    parser.add_argument("pdf", help="PDF with a text layer (used as ground truth)")
+    parser.add_argument("--pages", type=int, default=5, help="Number of pages to test")
+    parser.add_argument("--dpi", type=int, default=300, help="Rendering resolution")
+    parser.add_argument("--skew", type=float, default=2.0, help="Rotation applied to each page, in degrees")
+    parser.add_argument("--noise", type=int, default=25, help="Max grey noise subtracted per pixel")
+    parser.add_argument("--border", type=int, default=60, help="Dark border width in pixels (0 for none)")
+    parser.add_argument("--no-ocr", action="store_true", help="Only measure the preprocessing itself")
+    parser.add_argument("--lang", default="eng", help="OCR language")
+    args = parser.parse_args()
+
+    ocr_engine = None if args.no_ocr else get_ocr_engine(args.lang)
+    results = {"raw": [], "preprocessed": []}
+    prep_ms, pixel_ratio, skews = [], [], []
+
+    with fitz.open(args.pdf) as doc:
+        page_numbers = range(min(args.pages, len(doc)))
+        print(f"{args.pdf}: {len(page_numbers)} page(s) at {args.dpi} DPI, "
+              f"skew {args.skew}°, noise {args.noise}, border {args.border}px")
+
+        for page_number in page_numbers:
+            page = doc[page_number]
+            truth = page.get_text()
+            image = degrade(render_page_to_image(page, dpi=args.dpi),
+                            args.skew, args.noise, args.border, page_number)
+
+            start = time.perf_counter()
+            cleaned, info = preprocess_image(image)
+            prep_ms.append((time.perf_counter() - start) * 1000)
+            pixel_ratio.append(info["output_pixels"] / info["input_pixels"])
+            skews.append(info["skew"])
+
+            if ocr_engine is None:
+                continue
+            for name, candidate in (("raw", image), ("preprocessed", cleaned)):
+                start = time.perf_counter()
+                text = ocr_engine.image_to_string(candidate)
+                elapsed = (time.perf_counter() - start) * 1000
+                results[name].append((elapsed, word_accuracy(truth, text)))
+
+    print(f"preprocess:   median {statistics.median(prep_ms):8.1f} ms/page, "
+          f"pixels kept {statistics.mean(pixel_ratio):6.1%}, "
+          f"skew found {statistics.median(skews):+.2f}° (median)")
+
+    if ocr_engine is None:
+        return
+    for name, rows in results.items():
+        ocr_ms = [ms for ms, _ in rows]
+        accuracy = [acc for _, acc in rows]
+        print(f"{name:<13} ocr: median {statistics.median(ocr_ms):8.1f} ms/page, "
+              f"word accuracy {statistics.mean(accuracy):6.1%}")
+
+
+if __name__ == "__main__":
+    main()
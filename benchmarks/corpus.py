@@ -0,0 +1,206 @@
+# benchmarks/corpus.py
+
+"""
+Synthetic, reproducible test corpus for the extraction benchmarks. Everything
+is generated offline from a seed:
+
+- pdf_digital: PDFs with a text layer, of several page counts
+- pdf_scanned: image-only PDFs (pages rendered, slightly rotated and saved
+  as JPEG, like a scanner output), which go through OCR
+- docx_tables: DOCX files with paragraphs and one large table
+- xlsx_tall:   workbooks with many rows and few columns
+- xlsx_wide:   workbooks with few rows and many columns
+
+A corpus.json file lists every generated file with its kind and size
+parameters, so the benchmark can group results by kind.
+
+Usage:
+    python benchmarks/corpus.py /tmp/majd_corpus --scale small --seed 1
+"""
+
+import os
+import io
+import json
+import random
+import argparse
+
+# Per kind, the size parameter of each generated file
+SCALES = {
+    "small": {
+        "pdf_digital": [1, 5, 20],          # pages
+        "pdf_scanned": [1, 3],              # pages
+        "docx_tables": [200, 1000],         # table rows
+        "xlsx_tall": [5000, 20000],         # rows (8 columns)
+        "xlsx_wide": [100, 300],            # columns (200 rows)
+    },
+    "medium": {
+        "pdf_digital": [1, 10, 50, 200],
+        "pdf_scanned": [1, 5, 10],
+        "docx_tables": [500, 2000, 5000],
+        "xlsx_tall": [20000, 100000],
+        "xlsx_wide": [200, 1000],
+    },
+    "large": {
+        "pdf_digital": [10, 100, 500, 1000],
+        "pdf_scanned": [5, 20, 50],
+        "docx_tables": [2000, 10000, 20000],
+        "xlsx_tall": [100000, 500000],
+        "xlsx_wide": [1000, 5000],
+    },
+}
+
+WORDS = ("extraction document invoice report table figure summary analysis page total value "
+         "change detection roadmap challenge quarterly revenue customer region product status "
+         "approved rejected pending review budget forecast meeting notes appendix reference").split()
+
+SCAN_DPI = 150
+TALL_COLUMNS = 8
+WIDE_ROWS = 200
+TABLE_COLUMNS = 6
+
+
+def sentence(rng, words=12):
+    """
+    A pseudo-random sentence from a small business vocabulary.
+    """
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def write_digital_pdf(path, pages, rng):
+    """
+    PDF with a real text layer: a title and ~40 lines of text per page.
+    """
+    import fitz
+
+    with fitz.open() as doc:
+        for page_number in range(pages):
+            page = doc.new_page()
+            page.insert_text((72, 72), f"Synthetic report - page {page_number + 1}", fontsize=16)
+            text = "\n".join(sentence(rng) for _ in range(40))
+            page.insert_textbox(fitz.Rect(72, 100, 540, 770), text, fontsize=10)
+        doc.save(path, garbage=3, deflate=True)
+
+
+def write_scanned_pdf(path, pages, rng):
+    """
+    Image-only PDF: each digital page is rendered, slightly rotated and
+    embedded as a JPEG, so there is no text layer and every page needs OCR.
+    """
+    import fitz
+    from PIL import Image
+
+    with fitz.open() as source, fitz.open() as scanned:
+        for page_number in range(pages):
+            page = source.new_page()
+            page.insert_text((72, 72), f"Scanned letter - page {page_number + 1}", fontsize=16)
+            text = "\n".join(sentence(rng, 8) for _ in range(25))
+            page.insert_textbox(fitz.Rect(72, 100, 540, 770), text, fontsize=12)
+
+            pixmap = page.get_pixmap(dpi=SCAN_DPI, colorspace=fitz.csGRAY)
+            image = Image.frombytes("L", (pixmap.width, pixmap.height), pixmap.samples)
+            image = image.rotate(rng.uniform(-1.5, 1.5), resample=Image.BILINEAR, fillcolor=255)
+            buffer = io.BytesIO()
+            image.save(buffer, format="JPEG", quality=80)
+
+            target = scanned.new_page(width=page.rect.width, height=page.rect.height)
+            target.insert_image(target.rect, stream=buffer.getvalue())
+        scanned.save(path, garbage=3, deflate=True)
+
+
+def write_docx_tables(path, rows, rng):
+    """
+    DOCX with a few paragraphs and one table of `rows` x TABLE_COLUMNS cells.
+    """
+    import docx
+
+    document = docx.Document()
+    document.add_heading("Synthetic table report", level=1)
+    for _ in range(10):
+        document.add_paragraph(sentence(rng, 20))
+
+    table = document.add_table(rows=1, cols=TABLE_COLUMNS)
+    for index, cell in enumerate(table.rows[0].cells):
+        cell.text = f"Column {index + 1}"
+    for row_number in range(rows):
+        cells = table.add_row().cells
+        cells[0].text = f"ROW-{row_number:06d}"
+        cells[1].text = rng.choice(WORDS)
+        for cell in cells[2:]:
+            cell.text = f"{rng.uniform(0, 10000):.2f}"
+    document.save(path)
+
+
+def write_xlsx(path, rows, cols, rng):
+    """
+    Workbook with one sheet of mixed strings, integers and floats.
+    """
+    import openpyxl
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet("Data")
+    sheet.append([f"Column {c + 1}" for c in range(cols)])
+    for r in range(rows):
+        sheet.append([
+            rng.choice(WORDS) if c % 3 == 0 else (r * (c + 1) if c % 3 == 1 else round(rng.random() * 1000, 3))
+            for c in range(cols)
+        ])
+    workbook.save(path)
+
+
+def generate_corpus(output_dir, scale="small", seed=1, kinds=None):
+    """
+    Writes the synthetic corpus and its corpus.json index. Files that already
+    exist (same kind, size and seed) are kept, so re-runs are cheap.
+
+    Args:
+        output_dir (str): Destination folder.
+        scale (str): Key of SCALES.
+        seed (int): Random seed; the same seed gives the same documents.
+        kinds (Iterable[str] | None): Subset of kinds to generate (default: all).
+
+    Returns:
+        list[dict]: One entry per file: path, kind, size (pages/rows/columns), bytes.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    writers = {
+        "pdf_digital": ("pages", ".pdf", write_digital_pdf),
+        "pdf_scanned": ("pages", ".pdf", write_scanned_pdf),
+        "docx_tables": ("rows", ".docx", write_docx_tables),
+        "xlsx_tall": ("rows", ".xlsx", lambda path, rows, rng: write_xlsx(path, rows, TALL_COLUMNS, rng)),
+        "xlsx_wide": ("columns", ".xlsx", lambda path, cols, rng: write_xlsx(path, WIDE_ROWS, cols, rng)),
+    }
+
+    entries = []
+    for kind, sizes in SCALES[scale].items():
+        if kinds and kind not in kinds:
+            continue
+        unit, ext, write = writers[kind]
+        for size in sizes:
+            path = os.path.join(output_dir, f"{kind}_{size}{unit[0]}_s{seed}{ext}")
+            if not os.path.exists(path):
+                print(f"  generating {os.path.basename(path)}")
+                tmp_path = path + ".tmp" + ext
+                write(tmp_path, size, random.Random(f"{seed}-{kind}-{size}"))
+                os.replace(tmp_path, path)
+            entries.append({"path": path, "kind": kind, unit: size, "bytes": os.path.getsize(path)})
+
+    with open(os.path.join(output_dir, "corpus.json"), "w", encoding="utf-8") as f:
+        json.dump({"scale": scale, "seed": seed, "files": entries}, f, indent=2)
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic document corpus for benchmarking.")
+    parser.add_argument("output_dir", help="Folder to write the corpus to")
+    parser.add_argument("--scale", choices=list(SCALES), default="small", help="Corpus size")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    parser.add_argument("--kinds", nargs="+", choices=list(SCALES["small"]), help="Only these kinds")
+    args = parser.parse_args()
+
+    entries = generate_corpus(args.output_dir, args.scale, args.seed, args.kinds)
+    total_mb = sum(entry["bytes"] for entry in entries) / (1024 * 1024)
+    print(f"{len(entries)} file(s), {total_mb:.1f} MB in {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
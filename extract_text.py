@@ -1,67 +1,77 @@
 import os
 import logging
-import pytesseract
-import pdfplumber
-from docx import Document
-from openpyxl import load_workbook
-from PIL import Image  # Required for handling images during OCR
-
-# Set up logging to both file and console for debugging and audit trail
-logging.basicConfig(level=logging.INFO, 
-                    format='%(asctime)s - %(levelname)s - %(message)s',
-                    handlers=[
-                        logging.FileHandler("extraction.log"),
-                        logging.StreamHandler()
-                    ])
+from functools import partial
+from Majd_Zarai_text_extractor.batch import run_batch
+from Majd_Zarai_text_extractor.preflight import preflight_file
+# PyMuPDF, python-docx, openpyxl and the OCR engine are imported inside each
+# extractor, so a run only loads the libraries for the file types it meets
 
 UPLOADS_DIR = "uploads"
 
-def extract_text_from_pdf(file_path):
+def extract_text_from_pdf(file_path, lang="auto"):
     """Extract text from PDF files with OCR fallback for scanned documents.
     
     First attempts direct text extraction, then falls back to OCR if no text found.
     OCR is more resource-intensive but handles scanned documents.
+    Native text is read with PyMuPDF in reading order (columns, tables as
+    tab-separated rows, running headers/footers dropped) - see pdf_layout.
+    lang is the Tesseract language string for OCR ('fra', 'ara+fra'...); 'auto'
+    picks it per page from its script and corrects rotated pages - see lang_routing.
     """
-    text = ""
+    import fitz
+    from PIL import Image
+    from Majd_Zarai_text_extractor.lang_routing import AUTO_LANG, LanguageRouter, ocr_image
+    from Majd_Zarai_text_extractor.pdf_layout import LayoutExtractor
+
+    # Collect pieces in a list and join once - repeated `text +=` is quadratic on large documents
+    parts = []
     try:
-        with pdfplumber.open(file_path) as pdf:
+        with fitz.open(file_path) as pdf:
             # First pass: Try native text extraction (faster, works for digital PDFs)
-            for page in pdf.pages:
-                page_text = page.extract_text()
+            layout = LayoutExtractor()
+            for page in pdf:
+                page_text = layout.page_text(page)
                 if page_text:
-                    text += page_text + "\n"
+                    parts.append(page_text + "\n")
             
             # Second pass: If no text found, PDF might be scanned/image-based
             # Fall back to OCR which is slower but can handle image-based PDFs
-            if not text.strip():
+            if not "".join(parts).strip():
                 logging.info(f"No text directly extracted from {file_path}. Attempting OCR.")
                 # TODO: Consider setting tesseract path in a config file instead of hardcoding
                 # pytesseract.pytesseract.tesseract_cmd = r'/usr/local/bin/tesseract'
-                full_ocr_text = ""
-                for i, page in enumerate(pdf.pages):
+                ocr_parts = []
+                # Long-lived Tesseract instances (tesserocr) when available, pytesseract otherwise;
+                # in 'auto' mode each page is OCR'd with the language pack of its own script
+                router = LanguageRouter() if lang == AUTO_LANG else None
+                for i, page in enumerate(pdf):
                     try:
                         # Convert page to image at 300dpi - tradeoff between quality and performance
                         # Higher resolution = better OCR but slower processing and more memory usage
-                        im = page.to_image(resolution=300)
-                        
-                        # Default to English - in production, consider language detection
-                        # or allowing language specification via parameters
-                        page_ocr_text = pytesseract.image_to_string(im.original, lang='eng')
+                        pixmap = page.get_pixmap(dpi=300, alpha=False)
+                        im = Image.frombytes("RGB", (pixmap.width, pixmap.height), pixmap.samples)
+
+                        page_ocr_text = ocr_image(im, lang, dpi=300, router=router)
                         if page_ocr_text:
-                            full_ocr_text += page_ocr_text + "\n"
+                            ocr_parts.append(page_ocr_text + "\n")
                         logging.info(f"OCR processed page {i+1} of {file_path}")
+                    except TimeoutError:
+                        # The batch's per-file limit ran out: give up on the file, not just this page
+                        raise
                     except Exception as ocr_page_error:
                         # Continue processing other pages even if one fails
                         logging.error(f"Error during OCR for page {i+1} of {file_path}: {ocr_page_error}")
-                text = full_ocr_text
-                if text.strip():
+                parts = ocr_parts
+                if "".join(parts).strip():
                     logging.info(f"Successfully extracted text using OCR from {file_path}")
                 else:
                     logging.warning(f"OCR attempt on {file_path} yielded no text.")
 
+    except TimeoutError:
+        raise
     except Exception as e:
         logging.error(f"Error processing PDF file {file_path}: {e}")
-    return text.strip()
+    return "".join(parts).strip()
 
 def extract_text_from_docx(file_path):
     """Extract text from Word documents (.docx).
@@ -69,15 +79,19 @@ def extract_text_from_docx(file_path):
     Extracts text from paragraphs only. Does not handle tables, headers, footers,
     or other special elements - extend if needed for your specific documents.
     """
-    text = ""
+    from docx import Document
+
+    parts = []
     try:
         doc = Document(file_path)
         for para in doc.paragraphs:
-            text += para.text + "\n"
+            parts.append(para.text + "\n")
         # TODO: I will be adding support for tables, headers, footers if needed
+    except TimeoutError:
+        raise
     except Exception as e:
         logging.error(f"Error processing DOCX file {file_path}: {e}")
-    return text.strip()
+    return "".join(parts).strip()
 
 def extract_text_from_xlsx(file_path):
     """Extract text from Excel spreadsheets (.xlsx).
@@ -85,27 +99,63 @@ def extract_text_from_xlsx(file_path):
     Uses read_only and data_only modes for better performance with large files.
     Preserves row structure but not cell formatting or formulas.
     """
-    text = ""
+    from openpyxl import load_workbook
+
+    parts = []
     try:
         # read_only=True improves performance for large files
         # data_only=True gets calculated values instead of formulas
-        workbook = load_workbook(filename=file_path, read_only=True, data_only=True)
-        for sheet_name in workbook.sheetnames:
-            sheet = workbook[sheet_name]
-            for row in sheet.iter_rows():
-                for cell in row:
-                    if cell.value is not None:
-                        text += str(cell.value) + " "
-                text += "\n"
+        # A file object (not the path) so a mis-named workbook is not refused for its extension
+        with open(file_path, "rb") as f:
+            workbook = load_workbook(f, read_only=True, data_only=True)
+            for sheet_name in workbook.sheetnames:
+                sheet = workbook[sheet_name]
+                for row in sheet.iter_rows():
+                    for cell in row:
+                        if cell.value is not None:
+                            parts.append(str(cell.value) + " ")
+                    parts.append("\n")
+            workbook.close()
+    except TimeoutError:
+        raise
     except Exception as e:
         logging.error(f"Error processing XLSX file {file_path}: {e}")
-    return text.strip()
+    return "".join(parts).strip()
+
+# Format name in the package's handler registry -> extractor in this script
+EXTRACTORS = {
+    "pdf": extract_text_from_pdf,
+    "docx": extract_text_from_docx,
+    "xlsx": extract_text_from_xlsx,
+}
+
+def extract_text_from_file(file_path, lang="auto"):
+    """Dispatch a single file to the appropriate handler based on its type.
 
-def process_files_in_uploads():
+    The type comes from the file's content (preflight check), not its extension,
+    so a mis-named file still reaches the right extractor.
+    Returns None for unsupported or damaged files so the caller can tell "skipped" apart
+    from "nothing extracted". Kept at module level so worker processes can pickle it.
+    lang is the OCR language for PDFs (see extract_text_from_pdf).
+    """
+    check = preflight_file(file_path)
+    extractor = EXTRACTORS.get(check.format) if check.ok else None
+    if extractor is None:
+        return None
+    if check.format == "pdf":
+        return extractor(file_path, lang=lang)
+    return extractor(file_path)
+
+def process_files_in_uploads(max_workers=1, timeout=None, lang="auto"):
     """Process all supported files in the uploads directory.
     
     Supports PDF, DOCX, and XLSX files. Returns a dictionary mapping
     filenames to their extracted text content.
+
+    max_workers > 1 spreads files over a process pool (0 = one per CPU), and
+    timeout caps the wall-clock seconds spent on any single file, and lang sets
+    the OCR language of scanned PDFs ('auto' detects it per page).
+    A file that runs out of time is logged as an error and left out of the result.
     """
     if not os.path.exists(UPLOADS_DIR):
         logging.error(f"Directory not found: {UPLOADS_DIR}")
@@ -117,33 +167,34 @@ def process_files_in_uploads():
         print(f"No files found in '{UPLOADS_DIR}'. Add some .pdf, .docx, or .xlsx files to process.")
         return
 
-    extracted_data = {}
+    file_paths = []
     for filename in os.listdir(UPLOADS_DIR):
         file_path = os.path.join(UPLOADS_DIR, filename)
-        if os.path.isfile(file_path):
-            logging.info(f"Processing file: {filename}")
-            extracted_text = ""
-            
-            # Dispatch to appropriate handler based on file extension
-            # Could be refactored to use a strategy pattern for more file types
-            if filename.lower().endswith(".pdf"):
-                extracted_text = extract_text_from_pdf(file_path)
-            elif filename.lower().endswith(".docx"):
-                extracted_text = extract_text_from_docx(file_path)
-            elif filename.lower().endswith(".xlsx"):
-                extracted_text = extract_text_from_xlsx(file_path)
-            else:
-                logging.info(f"Skipping unsupported file type: {filename}")
-                continue
-            
-            if extracted_text:
-                extracted_data[filename] = extracted_text
-                # Uncomment for debugging or to see full text output
-                # print(f"--- Text from {filename} ---\n{extracted_text}\n---------------------------\n")
+        if not os.path.isfile(file_path):
+            logging.info(f"Skipping non-file item: {filename}")
+        else:
+            # Cheap content check: junk and corrupt files never reach a worker
+            check = preflight_file(file_path)
+            if check.ok:
+                file_paths.append(file_path)
             else:
-                logging.warning(f"No text extracted from {filename}")
+                logging.info(f"Skipping {filename}: {check.reason}")
+
+    extracted_data = {}
+
+    def collect(file_path, extracted_text, error):
+        filename = os.path.basename(file_path)
+        if error is not None:
+            logging.error(f"Error processing file {filename}: {error}")
+        elif extracted_text:
+            extracted_data[filename] = extracted_text
+            # Uncomment for debugging or to see full text output
+            # print(f"--- Text from {filename} ---\n{extracted_text}\n---------------------------\n")
         else:
-            logging.info(f"Skipping non-file item: {filename}")
+            logging.warning(f"No text extracted from {filename}")
+
+    logging.info(f"Processing {len(file_paths)} file(s) with max_workers={max_workers}")
+    run_batch(file_paths, partial(extract_text_from_file, lang=lang), collect, max_workers=max_workers, timeout=timeout)
     
     # In a real pipeline, we might want to save to a database or pass to NLP processing
     if extracted_data:
@@ -158,12 +209,22 @@ def process_files_in_uploads():
     return extracted_data
 
 if __name__ == "__main__":
+    # Set up logging to both file and console for debugging and audit trail
+    logging.basicConfig(level=logging.INFO, 
+                        format='%(asctime)s - %(levelname)s - %(message)s',
+                        handlers=[
+                            logging.FileHandler("extraction.log"),
+                            logging.StreamHandler()
+                        ])
+
     # Tesseract dependency check - this is a common source of issues
     # Installation instructions for reference:
     # macOS: brew install tesseract
     # Ubuntu: apt-get install tesseract-ocr
     # Windows: https://github.com/UB-Mannheim/tesseract/wiki
     
+    import pytesseract
+
     try:
         tesseract_version = pytesseract.get_tesseract_version()
         logging.info(f"Tesseract version {tesseract_version} found.")
@@ -1,107 +1,516 @@
-# extract_text_Majd_Zarai.py
-
-"""
-Main script to extract text from documents (.pdf, .docx, .xlsx).
-- PDF: uses PyMuPDF with OCR fallback (pytesseract)
-- DOCX: extracts paragraphs, tables, and metadata
-- XLSX: parses each sheet with optional empty row control
-
-Output is saved as: majd_zarai_<filename>_cleaned.txt
-"""
-
-import os
-import logging
-
-# Import enhanced extractors
-from Majd_Zarai_text_extractor.pdf_handler import extract_text_from_pdf_enhanced
-from Majd_Zarai_text_extractor.pdf_handler import  extract_images_from_pdf
-from Majd_Zarai_text_extractor.docx_handler import extract_text_from_docx_enhanced
-from Majd_Zarai_text_extractor.excel_handler import extract_text_from_excel_enhanced
-
-
-
-# Define folders
-INPUT_DIR = "uploads"
-OUTPUT_DIR = "extracted_texts"
-
-# Logger configuration
-logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
-logger = logging.getLogger(__name__)
-
-
-def save_text(original_filename: str, content: str):
-    """
-    Save extracted text to the output directory with custom naming:
-    majd_zarai_<filename>_cleaned.txt
-
-    Args:
-        original_filename (str): Base name of the file (without extension).
-        content (str): Text content to be saved.
-    """
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    output_filename = f"majd_zarai_{original_filename}_cleaned.txt"
-    output_path = os.path.join(OUTPUT_DIR, output_filename)
-
-    try:
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(content)
-        logger.info(f"[✓] Output saved to: {output_path}")
-    except Exception as e:
-        logger.error(f"[✗] Failed to write output file: {output_path} – {e}")
-
-
-def extract_all_files():
-    """
-    Process all supported files in the uploads directory:
-    - Dispatches to correct handler based on file extension
-    - Logs activity and results
-    - Skips unsupported file types
-    """
-    # Check input folder exists
-    if not os.path.exists(INPUT_DIR):
-        logger.error(f"[!] Input directory '{INPUT_DIR}' does not exist.")
-        return
-
-    files = os.listdir(INPUT_DIR)
-    if not files:
-        logger.warning("[!] No files found in the uploads directory.")
-        return
-
-    # Process each file
-    for file in files:
-        file_path = os.path.join(INPUT_DIR, file)
-        filename, ext = os.path.splitext(file.lower())
-
-        logger.info(f"[~] Processing: {file}")
-
-        try:
-            # Match by file extension
-            if ext == ".pdf":
-                text = extract_text_from_pdf_enhanced(file_path)
-                extract_images_from_pdf(file_path) # ← image extraction call
-            elif ext == ".docx":
-                text = extract_text_from_docx_enhanced(file_path, include_metadata=True)
-            elif ext == ".xlsx":
-                text = extract_text_from_excel_enhanced(file_path, include_empty=False)
-            else:
-                logger.warning(f"[!] Unsupported file type: {ext} — Skipping '{file}'")
-                continue
-
-            # Save cleaned output
-            if text:
-                save_text(filename, text)
-            else:
-                logger.warning(f"[!] No content extracted from: {file}")
-
-        except Exception as e:
-            logger.error(f"[✗] Exception while processing '{file}': {e}")
-
-
-# ─────────────────────────────
-# ▶ Entrypoint
-# ─────────────────────────────
-
-if __name__ == "__main__":
-    logger.info(" Starting document extraction...")
-    extract_all_files()
-    logger.info(" All files processed. Output saved to 'extracted_texts/'.")
+# extract_text_Majd_Zarai.py
+
+"""
+Main script to extract text from documents (.pdf, .docx, .xlsx).
+- PDF: uses PyMuPDF with OCR fallback (pytesseract)
+- DOCX: extracts paragraphs, tables, and metadata
+- XLSX: parses each sheet with optional empty row control
+
+Output is saved as: majd_zarai_<stem>_<ext>_<hash>_cleaned.txt, or packed into
+compressed JSON Lines shards with --sink jsonl
+"""
+
+import os
+import time
+import hashlib
+import argparse
+import logging
+from functools import partial
+from contextlib import nullcontext
+
+# Handlers are looked up in the registry and only imported when a file of their type shows up
+from Majd_Zarai_text_extractor.registry import get_handler, handler_for_path
+from Majd_Zarai_text_extractor.preflight import preflight_file
+from Majd_Zarai_text_extractor.batch import run_batch, write_batch_report
+from Majd_Zarai_text_extractor.structured_output import TableWriter
+from Majd_Zarai_text_extractor.output_sinks import ShardedJsonlSink, SHARD_MAX_BYTES
+from Majd_Zarai_text_extractor.metrics import RunMetrics, document_timer, serve_metrics
+from Majd_Zarai_text_extractor.ingest_manifest import IngestManifest, MANIFEST_PATH, scan_directory
+from Majd_Zarai_text_extractor.extraction_cache import (
+    ExtractionCache, cached_extract, cached_extract_to_file, get_caches, hash_file, DEFAULT_CACHE_DIR,
+    DEFAULT_MAX_BYTES, HANDLER_SETTINGS
+)
+
+
+
+# Define folders
+INPUT_DIR = "uploads"
+OUTPUT_DIR = "extracted_texts"
+REPORT_PATH = os.path.join(OUTPUT_DIR, "majd_zarai_batch_report.json")
+PROFILE_PATH = os.path.join(OUTPUT_DIR, "majd_zarai_profile.prof")
+PROFILE_TOP = 25  # functions listed in the log after a --profile run
+
+# Watch mode: seconds between two scans, and how long a file must be left
+# untouched before it is picked up (so half-copied files are not extracted)
+WATCH_INTERVAL = 10
+WATCH_SETTLE_SECONDS = 5
+
+logger = logging.getLogger(__name__)
+
+
+def output_name_for(file_name: str) -> str:
+    """
+    Build a collision-free name for a document's outputs: <stem>_<ext>_<hash>,
+    e.g. report_pdf_1c2f6a0b. The stem is lowercased for readability; the
+    extension and a short hash of the exact file name keep `Report.pdf`,
+    `report.pdf` and `report.docx` apart.
+
+    Args:
+        file_name (str): File name of the source document (with its extension).
+
+    Returns:
+        str: Name shared by its text file, tables file and shard record ID.
+    """
+    stem, ext = os.path.splitext(file_name)
+    digest = hashlib.sha1(file_name.encode("utf-8")).hexdigest()[:8]
+    return f"{stem.lower()}_{ext.lstrip('.').lower()}_{digest}"
+
+
+def output_path_for(file_name: str) -> str:
+    """
+    Build the output path for a document: <OUTPUT_DIR>/majd_zarai_<stem>_<ext>_<hash>_cleaned.txt
+
+    Args:
+        file_name (str): File name of the source document (with its extension).
+
+    Returns:
+        str: Path of the cleaned text file (the output folder is created if needed).
+    """
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    output_filename = f"majd_zarai_{output_name_for(file_name)}_cleaned.txt"
+    return os.path.join(OUTPUT_DIR, output_filename)
+
+
+def extract_single_file(file_path: str, cache_dir=None, cache_max_bytes=DEFAULT_MAX_BYTES,
+                        structured=False, adaptive_dpi=False, preprocess=False, layout=False, lang="auto",
+                        routes=None, to_file=True, content_hash=None):
+    """
+    Dispatch one file to the correct handler based on its type and stream
+    the handler's output straight into its majd_zarai_<stem>_<ext>_<hash>_cleaned.txt file
+    (written atomically). Runs inside a worker process when the batch is parallel.
+
+    Args:
+        file_path (str): Path to the input file.
+        cache_dir (str | None): Extraction cache directory, or None to bypass the cache.
+        cache_max_bytes (int): Size limit of the cache (documents and OCR pages) before LRU eviction.
+        structured (bool): Also write sheets/tables as typed JSON Lines to
+            majd_zarai_<stem>_<ext>_<hash>_tables.jsonl (needs a full pass, so the text cache is bypassed).
+        adaptive_dpi (bool): OCR PDF pages at low DPI first and retry only uncertain pages at full DPI.
+        preprocess (bool): Grayscale, crop, deskew and binarise PDF pages before OCR.
+        layout (bool): Layout-aware PDF text: reading order, no running headers/footers,
+            tables as tab-separated rows.
+        lang (str): Tesseract language(s) for OCR pages, or 'auto' to pick them per page.
+        routes (dict | None): {file_path: format name} for files whose content does not
+            match their extension (found by the preflight check).
+        to_file (bool): Write the text file; False returns the text itself instead
+            (for output sinks that pack documents together).
+        content_hash (str | None): Precomputed `hash_file(file_path)`, if already known.
+
+    Returns:
+        str | None: Path of the saved output (or the text, with to_file=False),
+        "" if nothing was extracted, or None if the file type is unsupported.
+    """
+    output_name = output_name_for(os.path.basename(file_path))
+    format_name = (routes or {}).get(file_path)
+    handler = get_handler(format_name) if format_name else handler_for_path(file_path)
+    if handler is None:
+        return None
+    settings = HANDLER_SETTINGS[handler.extension]
+    if handler.name == "pdf":
+        settings = {**settings, "adaptive_dpi": adaptive_dpi, "preprocess": preprocess, "layout": layout,
+                    "lang": lang}
+
+    # One pair of caches per worker process, shared by all its documents
+    cache, page_cache = get_caches(cache_dir, cache_max_bytes) if cache_dir else (None, None)
+    output_path = output_path_for(os.path.basename(file_path)) if to_file else None
+
+    table_writer = None
+    if structured and handler.name in ("docx", "xlsx"):
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        table_writer = TableWriter(os.path.join(OUTPUT_DIR, f"majd_zarai_{output_name}_tables.jsonl"))
+        cache = None
+
+    if handler.has("process"):
+        # PDF: text, OCR and images in one pass over the document
+        result = handler.load("process")(file_path, settings, output_path=output_path, cache=cache,
+                                         page_cache=page_cache, content_hash=content_hash,
+                                         image_root_dir=os.path.join(OUTPUT_DIR, "majd_extracted_images_from_pdf"),
+                                         image_name=output_name)
+        if not to_file:
+            return result.text or ""
+        return output_path if result.has_text else ""
+
+    # The handler settings double as its keyword arguments
+    options = {key: value for key, value in settings.items() if key != "handler"}
+    if table_writer is not None:
+        options["table_writer"] = table_writer
+    iter_fn = partial(handler.load("iter_text"), file_path, **options)
+
+    # The tables file is only kept if the extraction completes
+    with table_writer if table_writer is not None else nullcontext():
+        if not to_file:
+            text, _ = cached_extract(file_path, lambda: "\n".join(iter_fn()).strip(), settings, cache,
+                                     content_hash)
+            return text or ""
+        has_text, _ = cached_extract_to_file(file_path, iter_fn, settings, output_path, cache, content_hash)
+
+    return output_path if has_text else ""
+
+
+def extract_single_file_timed(file_path, hash_content=False, **options):
+    """
+    `extract_single_file` plus its wall-clock time and the time spent in each
+    extraction stage (open, native text, render, OCR...), measured in the worker.
+
+    Args:
+        file_path (str): Path to the input file.
+        hash_content (bool): Hash the file here, in the worker, and return the hash
+            (for the ingest manifest); the cache lookup reuses it.
+        **options: Passed on to `extract_single_file`.
+
+    Returns:
+        tuple[str | None, float, dict, str | None]: The output path (see
+        extract_single_file), elapsed milliseconds, {stage: milliseconds} and
+        the content hash (None unless `hash_content`).
+    """
+    start = time.perf_counter()
+    with document_timer() as timer:
+        content_hash = hash_file(file_path) if hash_content else None
+        output_path = extract_single_file(file_path, content_hash=content_hash, **options)
+    return output_path, (time.perf_counter() - start) * 1000, timer.as_ms(), content_hash
+
+
+def extract_all_files(max_workers=1, timeout=None, use_cache=True,
+                      cache_dir=DEFAULT_CACHE_DIR, cache_max_bytes=DEFAULT_MAX_BYTES, structured=False,
+                      adaptive_dpi=False, preprocess=False, layout=False, lang="auto", report_path=REPORT_PATH,
+                      incremental=False, manifest_path=MANIFEST_PATH, min_age=0,
+                      sink="files", compression="auto", shard_max_bytes=SHARD_MAX_BYTES, metrics=None):
+    """
+    Process all supported files in the uploads directory:
+    - Checks each file's real format and integrity first, rejecting junk and
+      corrupt files and re-routing mis-named ones
+    - Dispatches to the registered handler for each file type (imported on first use)
+    - Optionally spreads files over a process pool (largest PDFs first)
+    - Streams each document's text straight to its output file
+    - Logs activity and results, and times every extraction stage per document
+      and per format (added to the batch report)
+    - Skips unsupported file types
+    - In incremental mode, skips files already recorded in the ingest manifest
+      as done with the same size, mtime, extractor version and settings, resumes
+      files an interrupted run left pending, and retries failures with backoff
+
+    Args:
+        max_workers (int): Worker processes to use. 1 = sequential, 0 = one per CPU.
+        timeout (float | None): Wall-clock limit per file, in seconds.
+        use_cache (bool): Reuse text from earlier runs for unchanged files.
+        cache_dir (str): Extraction cache directory.
+        cache_max_bytes (int): Cache size limit before LRU eviction.
+        structured (bool): Also write spreadsheets and DOCX tables as typed JSON Lines.
+        adaptive_dpi (bool): Low-DPI OCR first, full-DPI retry only for low-confidence pages.
+        preprocess (bool): Clean OCR pages up (crop, deskew, binarise) before Tesseract.
+        layout (bool): Rebuild the reading order of PDF pages, drop running
+            headers/footers and emit tables as tab-separated rows.
+        lang (str): Tesseract language(s) for OCR, e.g. 'fra' or 'ara+fra', or 'auto'
+            to detect the language and rotation of each OCR page.
+        report_path (str | None): Where to write the JSON batch report (None to skip it).
+        incremental (bool): Only extract new, changed, pending or due-for-retry files.
+        manifest_path (str): SQLite ingest manifest used in incremental mode.
+        min_age (float): In incremental mode, leave files modified less than this
+            many seconds ago for a later run.
+        sink (str): 'files' for one text file per document, 'jsonl' to pack all
+            documents into compressed JSON Lines shards with an offset index.
+        compression (str): Shard codec: 'auto', 'zstd', 'gzip' or 'none'.
+        shard_max_bytes (int): Compressed size at which a new shard is started.
+        metrics (RunMetrics | None): Also add this run's stage timings to these
+            (e.g. the ones behind a --metrics-port endpoint, kept across watch passes).
+
+    Returns:
+        dict | None: Batch counters, or None if there was nothing to do.
+    """
+    # Check input folder exists
+    if not os.path.exists(INPUT_DIR):
+        logger.error(f"[!] Input directory '{INPUT_DIR}' does not exist.")
+        return
+
+    files = scan_directory(INPUT_DIR)
+    if not files:
+        logger.warning("[!] No files found in the uploads directory.")
+        return
+
+    # Everything that changes the output of a run; a file is redone when it changes
+    run_settings = {"structured": structured, "adaptive_dpi": adaptive_dpi, "preprocess": preprocess,
+                    "layout": layout, "lang": lang}
+    manifest = None
+    skipped = {}
+    if incremental:
+        manifest = IngestManifest(manifest_path)
+        files, skipped = manifest.plan(files, run_settings, min_age=min_age)
+        if not files:
+            logger.debug(f"[~] Nothing new to extract ({dict(skipped)}).")
+            manifest.close()
+            return None
+        logger.info(f"[~] Incremental run: {len(files)} file(s) to extract ({skipped['resumed']} resumed), "
+                    f"{skipped['unchanged']} unchanged, {skipped['backoff']} waiting to retry, "
+                    f"{skipped['gave_up']} given up, {skipped['settling']} still being written.")
+        manifest.begin(files, run_settings)
+
+    supported = []
+    routes = {}
+    records = {}
+    run_metrics = RunMetrics()
+    for entry in files:
+        file_path = entry.path
+        file = os.path.basename(file_path)
+        check = preflight_file(file_path)
+        records[file_path] = {"file": file, "format": check.format, "declared": check.declared,
+                              "preflight_ms": round(check.elapsed_ms, 2)}
+
+        if not check.ok:
+            logger.warning(f"[!] Rejected '{file}': {check.reason}")
+            records[file_path].update(status="rejected", reason=check.reason)
+            if manifest is not None:
+                manifest.record(file_path, "rejected", error=check.reason, file_format=check.format)
+            continue
+
+        if check.rerouted:
+            logger.warning(f"[!] '{file}' is really a {check.format.upper()} file — routing it to the "
+                           f"{check.format} handler")
+        elif check.reason:
+            logger.info(f"[~] '{file}': {check.reason}")
+        if check.format != check.declared:
+            routes[file_path] = check.format
+        records[file_path]["reason"] = check.reason
+        supported.append(file_path)
+
+    def record_in_manifest(file_path, record):
+        if manifest is not None:
+            manifest.record(file_path, record["status"], error=record.get("error"), output=record.get("output"),
+                            file_format=record["format"], elapsed_ms=record.get("elapsed_ms"),
+                            content_hash=record.get("content_hash"))
+
+    # Packed documents are only recorded as done once their shard is sealed on disk,
+    # so an interrupted run extracts them again instead of losing them
+    shard_sink = None
+    awaiting_seal = {}  # document ID -> file path
+    if sink == "jsonl":
+        def on_seal(shard_name, doc_ids):
+            for doc_id in doc_ids:
+                file_path = awaiting_seal.pop(doc_id)
+                record_in_manifest(file_path, records[file_path])
+
+        shard_sink = ShardedJsonlSink(OUTPUT_DIR, compression=compression, shard_max_bytes=shard_max_bytes,
+                                      on_seal=on_seal)
+
+    def handle_result(file_path, result, error):
+        file = os.path.basename(file_path)
+        record = records[file_path]
+
+        if error is not None:
+            if isinstance(error, TimeoutError):
+                logger.error(f"[✗] Timed out after {timeout}s while processing '{file}'")
+                record["status"] = "timed_out"
+            else:
+                logger.error(f"[✗] Exception while processing '{file}': {error}")
+                record["status"] = "failed"
+            record["error"] = str(error)
+        else:
+            # Output was written by the worker
+            output_path, record["elapsed_ms"], record["stages_ms"], content_hash = result
+            if content_hash:
+                record["content_hash"] = content_hash
+            for collector in (run_metrics, metrics):
+                if collector is not None:
+                    collector.add(file, record["format"], record["stages_ms"], record["elapsed_ms"])
+            if output_path and shard_sink is not None:
+                # The worker returned the text itself
+                doc_id = output_name_for(file)
+                shard_name = shard_sink.write(doc_id, output_path, source=file, format=record["format"])
+                logger.info(f"[✓] '{file}' packed into: {shard_name}")
+                record.update(status="processed", output=f"{os.path.join(OUTPUT_DIR, shard_name)}#{doc_id}")
+                awaiting_seal[doc_id] = file_path
+                return
+            if output_path:
+                logger.info(f"[✓] Output saved to: {output_path}")
+                record.update(status="processed", output=output_path)
+            else:
+                logger.warning(f"[!] No content extracted from: {file}")
+                record["status"] = "empty"
+
+        record_in_manifest(file_path, record)
+
+    extract_fn = partial(extract_single_file_timed,
+                         cache_dir=cache_dir if use_cache else None,
+                         cache_max_bytes=cache_max_bytes,
+                         structured=structured,
+                         adaptive_dpi=adaptive_dpi,
+                         preprocess=preprocess,
+                         layout=layout,
+                         lang=lang,
+                         routes=routes,
+                         to_file=shard_sink is None,
+                         hash_content=manifest is not None)
+    try:
+        summary = run_batch(supported, extract_fn, handle_result,
+                            max_workers=max_workers, timeout=timeout)
+    finally:
+        if shard_sink is not None:
+            shard_sink.close()
+        if manifest is not None:
+            manifest.close()
+    summary["rejected"] = len(records) - len(supported)
+    summary["skipped"] = sum(count for reason, count in skipped.items() if reason != "resumed")
+    logger.info(f"[~] Batch summary: {summary['processed']} processed, "
+                f"{summary['failed']} failed, {summary['timed_out']} timed out, "
+                f"{summary['rejected']} rejected, {summary['skipped']} skipped.")
+    run_metrics.log_summary()
+
+    if report_path:
+        write_batch_report(report_path, list(records.values()), summary, run_metrics.report())
+    return summary
+
+
+def watch_uploads(poll_interval=WATCH_INTERVAL, settle_seconds=WATCH_SETTLE_SECONDS, **options):
+    """
+    Extracts new and changed files continuously: rescans the uploads folder
+    every `poll_interval` seconds and runs an incremental pass over it. Polling
+    (a scandir plus one manifest read) works on every OS and on network mounts,
+    where inotify events are not delivered.
+
+    Args:
+        poll_interval (float): Seconds between two scans.
+        settle_seconds (float): Age a file must reach before it is picked up.
+        **options: Passed on to `extract_all_files`.
+    """
+    logger.info(f"[~] Watching '{INPUT_DIR}' every {poll_interval}s (Ctrl+C to stop).")
+    try:
+        while True:
+            extract_all_files(incremental=True, min_age=settle_seconds, **options)
+            time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        logger.info("[~] Watch stopped.")
+
+
+def profile_run(run, profile_path=PROFILE_PATH, top=PROFILE_TOP):
+    """
+    Runs `run()` under cProfile, saves the raw stats (for snakeviz or
+    `python -m pstats`) and logs the functions with the highest cumulative time.
+
+    Only the calling process is profiled, so run with --workers 1 to see the
+    extraction itself; for a parallel batch, a sampling profiler that follows
+    child processes (e.g. `py-spy record --subprocesses`) is the better tool.
+
+    Args:
+        run (callable): The work to profile.
+        profile_path (str): Where to write the .prof file.
+        top (int): Number of functions to log.
+
+    Returns:
+        The return value of `run()`.
+    """
+    import io
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(run)
+    finally:
+        os.makedirs(os.path.dirname(profile_path) or ".", exist_ok=True)
+        profiler.dump_stats(profile_path)
+        listing = io.StringIO()
+        pstats.Stats(profiler, stream=listing).sort_stats("cumulative").print_stats(top)
+        logger.info(f"[~] Profile written to: {profile_path}\n{listing.getvalue()}")
+
+
+def parse_args():
+    """
+    Command-line options for the extraction run.
+    """
+    parser = argparse.ArgumentParser(description="Extract text from documents in the uploads folder.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes (1 = sequential, 0 = one per CPU).")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Wall-clock limit per file in seconds.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Bypass the extraction cache and re-extract every file.")
+    parser.add_argument("--purge-cache", action="store_true",
+                        help="Delete the extraction cache before running.")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help="Extraction cache directory.")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="Cache size limit in MB, documents and OCR pages together "
+                             "(least recently used entries are evicted).")
+    parser.add_argument("--report", default=REPORT_PATH,
+                        help="JSON batch report with the status (and rejection reason) of every file.")
+    parser.add_argument("--preprocess", action="store_true",
+                        help="Crop borders, deskew and binarise scanned pages before OCR.")
+    parser.add_argument("--adaptive-dpi", action="store_true",
+                        help="OCR pages at 150 DPI first and re-OCR at 300 DPI only when Tesseract is unsure.")
+    parser.add_argument("--lang", default=HANDLER_SETTINGS[".pdf"]["lang"],
+                        help="Tesseract language(s) for OCR pages, e.g. 'fra' or 'ara+fra'; 'auto' (default) "
+                             "detects each page's script and language and corrects its rotation.")
+    parser.add_argument("--layout", action="store_true",
+                        help="Read PDF pages in reading order (columns, tables as tab-separated rows) "
+                             "without running headers and footers.")
+    parser.add_argument("--structured", action="store_true",
+                        help="Also write sheets and DOCX tables as typed JSON Lines (majd_zarai_<name>_tables.jsonl).")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Skip files already extracted (per the ingest manifest); resume and retry the rest.")
+    parser.add_argument("--manifest", default=MANIFEST_PATH,
+                        help="SQLite ingest manifest used by --incremental and --watch.")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and extract new or changed files as they arrive (implies --incremental).")
+    parser.add_argument("--poll-interval", type=float, default=WATCH_INTERVAL,
+                        help="Seconds between two scans of the uploads folder in --watch mode.")
+    parser.add_argument("--sink", choices=("files", "jsonl"), default="files",
+                        help="'files': one text file per document; 'jsonl': pack documents into compressed, "
+                             "indexed JSON Lines shards (far fewer files).")
+    parser.add_argument("--compression", choices=("auto", "zstd", "gzip", "none"), default="auto",
+                        help="Shard compression for --sink jsonl (auto = zstd if installed, else gzip).")
+    parser.add_argument("--shard-mb", type=int, default=SHARD_MAX_BYTES // (1024 * 1024),
+                        help="Compressed shard size in MB before a new shard is started.")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve per-stage timings in the Prometheus text format on "
+                             "http://127.0.0.1:<port>/metrics while the run (or --watch) lasts.")
+    parser.add_argument("--profile", nargs="?", const=PROFILE_PATH, default=None, metavar="PATH",
+                        help=f"Run under cProfile and save the stats (default: {PROFILE_PATH}); "
+                             "use with --workers 1.")
+    return parser.parse_args()
+
+
+# ─────────────────────────────
+# ▶ Entrypoint
+# ─────────────────────────────
+
+if __name__ == "__main__":
+    # Logger configuration
+    logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
+
+    args = parse_args()
+    if args.purge_cache:
+        ExtractionCache(args.cache_dir).purge()
+    options = dict(max_workers=args.workers, timeout=args.timeout,
+                   use_cache=not args.no_cache, cache_dir=args.cache_dir,
+                   cache_max_bytes=args.cache_max_mb * 1024 * 1024,
+                   structured=args.structured, adaptive_dpi=args.adaptive_dpi,
+                   preprocess=args.preprocess, layout=args.layout, lang=args.lang,
+                   report_path=args.report, manifest_path=args.manifest,
+                   sink=args.sink, compression=args.compression, shard_max_bytes=args.shard_mb * 1024 * 1024)
+    if args.metrics_port:
+        options["metrics"] = RunMetrics()
+        serve_metrics(options["metrics"], port=args.metrics_port)
+
+    def run():
+        if args.watch:
+            watch_uploads(poll_interval=args.poll_interval, **options)
+        else:
+            logger.info(" Starting document extraction...")
+            extract_all_files(incremental=args.incremental, **options)
+            logger.info(" All files processed. Output saved to 'extracted_texts/'.")
+
+    if args.profile:
+        if args.workers != 1:
+            logger.warning("[!] --profile only sees this process; use --workers 1 to profile the extraction.")
+        profile_run(run, args.profile)
+    else:
+        run()
@@ -1,9 +1,27 @@
 import streamlit as st
 import os
-import tempfile
-from Majd_Zarai_text_extractor.pdf_handler import extract_text_from_pdf_enhanced, extract_images_from_pdf
-from Majd_Zarai_text_extractor.docx_handler import extract_text_from_docx_enhanced
-from Majd_Zarai_text_extractor.excel_handler import extract_text_from_excel_enhanced
+import time
+import logging
+from Majd_Zarai_text_extractor.job_service import BackgroundService, HttpServiceClient, ServiceBusy
+from Majd_Zarai_text_extractor.uploads import (
+    UPLOAD_DIR, UPLOAD_IMAGE_DIR, UploadTooLarge, check_upload_size, purge_expired, save_upload
+)
+
+# Seconds between two status checks while a document is being extracted
+POLL_INTERVAL = 0.5
+
+# OCR language choices for scanned pages -> Tesseract language string
+# ('auto' detects each page's script and language, and straightens rotated pages)
+OCR_LANGUAGES = {
+    "Auto-detect": "auto",
+    "English": "eng",
+    "French": "fra",
+    "Arabic": "ara",
+    "Arabic + French": "ara+fra",
+}
+
+# The app is the entry point, so it owns the logging setup (no-op on Streamlit reruns)
+logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
 
 st.set_page_config(page_title="Majd Zarai - Document Intelligence", layout="wide")
 
@@ -74,37 +92,77 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_extraction_service():
+    """
+    One job service per Streamlit server: uploads from every session share its
+    bounded queue and worker processes, so a burst of users cannot start more
+    extractions than the machine has workers for. Set MAJD_EXTRACTOR_URL to use a
+    service started with `python -m Majd_Zarai_text_extractor.job_service` instead.
+    The service uses the same extraction cache as the CLI; images of uploaded
+    PDFs go to UPLOAD_IMAGE_DIR/<content hash>_images, where they expire with
+    the uploads (two different uploads called scan.pdf never share a folder).
+    """
+    service_url = os.environ.get("MAJD_EXTRACTOR_URL")
+    if service_url:
+        return HttpServiceClient(service_url)
+    return BackgroundService(image_root_dir=UPLOAD_IMAGE_DIR).start()
+
+
 uploaded_file = st.file_uploader("Upload your document", type=["pdf", "docx", "xlsx"])
+ocr_language = OCR_LANGUAGES[st.selectbox("OCR language for scanned pages", list(OCR_LANGUAGES))]
 
 if uploaded_file:
-    filetype = uploaded_file.type
     filename = uploaded_file.name
     base_filename = os.path.splitext(filename)[0].replace(" ", "_")
+    service = get_extraction_service()
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=filename) as tmp_file:
-        tmp_file.write(uploaded_file.read())
-        tmp_path = tmp_file.name
-
-    with st.spinner("🔍 Processing your document..."):
-        text = ""
-        image_dir = None
+    # Streamlit reruns this script on every interaction: submit each upload only once
+    # (and again if another OCR language is picked for it)
+    submission_id = (uploaded_file.file_id, ocr_language)
+    if st.session_state.get("upload_id") != submission_id:
+        # Uploads and extracted images left by earlier sessions expire after UPLOAD_TTL
+        purge_expired(UPLOAD_DIR)
+        purge_expired(UPLOAD_IMAGE_DIR)
 
         try:
-            if filetype == "application/pdf":
-                text = extract_text_from_pdf_enhanced(tmp_path)
-                extract_images_from_pdf(tmp_path)
-                image_dir = f"extracted_texts/majd_extracted_images_from_pdf/{base_filename}_images"
-
-            elif filetype == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-                text = extract_text_from_docx_enhanced(tmp_path)
-
-            elif filetype == "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet":
-                text = extract_text_from_excel_enhanced(tmp_path)
-
-            else:
-                st.error("Unsupported file type.")
-        except Exception as e:
-            st.error(f" Error processing file: {e}")
+            # Oversized files are refused before anything is copied or parsed
+            check_upload_size(uploaded_file.size)
+            # Copied to disk in chunks and hashed on the way; the same content uploaded
+            # again is answered by its earlier job, without a second extraction
+            upload_path, content_hash, _ = save_upload(uploaded_file, filename)
+            st.session_state["job_id"] = service.submit(upload_path, display_name=filename,
+                                                        settings={"lang": ocr_language},
+                                                        content_hash=content_hash)
+            st.session_state["upload_id"] = submission_id
+        except UploadTooLarge as e:
+            st.error(f" File too large: {e}")
+            st.stop()
+        except ServiceBusy:
+            st.warning("⏳ The extractor is busy with other documents. Please try again in a moment.")
+            st.stop()
+
+    # Poll the job; pages are reported as they are finished
+    progress_bar = st.progress(0.0, text="🔍 Waiting for a free worker...")
+    job = service.status(st.session_state["job_id"])
+    while job is not None and job["state"] in ("queued", "running"):
+        done, total = job["progress"]["done"], job["progress"]["total"]
+        if job["state"] == "running":
+            progress_bar.progress(done / total if total else 0.0,
+                                  text=f"🔍 Processing your document... page {done}/{total}" if total
+                                  else "🔍 Processing your document...")
+        time.sleep(POLL_INTERVAL)
+        job = service.status(st.session_state["job_id"])
+    progress_bar.empty()
+
+    text = ""
+    if job is None:
+        st.session_state.pop("upload_id", None)
+        st.error(" This extraction has expired. Please upload the file again.")
+    elif job["state"] == "failed":
+        st.error(f" Error processing file: {job['error']}")
+    else:
+        text = job["result"]["text"]
 
     # ────────────────────────────────
     # Show Extracted Text
@@ -116,6 +174,4 @@ if uploaded_file:
 
         # Download
         cleaned_filename = f"majd_zarai_{base_filename}_cleaned.txt"
-        st.download_button(" Download Extracted Text", data=text, file_name=cleaned_filename)
-
-    
\ No newline at end of file
+        st.download_button(" Download Extracted Text", data=text, file_name=cleaned_filename)
\ No newline at end of file
@@ -0,0 +1,272 @@
+# tests/test_docx_fast_reader.py
+
+"""
+docx_fast_reader: `iter_blocks` on hand-written WordprocessingML parts, and
+`DocxPackage` on a small generated .docx archive.
+"""
+
+import io
+import zipfile
+import itertools
+
+import docx
+
+from Majd_Zarai_text_extractor.docx_fast_reader import DocxPackage, iter_blocks
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+MC = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+
+def part(body, root="document"):
+    """
+    A WordprocessingML part as a stream; `body` is the XML inside the root
+    element (inside <w:body> for a document).
+    """
+    inner = f"<w:body>{body}</w:body>" if root == "document" else body
+    return io.BytesIO(f'<w:{root} xmlns:w="{W}" xmlns:mc="{MC}">{inner}</w:{root}>'.encode("utf-8"))
+
+
+def p(*runs):
+    return "<w:p>" + "".join(f"<w:r>{run}</w:r>" for run in runs) + "</w:p>"
+
+
+def t(text):
+    return f'<w:t xml:space="preserve">{text}</w:t>'
+
+
+def tc(content, props=""):
+    return f"<w:tc><w:tcPr>{props}</w:tcPr>{content}</w:tc>"
+
+
+def tr(*cells, props=""):
+    return f"<w:tr>{props}{''.join(cells)}</w:tr>"
+
+
+def tbl(*rows):
+    return f"<w:tbl><w:tblGrid/>{''.join(rows)}</w:tbl>"
+
+
+def blocks(body, **kwargs):
+    return list(iter_blocks(part(body, **kwargs)))
+
+
+def test_paragraph_runs_tabs_and_breaks():
+    body = (p(t("Hello "), t("world")) +
+            p(t("a"), "<w:tab/>", t("b"), "<w:br/>", t("c")) +
+            p(t("   ")))
+
+    assert blocks(body) == [("paragraph", "Hello world"), ("paragraph", "a\tb\nc")]
+
+
+def test_deleted_text_and_field_codes_are_left_out():
+    body = p(t("kept "), "<w:delText>deleted</w:delText>",
+             '<w:fldChar w:fldCharType="begin"/>', "<w:instrText> PAGE </w:instrText>",
+             '<w:fldChar w:fldCharType="end"/>', t("text"))
+
+    assert blocks(body) == [("paragraph", "kept text")]
+
+
+def test_horizontally_merged_cell_is_given_once():
+    body = tbl(tr(tc(p(t("Span")), '<w:gridSpan w:val="2"/>'), tc(p(t("C")))),
+               tr(tc(p(t("a"))), tc(p(t("b"))), tc(p(t("c")))))
+
+    assert blocks(body) == [
+        ("table", 1),
+        ("row", ["Span", "", "C"]),
+        ("row", ["a", "b", "c"]),
+        ("end_table", 1),
+    ]
+
+
+def test_vertically_merged_cell_is_given_once():
+    body = tbl(tr(tc(p(t("Merged")), '<w:vMerge w:val="restart"/>'), tc(p(t("1")))),
+               tr(tc(p(), "<w:vMerge/>"), tc(p(t("2")))))
+
+    assert blocks(body) == [
+        ("table", 1),
+        ("row", ["Merged", "1"]),
+        ("row", ["", "2"]),
+        ("end_table", 1),
+    ]
+
+
+def test_grid_before_and_empty_rows():
+    body = tbl(tr(tc(p(t("x"))), props='<w:trPr><w:gridBefore w:val="1"/></w:trPr>'),
+               tr(tc(p()), tc(p())))
+
+    assert blocks(body) == [("table", 1), ("row", ["", "x"]), ("end_table", 1)]
+
+
+def test_nested_table_follows_its_outer_table():
+    inner = tbl(tr(tc(p(t("in 1"))), tc(p(t("in 2")))))
+    body = (p(t("Before")) +
+            tbl(tr(tc(p(t("outer A")) + inner), tc(p(t("outer B")))),
+                tr(tc(p(t("outer C"))), tc(p(t("outer D"))))) +
+            p(t("After")))
+
+    assert blocks(body) == [
+        ("paragraph", "Before"),
+        ("table", 1),
+        ("row", ["outer A", "outer B"]),
+        ("row", ["outer C", "outer D"]),
+        ("end_table", 1),
+        ("table", 2),
+        ("row", ["in 1", "in 2"]),
+        ("end_table", 2),
+        ("paragraph", "After"),
+    ]
+
+
+def test_table_numbers_are_shared_between_parts():
+    numbers = itertools.count(1)
+    first = list(iter_blocks(part(tbl(tr(tc(p(t("a")))))), numbers))
+    second = list(iter_blocks(part(tbl(tr(tc(p(t("b")))))), numbers))
+
+    assert first[0] == ("table", 1)
+    assert second[0] == ("table", 2)
+
+
+def text_box(*paragraphs):
+    """
+    A DrawingML text box with its VML fallback copy, as Word saves it.
+    """
+    content = "".join(paragraphs)
+    return ("<mc:AlternateContent>"
+            f"<mc:Choice Requires=\"wps\"><w:drawing><w:txbxContent>{content}</w:txbxContent></w:drawing></mc:Choice>"
+            f"<mc:Fallback><w:pict><w:txbxContent>{content}</w:txbxContent></w:pict></mc:Fallback>"
+            "</mc:AlternateContent>")
+
+
+def test_text_box_follows_its_anchor_paragraph_once():
+    body = p(t("Anchor"), text_box(p(t("Boxed 1")), p(t("Boxed 2")))) + p(t("Next"))
+
+    assert blocks(body) == [
+        ("paragraph", "Anchor"),
+        ("paragraph", "Boxed 1"),
+        ("paragraph", "Boxed 2"),
+        ("paragraph", "Next"),
+    ]
+
+
+def test_text_box_in_table_cell_joins_the_cell_text():
+    body = tbl(tr(tc(p(t("Cell"), text_box(p(t("box")))))))
+
+    assert blocks(body) == [("table", 1), ("row", ["Cell box"]), ("end_table", 1)]
+
+
+def test_footnotes_skip_separators():
+    notes = ('<w:footnote w:type="separator" w:id="-1">' + p("<w:separator/>") + "</w:footnote>"
+             '<w:footnote w:type="continuationSeparator" w:id="0">' + p(t("---")) + "</w:footnote>"
+             '<w:footnote w:id="1">' + p(t("First note")) + p(t("continued")) + "</w:footnote>"
+             '<w:footnote w:id="2">' + p() + "</w:footnote>")
+
+    assert blocks(notes, root="footnotes") == [("paragraph", "[1] First note continued")]
+
+
+def test_header_part():
+    header = p(t("Company")) + tbl(tr(tc(p(t("Ref"))), tc(p(t("42")))))
+
+    assert blocks(header, root="hdr") == [
+        ("paragraph", "Company"),
+        ("table", 1),
+        ("row", ["Ref", "42"]),
+        ("end_table", 1),
+    ]
+
+
+def rels(*targets):
+    entries = "".join(
+        f'<Relationship Id="rId{index}" Type="{REL_TYPE}/{kind}" Target="{target}"{extra}/>'
+        for index, (kind, target, extra) in enumerate(targets, 1))
+    return f'<Relationships xmlns="{PKG_REL}">{entries}</Relationships>'
+
+
+def write_docx(path, parts):
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        for name, data in parts.items():
+            archive.writestr(name, data.getvalue() if isinstance(data, io.BytesIO) else data)
+
+
+def test_package_finds_headers_footers_and_notes(tmp_path, caplog):
+    path = tmp_path / "parts.docx"
+    write_docx(path, {
+        "_rels/.rels": rels(("officeDocument", "word/document.xml", "")),
+        "word/document.xml": part(p(t("Body")) + tbl(tr(tc(p(t("x")))))),
+        "word/_rels/document.xml.rels": rels(
+            ("header", "header10.xml", ""),
+            ("header", "header2.xml", ""),
+            ("footer", "/word/footer1.xml", ""),
+            ("footnotes", "footnotes.xml", ""),
+            ("endnotes", "endnotes.xml", ""),
+            ("hyperlink", "https://example.com", ' TargetMode="External"'),
+            ("styles", "styles.xml", "")),
+        "word/header2.xml": part(tbl(tr(tc(p(t("h")))))),
+        "word/header10.xml": part(p(t("Header ten")), root="hdr"),
+        "word/footer1.xml": part(p(t("Page footer")), root="ftr"),
+        "word/footnotes.xml": part('<w:footnote w:id="1">' + p(t("Note")) + "</w:footnote>", root="footnotes"),
+        "docProps/core.xml": (
+            '<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties"'
+            ' xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/">'
+            "<dc:title> Report </dc:title><dc:creator>Majd</dc:creator>"
+            "<dcterms:created>2024-05-01T09:30:00Z</dcterms:created></cp:coreProperties>"),
+    })
+
+    with DocxPackage(path) as package:
+        assert package.parts == {
+            "body": ["word/document.xml"],
+            "header": ["word/header2.xml", "word/header10.xml"],
+            "footer": ["word/footer1.xml"],
+            "footnotes": ["word/footnotes.xml"],
+            "endnotes": ["word/endnotes.xml"],
+        }
+        assert package.core_properties() == {"title": "Report", "author": "Majd", "created": "2024-05-01"}
+
+        numbers = itertools.count(1)
+        body = list(package.iter_part("word/document.xml", numbers))
+        header = list(package.iter_part("word/header2.xml", numbers))
+        assert body == [("paragraph", "Body"), ("table", 1), ("row", ["x"]), ("end_table", 1)]
+        assert header == [("table", 2), ("row", ["h"]), ("end_table", 2)]
+        assert list(package.iter_part("word/footnotes.xml")) == [("paragraph", "[1] Note")]
+
+        # endnotes.xml is listed but not in the archive
+        assert list(package.iter_part("word/endnotes.xml")) == []
+        assert "missing from the archive" in caplog.text
+
+
+def test_package_without_core_properties(tmp_path):
+    path = tmp_path / "bare.docx"
+    write_docx(path, {"word/document.xml": part(p(t("Only body")))})
+
+    with DocxPackage(path) as package:
+        assert package.parts == {"body": ["word/document.xml"]}
+        assert package.core_properties() == {"title": "", "author": "", "created": ""}
+        assert list(package.iter_part(package.main_part)) == [("paragraph", "Only body")]
+
+
+def test_python_docx_document(tmp_path):
+    document = docx.Document()
+    document.core_properties.title = "Generated"
+    document.sections[0].header.paragraphs[0].text = "Running header"
+    document.add_paragraph("Intro")
+    table = document.add_table(rows=2, cols=3)
+    table.cell(0, 0).merge(table.cell(0, 1)).text = "Wide"
+    table.cell(0, 2).text = "Right"
+    for column, value in enumerate(("a", "b", "c")):
+        table.cell(1, column).text = value
+    path = tmp_path / "generated.docx"
+    document.save(path)
+
+    with DocxPackage(path) as package:
+        assert package.core_properties()["title"] == "Generated"
+        assert list(package.iter_part(package.main_part)) == [
+            ("paragraph", "Intro"),
+            ("table", 1),
+            ("row", ["Wide", "", "Right"]),
+            ("row", ["a", "b", "c"]),
+            ("end_table", 1),
+        ]
+        headers = [block for header in package.parts["header"] for block in package.iter_part(header)]
+        assert ("paragraph", "Running header") in headers
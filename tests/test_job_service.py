@@ -0,0 +1,88 @@
+# tests/test_job_service.py
+
+"""
+The job service: a small native-text PDF run through BackgroundService, and
+the HTTP endpoint driven through HttpServiceClient against a server on a free
+local port.
+"""
+
+import time
+import asyncio
+import shutil
+import threading
+
+import fitz
+import pytest
+
+from Majd_Zarai_text_extractor.job_service import BackgroundService, ExtractionService, HttpServiceClient
+from Majd_Zarai_text_extractor.uploads import UploadTooLarge
+
+
+def wait_for(service, job_id, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = service.status(job_id)
+        if job["state"] in ("done", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} still {job['state']} after {timeout}s")
+
+
+def test_finished_job_snapshot(tmp_path):
+    path = tmp_path / "three pages.pdf"
+    doc = fitz.open()
+    for number in range(1, 4):
+        doc.new_page().insert_text((72, 72), f"Page {number} of a native text document. " * 3)
+    doc.save(path)
+    doc.close()
+
+    service = BackgroundService(max_workers=1, cache_dir=None, image_root_dir=str(tmp_path / "images")).start()
+    try:
+        job = wait_for(service, service.submit(str(path)))
+    finally:
+        service.stop()
+
+    assert job["state"] == "done", job["error"]
+    assert job["progress"] == {"done": 3, "total": 3}
+    assert "path" not in job
+    assert "Page 3 of a native text document." in job["result"]["text"]
+
+
+@pytest.fixture
+def http_service():
+    """
+    An ExtractionService listening on 127.0.0.1 with a 1 MB upload limit; the
+    worker pool is not started, so only requests refused up front are served.
+    """
+    service = ExtractionService(max_workers=1, max_upload_bytes=1024 ** 2)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    server = asyncio.run_coroutine_threadsafe(service.serve_http("127.0.0.1", 0), loop).result()
+    port = server.sockets[0].getsockname()[1]
+    yield HttpServiceClient(f"http://127.0.0.1:{port}", timeout=10)
+
+    server.close()
+    asyncio.run_coroutine_threadsafe(server.wait_closed(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
+    shutil.rmtree(service._upload_dir, ignore_errors=True)
+
+
+def test_oversized_upload_raises_upload_too_large(http_service, tmp_path):
+    path = tmp_path / "big.pdf"
+    path.write_bytes(b"\0" * 8 * 1024 ** 2)
+
+    with pytest.raises(UploadTooLarge, match="MB"):
+        http_service.submit(str(path))
+    assert path.exists()
+
+
+def test_oversized_upload_is_removed_with_cleanup(http_service, tmp_path):
+    path = tmp_path / "big.pdf"
+    path.write_bytes(b"\0" * 2 * 1024 ** 2)
+
+    with pytest.raises(UploadTooLarge):
+        http_service.submit(str(path), cleanup=True)
+    assert not path.exists()
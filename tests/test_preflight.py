@@ -0,0 +1,162 @@
+# tests/test_preflight.py
+
+"""
+preflight_file on small generated PDFs, DOCX and XLSX files, and on the
+truncated, mis-named and junk files it has to turn away.
+"""
+
+import zipfile
+
+import docx
+import fitz
+import openpyxl
+import pytest
+
+from Majd_Zarai_text_extractor.preflight import OLE_SIGNATURE, preflight_file
+
+
+@pytest.fixture
+def pdf_bytes():
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Preflight")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture
+def docx_bytes(tmp_path):
+    path = tmp_path / "source.docx"
+    document = docx.Document()
+    document.add_paragraph("Preflight")
+    document.save(path)
+    return path.read_bytes()
+
+
+@pytest.fixture
+def xlsx_bytes(tmp_path):
+    path = tmp_path / "source.xlsx"
+    workbook = openpyxl.Workbook()
+    workbook.active["A1"] = "Preflight"
+    workbook.save(path)
+    return path.read_bytes()
+
+
+def check(tmp_path, name, data):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return preflight_file(str(path))
+
+
+def test_valid_files(tmp_path, pdf_bytes, docx_bytes, xlsx_bytes):
+    for name, data, format_name in (("a.pdf", pdf_bytes, "pdf"), ("a.docx", docx_bytes, "docx"),
+                                    ("a.xlsx", xlsx_bytes, "xlsx")):
+        result = check(tmp_path, name, data)
+        assert (result.ok, result.format, result.declared, result.reason) == (True, format_name, format_name, "")
+        assert not result.rerouted
+        assert result.elapsed_ms >= 0
+
+
+def test_misnamed_files_are_rerouted(tmp_path, pdf_bytes, docx_bytes, xlsx_bytes):
+    for name, data, format_name in (("report.pdf", docx_bytes, "docx"), ("sheet.docx", xlsx_bytes, "xlsx"),
+                                    ("scan.xlsx", pdf_bytes, "pdf")):
+        result = check(tmp_path, name, data)
+        assert result.ok and result.rerouted
+        assert result.format == format_name
+
+
+def test_unknown_extension_is_not_rerouted(tmp_path, pdf_bytes):
+    result = check(tmp_path, "download.bin", pdf_bytes)
+
+    assert result.ok and result.format == "pdf" and result.declared is None
+    assert not result.rerouted
+
+
+def test_pdf_header_after_leading_junk(tmp_path, pdf_bytes):
+    assert check(tmp_path, "junk.pdf", b"\x00" * 500 + pdf_bytes).ok
+    assert not check(tmp_path, "far.pdf", b"\x00" * 2000 + pdf_bytes).ok
+
+
+def test_truncated_pdf(tmp_path, pdf_bytes):
+    result = check(tmp_path, "cut.pdf", pdf_bytes[:len(pdf_bytes) // 2])
+
+    assert not result.ok and result.format == "pdf"
+    assert result.reason.startswith("truncated PDF: no %%EOF")
+
+
+def test_pdf_without_startxref(tmp_path):
+    result = check(tmp_path, "noxref.pdf", b"%PDF-1.7\n1 0 obj\n<<>>\nendobj\n%%EOF\n")
+
+    assert not result.ok
+    assert result.reason == "damaged PDF: no startxref before %%EOF"
+
+
+def test_pdf_startxref_past_the_end(tmp_path):
+    result = check(tmp_path, "short.pdf", b"%PDF-1.7\nstartxref\n999999\n%%EOF\n")
+
+    assert not result.ok
+    assert "past the end of the file" in result.reason
+
+
+def test_pdf_startxref_off_target_is_repairable(tmp_path, pdf_bytes):
+    head, _, tail = pdf_bytes.rpartition(b"startxref")
+    offset = tail.split()[0]
+    broken = head + b"startxref" + tail.replace(offset, b"10", 1)
+
+    result = check(tmp_path, "shifted.pdf", broken)
+    assert result.ok
+    assert "will be repaired on open" in result.reason
+
+
+def test_damaged_ooxml(tmp_path, docx_bytes):
+    source = tmp_path / "source.docx"
+
+    missing = tmp_path / "missing.docx"
+    with zipfile.ZipFile(source) as original, zipfile.ZipFile(missing, "w") as copy:
+        for item in original.infolist():
+            if item.filename != "word/document.xml":
+                copy.writestr(item, original.read(item))
+    result = preflight_file(str(missing))
+    assert not result.ok and result.format == "docx"
+    assert result.reason == "damaged DOCX: 'word/document.xml' is missing"
+
+    result = check(tmp_path, "cut.docx", docx_bytes[:len(docx_bytes) // 2])
+    assert not result.ok
+    assert result.reason.startswith("truncated or corrupt ZIP container")
+
+
+def test_zip_that_is_not_a_word_or_excel_file(tmp_path):
+    plain = tmp_path / "plain.docx"
+    with zipfile.ZipFile(plain, "w") as archive:
+        archive.writestr("readme.txt", "hello")
+    result = preflight_file(str(plain))
+    assert not result.ok
+    assert "without [Content_Types].xml" in result.reason
+
+    slides = tmp_path / "slides.docx"
+    with zipfile.ZipFile(slides, "w") as archive:
+        archive.writestr("[Content_Types].xml",
+                         '<Types><Override PartName="/ppt/presentation.xml" ContentType="application/'
+                         'vnd.openxmlformats-officedocument.presentationml.presentation.main+xml"/></Types>')
+    result = preflight_file(str(slides))
+    assert not result.ok and result.format is None
+    assert "neither a Word document nor an Excel workbook" in result.reason
+
+
+@pytest.mark.parametrize("name, data, reason", [
+    ("empty.pdf", b"", "empty file"),
+    ("legacy.docx", OLE_SIGNATURE + b"\x00" * 504, "legacy binary Office file"),
+    ("page.pdf", b"<html><body>Not found</body></html>", "unrecognised content"),
+])
+def test_rejected_content(tmp_path, name, data, reason):
+    result = check(tmp_path, name, data)
+
+    assert not result.ok and result.format is None
+    assert result.reason.startswith(reason)
+
+
+def test_missing_file(tmp_path):
+    result = preflight_file(str(tmp_path / "gone.pdf"))
+
+    assert not result.ok and result.declared == "pdf"
+    assert result.reason.startswith("unreadable")
@@ -0,0 +1,90 @@
+# tests/test_rotation.py
+
+"""
+OSD rotation -> PIL transpose mapping, for both OCR backends.
+
+Tesseract is stubbed: each fake reports a page scanned turned `turned`
+degrees clockwise the way Tesseract does, i.e. `orient_deg = turned` from
+the C API (tesserocr) and `Rotate: (360 - turned) % 360` in the `--psm 0`
+text output (pytesseract). Both must give back the upright page.
+"""
+
+import sys
+import types
+
+import pytest
+from PIL import Image
+
+from Majd_Zarai_text_extractor import lang_routing, ocr_engine
+from Majd_Zarai_text_extractor.lang_routing import LanguageRouter, rotate_upright
+
+TURNS = (0, 90, 180, 270)
+
+
+def upright_page():
+    """
+    A portrait page with a mark in its top-left corner, so every rotation
+    and mirror of it is a different image.
+    """
+    page = Image.new("L", (60, 90), 255)
+    page.paste(0, (5, 5, 25, 15))
+    return page
+
+
+def scanned(turned):
+    # PIL rotates counter-clockwise
+    return upright_page().rotate(-turned, expand=True)
+
+
+def pytesseract_engine(turned):
+    fake = types.SimpleNamespace(Output=types.SimpleNamespace(DICT="dict"))
+    fake.image_to_osd = lambda image, output_type: {
+        "rotate": str((360 - turned) % 360), "orientation_conf": "9.5", "script": "Latin", "script_conf": "4.2"}
+    engine = ocr_engine.PytesseractEngine.__new__(ocr_engine.PytesseractEngine)
+    engine._pytesseract, engine.lang = fake, ocr_engine.OSD_LANG
+    return engine
+
+
+def tesserocr_engine(turned, monkeypatch):
+    class FakeApi:
+        def __init__(self, lang, psm=None):
+            pass
+
+        def SetImage(self, image):
+            pass
+
+        def DetectOrientationScript(self):
+            return {"orient_deg": turned, "orient_conf": 9.5, "script_name": "Latin", "script_conf": 4.2}
+
+    fake = types.SimpleNamespace(PyTessBaseAPI=FakeApi, PSM=types.SimpleNamespace(OSD_ONLY=0))
+    monkeypatch.setitem(sys.modules, "tesserocr", fake)
+    return ocr_engine.TesserocrEngine(ocr_engine.OSD_LANG, size=1)
+
+
+@pytest.fixture(params=["pytesseract", "tesserocr"])
+def make_engine(request, monkeypatch):
+    if request.param == "pytesseract":
+        return pytesseract_engine
+    return lambda turned: tesserocr_engine(turned, monkeypatch)
+
+
+@pytest.mark.parametrize("turned", TURNS)
+def test_osd_rotation_makes_page_upright(make_engine, turned):
+    page = scanned(turned)
+    osd = make_engine(turned).detect_orientation_script(page)
+
+    assert osd["rotate"] == (360 - turned) % 360
+    assert rotate_upright(page, osd["rotate"]).tobytes() == upright_page().tobytes()
+
+
+@pytest.mark.parametrize("turned", TURNS)
+def test_router_turns_page_upright(make_engine, turned, monkeypatch):
+    engine = make_engine(turned)
+    monkeypatch.setattr(lang_routing, "available_languages", lambda backend: frozenset({"eng", "osd"}))
+    monkeypatch.setattr(lang_routing, "get_ocr_engine", lambda lang, backend: engine)
+
+    image, route = LanguageRouter().prepare(scanned(turned), dpi=150)
+
+    assert route.rotate == (360 - turned) % 360
+    assert image.size == upright_page().size
+    assert image.tobytes() == upright_page().tobytes()
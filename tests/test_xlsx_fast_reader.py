@@ -0,0 +1,161 @@
+# tests/test_xlsx_fast_reader.py
+
+"""
+xlsx_fast_reader: the rows `iter_sheets_fast` streams from a generated
+workbook must hold the same values openpyxl reads, and the hand-written
+parts openpyxl never produces (inline and rich-text strings, 1904 dates,
+chartsheets) are covered separately.
+"""
+
+import re
+import zipfile
+import datetime
+
+import openpyxl
+import pytest
+from openpyxl.chart import BarChart, Reference
+
+from Majd_Zarai_text_extractor.excel_handler import _iter_sheets_openpyxl, extract_text_from_excel
+from Majd_Zarai_text_extractor.xlsx_fast_reader import _column_index, iter_sheets_fast
+
+MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+
+def read_fast(path):
+    return [(title, [list(row) for row in rows]) for title, rows in iter_sheets_fast(path)]
+
+
+def trimmed(row):
+    row = list(row)
+    while row and row[-1] is None:
+        row.pop()
+    return row
+
+
+@pytest.fixture
+def workbook_path(tmp_path):
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Scores"
+    sheet.append(["EP", "Score", "Ratio", "Passed", "Date", "Time", "Duration"])
+    sheet.append(["EP-1", 3, 1.5, True, datetime.datetime(2024, 5, 1, 9, 30),
+                  datetime.time(14, 5), datetime.timedelta(hours=1, minutes=30)])
+    sheet.append(["EP-2", -7, 2.5e-10, False, datetime.date(1999, 12, 31), None, None])
+    sheet["B6"] = "after a gap"
+    sheet["J6"] = "far right"
+    sheet["A7"] = "=SUM(B2:B3)"
+    sheet.merge_cells("A8:C8")
+    sheet["A8"] = "merged"
+
+    other = workbook.create_sheet("Notes")
+    other["A1"] = "Ünïcödé — عربي"
+    other["A2"] = "  padded  "
+
+    chart = BarChart()
+    chart.add_data(Reference(sheet, min_col=2, min_row=1, max_row=3), titles_from_data=True)
+    workbook.create_chartsheet("Chart").add_chart(chart)
+    workbook.create_sheet("Empty")
+
+    path = tmp_path / "generated.xlsx"
+    workbook.save(path)
+    return path
+
+
+def test_same_values_as_openpyxl(workbook_path):
+    fast = read_fast(workbook_path)
+    reference = [(title, [trimmed(row) for row in rows]) for title, rows in _iter_sheets_openpyxl(workbook_path)]
+
+    assert [title for title, _ in fast] == ["Scores", "Notes", "Empty"]
+    assert [(title, [trimmed(row) for row in rows]) for title, rows in fast] == reference
+
+
+def test_cell_types(workbook_path):
+    rows = dict(read_fast(workbook_path))["Scores"]
+
+    assert rows[1] == ["EP-1", 3, 1.5, True, datetime.datetime(2024, 5, 1, 9, 30),
+                       datetime.time(14, 5), datetime.timedelta(hours=1, minutes=30)]
+    assert rows[2][:5] == ["EP-2", -7, 2.5e-10, False, datetime.datetime(1999, 12, 31)]
+    assert rows[3] == [] and rows[4] == []           # rows missing from the XML
+    assert rows[5] == [None, "after a gap"] + [None] * 7 + ["far right"]
+    assert rows[6] == [None]                          # formula never calculated: no cached result
+    assert rows[7] == ["merged"]
+
+
+def test_strings_are_not_stripped(workbook_path):
+    assert dict(read_fast(workbook_path))["Notes"] == [["Ünïcödé — عربي"], ["  padded  "]]
+
+
+def test_legacy_text_without_dimension_records(workbook_path, tmp_path):
+    stripped = tmp_path / "no_dimensions.xlsx"
+    with zipfile.ZipFile(workbook_path) as original, zipfile.ZipFile(stripped, "w") as copy:
+        for item in original.infolist():
+            copy.writestr(item, re.sub(rb"<dimension[^>]*/>", b"", original.read(item)))
+
+    text = extract_text_from_excel(str(workbook_path))
+    assert text.startswith("### Sheet: Scores ###\nEP\tScore\tRatio\tPassed\tDate\tTime\tDuration\t\t\t\n")
+    assert "\nmerged\t\t\t\t\t\t\t\t\t\n" in text
+    assert extract_text_from_excel(str(stripped)) == text
+
+
+def test_column_index():
+    assert [_column_index(ref) for ref in ("A1", "Z9", "AA10", "AZ1", "XFD1048576")] == [0, 25, 26, 51, 16383]
+
+
+def write_xlsx(path, sheet_xml, workbook_pr="", shared_strings=None, styles=None,
+               sheet_target="worksheets/sheet1.xml"):
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr("xl/workbook.xml",
+                         f'<workbook xmlns="{MAIN}" xmlns:r="{REL}">{workbook_pr}'
+                         '<sheets><sheet name="Data" sheetId="1" r:id="rId1"/></sheets></workbook>')
+        archive.writestr("xl/_rels/workbook.xml.rels",
+                         f'<Relationships xmlns="{PKG_REL}"><Relationship Id="rId1" '
+                         f'Type="{REL}/worksheet" Target="{sheet_target}"/></Relationships>')
+        archive.writestr("xl/worksheets/sheet1.xml",
+                         f'<worksheet xmlns="{MAIN}"><sheetData>{sheet_xml}</sheetData></worksheet>')
+        if shared_strings is not None:
+            archive.writestr("xl/sharedStrings.xml", f'<sst xmlns="{MAIN}">{shared_strings}</sst>')
+        if styles is not None:
+            archive.writestr("xl/styles.xml", f'<styleSheet xmlns="{MAIN}">{styles}</styleSheet>')
+
+
+def test_inline_and_rich_text_strings(tmp_path):
+    path = tmp_path / "strings.xlsx"
+    shared = ('<si><t>plain</t></si>'
+              '<si><r><t>rich </t></r><r><rPr><b/></rPr><t>text</t></r><rPh><t>phonetic</t></rPh></si>')
+    sheet = ('<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c>'
+             '<c r="C1" t="inlineStr"><is><t>inline</t></is></c><c r="D1" t="e"><v>#DIV/0!</v></c>'
+             '<c r="E1" t="str"><v>formula result</v></c><c r="F1" t="b"><v>0</v></c></row>')
+    write_xlsx(path, sheet, shared_strings=shared)
+
+    assert read_fast(path) == [("Data", [["plain", "rich text", "inline", "#DIV/0!", "formula result", False]])]
+
+
+def test_cells_without_references(tmp_path):
+    path = tmp_path / "norefs.xlsx"
+    write_xlsx(path, '<row><c><v>1</v></c><c><v>2</v></c></row><row><c t="inlineStr"><is><t>x</t></is></c></row>')
+
+    assert read_fast(path) == [("Data", [[1, 2], ["x"]])]
+
+
+def test_date_styles_and_1904_epoch(tmp_path):
+    styles = ('<numFmts><numFmt numFmtId="164" formatCode="yyyy-mm-dd"/></numFmts>'
+              '<cellXfs><xf numFmtId="0"/><xf numFmtId="164"/><xf numFmtId="46"/></cellXfs>')
+    sheet = '<row r="1"><c r="A1" s="1"><v>45413</v></c><c r="B1" s="2"><v>1.5</v></c><c r="C1"><v>42</v></c></row>'
+
+    path = tmp_path / "1900.xlsx"
+    write_xlsx(path, sheet, styles=styles)
+    assert read_fast(path) == [("Data", [[datetime.datetime(2024, 5, 1), datetime.timedelta(hours=36), 42]])]
+
+    path = tmp_path / "1904.xlsx"
+    write_xlsx(path, sheet, workbook_pr='<workbookPr date1904="1"/>', styles=styles)
+    assert read_fast(path)[0][1][0][0] == datetime.datetime(2028, 5, 2)
+
+
+def test_absolute_sheet_target(tmp_path):
+    path = tmp_path / "absolute.xlsx"
+    write_xlsx(path, '<row r="1"><c r="A1"><v>7</v></c></row>', sheet_target="/xl/worksheets/sheet1.xml")
+
+    assert read_fast(path) == [("Data", [[7]])]